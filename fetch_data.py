@@ -1,31 +1,76 @@
 import argparse
+import functools
+import json
 import logging
 import os
-import urllib3
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Sequence
 from datetime import date, datetime, timedelta
+from typing import NoReturn
 
+import gspread
+import pandas as pd
+import urllib3
 from dotenv import load_dotenv
 
-from src.config import FETCH_CONFIG, MONTHS_MAP_SHORT, SHEET_LIMITS, SHEETS
-from src.connectors.sheets import get_sheets_client
+from src.backfill import run_backfill
+from src.cadence import record_source_checks, sources_not_due
+from src.config import (
+    BCRA_VARIABLES,
+    FETCH_CONFIG,
+    HISTORIC_BCRA_VARIABLES,
+    HISTORIC_BENCHMARK,
+    MONTHS_MAP_SHORT,
+    SHEET_DATE_FORMATS,
+    SHEET_LIMITS,
+    SHEETS,
+    SOURCE_HOSTS,
+)
+from src.connectors.http import AsyncHTTPClient, get_async_http_client
+from src.connectors.limiter import limiter_states, load_limiter_states
+from src.connectors.resilience import (
+    CircuitOpenError,
+    breaker_snapshots,
+    breaker_states,
+    is_host_available,
+    load_breaker_snapshots,
+)
+from src.connectors.sheets import format_sheet_dates, get_sheets_client, parse_sheet_dates
+from src.daemon import run_daemon
 from src.db.writer import (
-    get_last_date_from_db,
+    get_fetch_state,
+    get_historic_series,
     get_last_rem_date_from_db,
+    get_rem_publication_index,
+    get_series_since,
+    set_fetch_state,
+    write_bcra_series_to_db,
+    write_benchmarks_to_db,
     write_cpi_to_db,
     write_historic_to_db,
+    write_rem_publication_index,
     write_rem_to_db,
 )
+from src.deadline import get_run_deadline, start_run_deadline
 from src.fetchers import (
-    CABACPIFetcher,
-    CCLFetcher,
-    CERFetcher,
-    INDECCPIFetcher,
-    InflacionMensualFetcher,
-    REMFetcher,
-    SPYFetcher,
-    USACPIFetcher,
+    AsyncBCRAVariablesFetcher,
+    AsyncCABACPIFetcher,
+    AsyncCCLFetcher,
+    AsyncINDECCPIFetcher,
+    AsyncREMFetcher,
+    AsyncUSACPIFetcher,
+    BenchmarksFetcher,
+)
+from src.fetchers.bcra import series_from_frame
+from src.fetchers.cpi_frame import (
+    CPI_COLUMNS,
+    USA_COLUMNS,
+    build_cpi_frame,
+    merge_cpi_frames,
+    missing_cpi_sources,
 )
+from src.run_lock import RunCoordinator, lock_wait_seconds
+from src.scheduler import Node, prune_graph, run_graph
+from src.timeseries import TimeSeries, align, dates_to_ordinals
 
 # BCRA has SSL cert issues
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -41,8 +86,32 @@ SPREADSHEET_ID = os.environ.get("SPREADSHEET_ID")
 HISTORIC_SHEET = SHEETS["HISTORIC"]
 REM_SHEET = SHEETS["REM"]
 CPI_SHEET = SHEETS["CPI"]
+HISTORIC_DATE_FORMAT = SHEET_DATE_FORMATS["HISTORIC"]
+REM_DATE_FORMAT = SHEET_DATE_FORMATS["REM"]
+CPI_DATE_FORMAT = SHEET_DATE_FORMATS["CPI"]
 FIRST_DATA_ROW = SHEET_LIMITS["first_data_row_historic"]
 BACKFILL_FROM = FETCH_CONFIG["backfill_from"]
+# Series con watermark propio: las de revision_overlap_days más las variables
+# extra de BCRA_VARIABLES (ver write_bcra_series_to_db)
+SERIES = [
+    *FETCH_CONFIG["revision_overlap_days"],
+    *(n for n in BCRA_VARIABLES if n not in FETCH_CONFIG["revision_overlap_days"]),
+]
+INDEC_FILENAME_KEY = "indec_cpi_filename"
+CCL_LATENCIES_KEY = "ccl_ambito_latencies"
+HTTP_LIMITS_KEY = "http_concurrency_limits"
+HTTP_BREAKERS_KEY = "http_circuit_breakers"
+# Nodos fuente del grafo (los que salen a la red) de cada fuente; el daemon
+# elige entre estas fuentes (claves de DAEMON_SCHEDULE)
+SOURCE_NODES = {
+    "bcra": ("bcra",),
+    "ccl": ("ccl_history", "ccl_today"),
+    "benchmarks": ("benchmarks",),
+    "rem": ("rem",),
+    "indec": ("indec",),
+    "caba": ("caba",),
+    "usa": ("usa",),
+}
 
 
 def get_last_date_from_sheet() -> date:
@@ -52,33 +121,15 @@ def get_last_date_from_sheet() -> date:
         ws_h = ss.worksheet(HISTORIC_SHEET)
         existing_rows = ws_h.get_all_values()[FIRST_DATA_ROW - 1 :]
 
-        dates_with_data = []
-        today = date.today()
+        # Filas con fecha y algún dato en B..D
+        rows_with_data = [
+            row for row in existing_rows if row and row[0] and any(str(c).strip() for c in row[1:4])
+        ]
+        days = parse_sheet_dates([row[0] for row in rows_with_data], HISTORIC_DATE_FORMAT)
+        dates_with_data = days[(days > 0) & (days <= date.today().toordinal())]
 
-        for row in existing_rows:
-            if len(row) < 1 or not row[0]:
-                continue
-
-            has_data = False
-            if len(row) >= 2 and row[1] and str(row[1]).strip():
-                has_data = True
-            elif len(row) >= 3 and row[2] and str(row[2]).strip():
-                has_data = True
-            elif len(row) >= 4 and row[3] and str(row[3]).strip():
-                has_data = True
-
-            if not has_data:
-                continue
-
-            try:
-                d = datetime.strptime(row[0], "%d/%m/%Y").date()
-                if d <= today:
-                    dates_with_data.append(d)
-            except ValueError:
-                continue
-
-        if dates_with_data:
-            last_valid_date = max(dates_with_data)
+        if len(dates_with_data):
+            last_valid_date = date.fromordinal(int(dates_with_data.max()))
             rewind_date = last_valid_date - timedelta(days=7)
             logger.info(
                 f"Last valid date with data in sheet: {last_valid_date}, "
@@ -135,65 +186,63 @@ def get_last_rem_date_from_sheet() -> tuple[int, int]:
     return (BACKFILL_FROM.year, BACKFILL_FROM.month)
 
 
-def update_sheets(
-    cer_data, ccl_data, spy_data, inflacion_data, rem_reports, cpi_data=None
-):
+def open_spreadsheet() -> gspread.Spreadsheet:
     client = get_sheets_client()
-    ss = client.open_by_key(SPREADSHEET_ID)
-
-    if cer_data or ccl_data or spy_data or inflacion_data:
+    timeout = FETCH_CONFIG["sheets_timeout_seconds"]
+    deadline = get_run_deadline()
+    if deadline:
+        # Las escrituras corren dentro del margen de persistencia
+        timeout = min(timeout, deadline.remaining() + FETCH_CONFIG["persist_grace_seconds"])
+    client.set_timeout(timeout)
+    return client.open_by_key(SPREADSHEET_ID)
+
+
+def update_historic_sheet(
+    ss: gspread.Spreadsheet,
+    cer_data: TimeSeries | None,
+    ccl_data: TimeSeries | None,
+    spy_data: TimeSeries | None,
+    inflacion_data: TimeSeries | None,
+) -> None:
+    # Columna de la hoja (0 = B) que llena cada serie; la E no se toca
+    columns = {0: cer_data, 1: ccl_data, 2: spy_data, 4: inflacion_data}
+    columns = {col: series for col, series in columns.items() if series}
+
+    if columns:
         ws_h = ss.worksheet(HISTORIC_SHEET)
 
-        existing_rows = ws_h.get_all_values()[FIRST_DATA_ROW - 1 :]
-        data_map = {}
-        for row in existing_rows:
-            if len(row) >= 1 and row[0]:
-                data_map[row[0]] = [
-                    row[1] if len(row) > 1 else "",
-                    row[2] if len(row) > 2 else "",
-                    row[3] if len(row) > 3 else "",
-                    row[4] if len(row) > 4 else "",
-                    row[5] if len(row) > 5 else "",
-                ]
-
-        for d, val in cer_data.items():
-            fmt_d = d.strftime("%d/%m/%Y")
-            if fmt_d not in data_map:
-                data_map[fmt_d] = ["", "", "", "", ""]
-            data_map[fmt_d][0] = val
-
-        for d, val in ccl_data.items():
-            fmt_d = d.strftime("%d/%m/%Y")
-            if fmt_d not in data_map:
-                data_map[fmt_d] = ["", "", "", "", ""]
-            data_map[fmt_d][1] = val
-
-        for d, val in spy_data.items():
-            fmt_d = d.strftime("%d/%m/%Y")
-            if fmt_d not in data_map:
-                data_map[fmt_d] = ["", "", "", "", ""]
-            data_map[fmt_d][2] = val
-
-        for d, val in inflacion_data.items():
-            fmt_d = d.strftime("%d/%m/%Y")
-            if fmt_d not in data_map:
-                data_map[fmt_d] = ["", "", "", "", ""]
-            data_map[fmt_d][4] = val
-
-        sorted_dates = sorted(
-            data_map.keys(), key=lambda x: datetime.strptime(x, "%d/%m/%Y")
+        sheet_rows = ws_h.get_all_values()[FIRST_DATA_ROW - 1 :]
+        existing_rows = [row for row in sheet_rows if row and row[0]]
+        # Filas de la hoja por ordinal; las celdas existentes se reescriben tal cual
+        table = pd.DataFrame(
+            [(row[1:6] + [""] * 5)[:5] for row in existing_rows],
+            index=parse_sheet_dates([row[0] for row in existing_rows], HISTORIC_DATE_FORMAT),
+            columns=range(5),
+            dtype=object,
         )
+        unparsed = int((table.index == 0).sum())
+        if unparsed:
+            logger.warning(f"Historic sheet: dropping {unparsed} rows with an invalid date")
+        table = table[(table.index > 0) & ~table.index.duplicated(keep="last")]
+
+        days, matrix = align(*columns.values())
+        table = table.reindex(table.index.union(days), fill_value="")
+        # update() solo pisa con los valores no-NaN: los huecos de una serie
+        # conservan lo que ya tenía la hoja
+        table.update(pd.DataFrame(matrix, index=days, columns=list(columns)))
+
         payload = [
-            [
-                d,
-                data_map[d][0],
-                data_map[d][1],
-                data_map[d][2],
-                data_map[d][3],
-                data_map[d][4],
-            ]
-            for d in sorted_dates
+            [d, *row]
+            for d, row in zip(
+                format_sheet_dates(table.index.to_numpy(), HISTORIC_DATE_FORMAT),
+                table.to_numpy().tolist(),
+                strict=True,
+            )
         ]
+        # Si se descartaron filas (fecha inválida o duplicada) la tabla queda
+        # más corta que la hoja: se completa con filas vacías para borrar las
+        # que sobran abajo en lugar de dejarlas repetidas
+        payload += [[""] * 6 for _ in range(len(sheet_rows) - len(payload))]
 
         ws_h.update(
             range_name=f"A{FIRST_DATA_ROW}:F{FIRST_DATA_ROW + len(payload) - 1}",
@@ -201,6 +250,31 @@ def update_sheets(
             value_input_option="USER_ENTERED",
         )
 
+
+def sync_backfill_to_sheet(since_dt: date, today: date) -> bool:
+    """Pasa a la hoja histórica lo que el backfill dejó en la DB.
+
+    El backfill escribe chunk a chunk solo en SQLite; la hoja se actualiza una
+    vez al final con todo el rango (incluida la proyección de CER). False si
+    la hoja no se pudo actualizar (la DB ya quedó completa).
+    """
+    series = get_historic_series(since_dt, today + timedelta(days=45))
+    try:
+        update_historic_sheet(
+            open_spreadsheet(),
+            series["cer_data"],
+            series["ccl_data"],
+            series["spy_data"],
+            series["inflacion_data"],
+        )
+    except Exception as e:
+        logger.error(f"Backfill: historic sheet not updated (DB is up to date): {e}")
+        return False
+    logger.info(f"Backfill: historic sheet updated from {since_dt}")
+    return True
+
+
+def update_rem_sheet(ss: gspread.Spreadsheet, rem_reports: dict[date, list[float]]) -> None:
     if rem_reports:
         ws_r = ss.worksheet(REM_SHEET)
 
@@ -212,21 +286,18 @@ def update_sheets(
         existing_rem_raw = ws_r.get("A4:I", value_render_option="UNFORMATTED_VALUE")
         existing_rem_raw = existing_rem_raw if existing_rem_raw else []
 
-        existing_months = set()
-        for row in existing_rem_raw:
-            if len(row) >= 1 and row[0]:
-                val = row[0]
-                if isinstance(val, (int, float)):
-                    # Google Sheets epoch is 1899-12-30
-                    d = date(1899, 12, 30) + timedelta(days=int(val))
-                    existing_months.add(d.strftime("%Y-%m-%d"))
-                elif isinstance(val, str):
-                    existing_months.add(val)
+        # Los meses vienen como serials (o texto si la celda no es fecha)
+        existing_months = set(
+            parse_sheet_dates(
+                [row[0] for row in existing_rem_raw if len(row) >= 1 and row[0]],
+                REM_DATE_FORMAT,
+            ).tolist()
+        )
 
         new_reports = {
             month: projs
             for month, projs in rem_reports.items()
-            if month not in existing_months
+            if month.toordinal() not in existing_months
         }
 
         if new_reports:
@@ -235,7 +306,13 @@ def update_sheets(
             )
             next_row = 4 + rows_with_data
             sorted_new_months = sorted(new_reports.keys())
-            payload = [[m] + new_reports[m] for m in sorted_new_months]
+            month_cells = format_sheet_dates(
+                dates_to_ordinals(sorted_new_months), REM_DATE_FORMAT
+            )
+            payload = [
+                [cell, *new_reports[m]]
+                for cell, m in zip(month_cells, sorted_new_months, strict=True)
+            ]
 
             ws_r.update(
                 range_name=f"A{next_row}:I{next_row + len(payload) - 1}",
@@ -246,100 +323,373 @@ def update_sheets(
         else:
             logger.info("No new REM reports to add")
 
-    if cpi_data:
-        ws_cpi = ss.worksheet(CPI_SHEET)
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-        ws_cpi.update(
-            range_name="B2", values=[[timestamp]], value_input_option="USER_ENTERED"
-        )
+def update_cpi_sheet(ss: gspread.Spreadsheet, cpi_data: pd.DataFrame) -> None:
+    missing = missing_cpi_sources(cpi_data)
+    if missing:
+        # El payload reescribe filas enteras: sin una fuente se pisarían sus
+        # columnas con "N/A". La DB sí se actualiza (upsert con coalesce).
+        logger.warning(f"Skipping CPI sheet update: missing {', '.join(missing)}")
+        return
+
+    ws_cpi = ss.worksheet(CPI_SHEET)
+
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    ws_cpi.update(range_name="B2", values=[[timestamp]], value_input_option="USER_ENTERED")
+
+    if cpi_data.empty:
+        logger.info("No CPI data to update")
+        return
+
+    # Columnas B..S en el orden de la hoja; los huecos van como "N/A"
+    body = cpi_data.reindex(columns=CPI_COLUMNS)
+    cells = body.astype(object).where(body.notna(), "N/A").to_numpy().tolist()
+    date_cells = format_sheet_dates(dates_to_ordinals(body.index), CPI_DATE_FORMAT)
+    payload = [[d, *row] for d, row in zip(date_cells, cells, strict=True)]
+    ws_cpi.update(
+        range_name=f"A4:S{3 + len(payload)}",
+        values=payload,
+        value_input_option="USER_ENTERED",
+    )
+    logger.info(f"Updated CPI sheet with {len(payload)} rows")
 
-        dates = cpi_data.get("dates", [])
-        if dates:
-            payload = []
-            for i, date_row in enumerate(dates):
-                row = [
-                    date_row[0],
-                    cpi_data["indec_tn_nivel_general"][i][0]
-                    if i < len(cpi_data.get("indec_tn_nivel_general", []))
-                    else "N/A",
-                    cpi_data["indec_tn_estacionales"][i][0]
-                    if i < len(cpi_data.get("indec_tn_estacionales", []))
-                    else "N/A",
-                    cpi_data["indec_tn_regulados"][i][0]
-                    if i < len(cpi_data.get("indec_tn_regulados", []))
-                    else "N/A",
-                    cpi_data["indec_tn_nucleo"][i][0]
-                    if i < len(cpi_data.get("indec_tn_nucleo", []))
-                    else "N/A",
-                    cpi_data["indec_gba_nivel_general"][i][0]
-                    if i < len(cpi_data.get("indec_gba_nivel_general", []))
-                    else "N/A",
-                    cpi_data["indec_gba_estacionales"][i][0]
-                    if i < len(cpi_data.get("indec_gba_estacionales", []))
-                    else "N/A",
-                    cpi_data["indec_gba_regulados"][i][0]
-                    if i < len(cpi_data.get("indec_gba_regulados", []))
-                    else "N/A",
-                    cpi_data["indec_gba_nucleo"][i][0]
-                    if i < len(cpi_data.get("indec_gba_nucleo", []))
-                    else "N/A",
-                    cpi_data["caba_idx_nivel_general"][i][0]
-                    if i < len(cpi_data.get("caba_idx_nivel_general", []))
-                    else "N/A",
-                    cpi_data["caba_idx_estacionales"][i][0]
-                    if i < len(cpi_data.get("caba_idx_estacionales", []))
-                    else "N/A",
-                    cpi_data["caba_idx_regulados"][i][0]
-                    if i < len(cpi_data.get("caba_idx_regulados", []))
-                    else "N/A",
-                    cpi_data["caba_idx_resto"][i][0]
-                    if i < len(cpi_data.get("caba_idx_resto", []))
-                    else "N/A",
-                    cpi_data["caba_var_nivel_general"][i][0]
-                    if i < len(cpi_data.get("caba_var_nivel_general", []))
-                    else "N/A",
-                    cpi_data["caba_var_estacionales"][i][0]
-                    if i < len(cpi_data.get("caba_var_estacionales", []))
-                    else "N/A",
-                    cpi_data["caba_var_regulados"][i][0]
-                    if i < len(cpi_data.get("caba_var_regulados", []))
-                    else "N/A",
-                    cpi_data["caba_var_resto"][i][0]
-                    if i < len(cpi_data.get("caba_var_resto", []))
-                    else "N/A",
-                    cpi_data["usa_cpi_index"][i][0]
-                    if i < len(cpi_data.get("usa_cpi_index", []))
-                    else "N/A",
-                    cpi_data["usa_variation"][i][0]
-                    if i < len(cpi_data.get("usa_variation", []))
-                    else "N/A",
-                ]
-                payload.append(row)
-
-            ws_cpi.update(
-                range_name=f"A4:S{3 + len(payload)}",
-                values=payload,
-                value_input_option="USER_ENTERED",
-            )
-            logger.info(f"Updated CPI sheet with {len(payload)} rows")
-        else:
-            logger.info("No CPI data to update")
+
+async def fetch_usa_cpi(since_dt: date, client: AsyncHTTPClient) -> pd.DataFrame:
+    fred_api_key = os.environ.get("FRED_API_KEY")
+    if not fred_api_key:
+        logger.warning("FRED_API_KEY not found in environment. Skipping USA CPI data.")
+        return build_cpi_frame([], dict.fromkeys(USA_COLUMNS, []))
+
+    usa_cpi_fetcher = AsyncUSACPIFetcher(api_key=fred_api_key, client=client)
+    usa_cpi = await usa_cpi_fetcher.fetch(since_dt)
+    logger.info(f"USA CPI: Fetched {len(usa_cpi)} records")
+    return usa_cpi
+
+
+def merge_cpi_data(
+    indec: pd.DataFrame | None, caba: pd.DataFrame | None, usa: pd.DataFrame | None
+) -> pd.DataFrame:
+    """Une INDEC, CABA y USA por fecha (outer join); tolera que falten fuentes (None).
+
+    Las columnas de las fuentes faltantes no aparecen en el frame (ver
+    `missing_cpi_sources`); las fechas sin dato de una fuente quedan en NaN.
+    """
+    sources = {"indec": indec, "caba": caba, "usa": usa}
+    missing = [name for name, frame in sources.items() if frame is None]
+    if len(missing) == len(sources):
+        raise ValueError("No CPI source available")
+    if missing:
+        logger.warning(f"CPI: merging without {', '.join(missing)}")
+
+    cpi_data = merge_cpi_frames(sources)
+    logger.info(f"Fetched CPI data: {len(cpi_data)} unique dates")
+    return cpi_data
+
+
+async def fetch_indec_cpi(
+    indec_cpi_fetcher: AsyncINDECCPIFetcher, since_dt: date, indec_filename: str | None
+) -> pd.DataFrame:
+    indec_cpi_fetcher.last_filename = indec_filename
+    return await indec_cpi_fetcher.fetch(since_dt)
+
+
+def save_indec_filename(
+    indec_cpi_fetcher: AsyncINDECCPIFetcher, indec_filename: str | None
+) -> None:
+    if indec_cpi_fetcher.resolved_filename != indec_filename:
+        set_fetch_state(INDEC_FILENAME_KEY, indec_cpi_fetcher.resolved_filename)
 
 
-def main():
+async def fetch_ccl_history(
+    ccl_fetcher: AsyncCCLFetcher, since_dt: date, today: date, ccl_latencies: list[float]
+) -> TimeSeries:
+    ccl_fetcher.latencies = ccl_latencies
+    return await ccl_fetcher.fetch_history(since_dt, today)
+
+
+def merge_ccl(ccl_history: TimeSeries | None, ccl_today: TimeSeries | None) -> TimeSeries:
+    """Une el histórico de Ambito con la cotización de hoy; tolera que falte uno."""
+    if ccl_history is None and ccl_today is None:
+        raise ValueError("No CCL source available")
+    if ccl_history is None:
+        logger.warning("CCL: no Ambito history, keeping only today's quote")
+    ccl = (ccl_history or TimeSeries.empty()).combine(ccl_today or TimeSeries.empty())
+    logger.info(f"CCL: {len(ccl)} records")
+    return ccl
+
+
+def load_ccl_latencies() -> list[float]:
+    raw = get_fetch_state(CCL_LATENCIES_KEY)
+    return json.loads(raw) if raw else []
+
+
+async def fetch_rem(
+    rem_fetcher: AsyncREMFetcher, rem_watermark: tuple[int, int], rem_index: dict[str, dict]
+) -> dict[date, list[float]]:
+    logger.info(f"Last REM date in DB: {rem_watermark[0]}-{rem_watermark[1]:02d}")
+    rem_fetcher.index = rem_index
+    rem_reports = await rem_fetcher.fetch(rem_watermark)
+    logger.info(
+        f"Rem report, first row data: {next(iter(rem_reports.items()), ('N/A', 'N/A'))}"
+    )
+    return rem_reports
+
+
+def _source_unavailable(name: str, hosts: Sequence[str], **_deps: object) -> NoReturn:
+    raise CircuitOpenError(f"{name}: circuit open for {', '.join(hosts)}")
+
+
+def skip_unavailable_sources(nodes: list[Node]) -> list[Node]:
+    """Reemplaza los nodos fuente cuyos hosts tienen el breaker abierto.
+
+    Fallan al instante sin tocar la red; sus dependientes se omiten o reciben
+    None igual que ante cualquier otro fallo.
+    """
+    for node in nodes:
+        hosts = SOURCE_HOSTS.get(node.name)
+        if hosts and not any(is_host_available(h) for h in hosts):
+            logger.warning(f"Skipping {node.name}: circuit open for {', '.join(hosts)}")
+            node.func = functools.partial(_source_unavailable, node.name, hosts)
+    return nodes
+
+
+def build_fetch_graph(
+    since: dict[str, date], today: date, until_dt_future: date
+) -> list[Node]:
+    """Arma el grafo de fetch_data.
+
+    `since` es serie -> fecha de inicio (ver get_series_since), así cada
+    fuente pide solo su propia ventana faltante.
+    """
+    # Un solo cliente (y sesión): conexiones keep-alive y límite de requests
+    # en vuelo compartidos entre todas las fuentes del event loop
+    client = get_async_http_client()
+    bcra_fetcher = AsyncBCRAVariablesFetcher(client=client)
+    ccl_fetcher = AsyncCCLFetcher(client=client)
+    benchmarks_fetcher = BenchmarksFetcher()
+    rem_fetcher = AsyncREMFetcher(client=client)
+    indec_cpi_fetcher = AsyncINDECCPIFetcher(client=client)
+    caba_cpi_fetcher = AsyncCABACPIFetcher(client=client)
+
+    historic_deps = ("cer", "ccl", "spy", "inflacion")
+    bcra_since = {name: since[name] for name in bcra_fetcher.variables}
+
+    return [
+        # Fuentes
+        # CER e inflación salen juntos de la API Monetarias; CER trae
+        # proyección a futuro, la inflación simplemente no tiene datos ahí.
+        Node(
+            "bcra",
+            functools.partial(
+                bcra_fetcher.fetch,
+                min(bcra_since.values()),
+                until_dt_future,
+                since_by_name=bcra_since,
+            ),
+        ),
+        Node("cer", lambda bcra: series_from_frame(bcra, "cer"), deps=("bcra",), persist=True),
+        Node(
+            "inflacion",
+            lambda bcra: series_from_frame(bcra, "inflacion_mensual"),
+            deps=("bcra",),
+            persist=True,
+        ),
+        # CCL: la cotización de hoy (dolarapi) se guarda apenas llega, sin
+        # esperar al histórico de Ambito, que puede tardar hasta su presupuesto
+        Node("ccl_today", functools.partial(ccl_fetcher.fetch_today, since["ccl"], today)),
+        Node("ccl_latencies", load_ccl_latencies),
+        Node(
+            "ccl_history",
+            functools.partial(fetch_ccl_history, ccl_fetcher, since["ccl"], today),
+            deps=("ccl_latencies",),
+        ),
+        Node(
+            "ccl",
+            merge_ccl,
+            deps=("ccl_history", "ccl_today"),
+            optional=("ccl_history", "ccl_today"),
+            persist=True,
+        ),
+        # Todos los benchmarks en un nodo (en paralelo); SPY va a la hoja
+        # histórica y a historic_data, el resto a benchmark_prices
+        Node(
+            "benchmarks",
+            lambda: benchmarks_fetcher.fetch(min(since["spy"], since["benchmarks"]), today),
+        ),
+        # La descarga puede arrancar antes que since["spy"] (la arrastra el
+        # benchmark más atrasado): SPY se recorta para no reescribir su historia
+        Node(
+            "spy",
+            lambda benchmarks: benchmarks.get(HISTORIC_BENCHMARK, TimeSeries.empty()).slice(
+                since["spy"]
+            ),
+            deps=("benchmarks",),
+            persist=True,
+        ),
+        Node("rem_watermark", get_last_rem_date_from_db),
+        Node("rem_index", get_rem_publication_index),
+        Node(
+            "rem",
+            functools.partial(fetch_rem, rem_fetcher),
+            deps=("rem_watermark", "rem_index"),
+        ),
+        Node("indec_filename", lambda: get_fetch_state(INDEC_FILENAME_KEY)),
+        Node(
+            "indec",
+            functools.partial(fetch_indec_cpi, indec_cpi_fetcher, since["indec"]),
+            deps=("indec_filename",),
+        ),
+        Node(
+            "caba",
+            functools.partial(caba_cpi_fetcher.fetch, since["caba"]),
+        ),
+        Node("usa", functools.partial(fetch_usa_cpi, since["usa"], client)),
+        Node(
+            "cpi",
+            merge_cpi_data,
+            deps=("indec", "caba", "usa"),
+            optional=("indec", "caba", "usa"),
+            persist=True,
+        ),
+        # Persistencia: persist=True mantiene estos nodos (y los derivados de
+        # arriba) aunque venza el deadline, para guardar lo que sí llegó
+        Node("spreadsheet", open_spreadsheet, persist=True),
+        Node(
+            "sheet_historic",
+            lambda spreadsheet, cer, ccl, spy, inflacion: update_historic_sheet(
+                spreadsheet, cer, ccl, spy, inflacion
+            ),
+            deps=("spreadsheet", *historic_deps),
+            optional=historic_deps,
+            persist=True,
+        ),
+        Node(
+            "sheet_rem",
+            lambda spreadsheet, rem: update_rem_sheet(spreadsheet, rem),
+            deps=("spreadsheet", "rem"),
+            persist=True,
+        ),
+        Node(
+            "sheet_cpi",
+            lambda spreadsheet, cpi: update_cpi_sheet(spreadsheet, cpi),
+            deps=("spreadsheet", "cpi"),
+            persist=True,
+        ),
+        Node(
+            "db_historic",
+            lambda cer, ccl, spy, inflacion: write_historic_to_db(
+                *(series or TimeSeries.empty() for series in (cer, ccl, spy, inflacion))
+            ),
+            deps=historic_deps,
+            optional=historic_deps,
+            persist=True,
+        ),
+        Node(
+            "db_bcra_series",
+            lambda bcra: write_bcra_series_to_db(
+                bcra.drop(columns=list(HISTORIC_BCRA_VARIABLES), errors="ignore")
+            ),
+            deps=("bcra",),
+            persist=True,
+        ),
+        Node(
+            "db_benchmarks",
+            lambda benchmarks: write_benchmarks_to_db(
+                {t: s for t, s in benchmarks.items() if t != HISTORIC_BENCHMARK}
+            ),
+            deps=("benchmarks",),
+            persist=True,
+        ),
+        Node("db_cpi", lambda cpi: write_cpi_to_db(cpi), deps=("cpi",), persist=True),
+        Node("db_rem", lambda rem: write_rem_to_db(rem), deps=("rem",), persist=True),
+        Node(
+            "db_ccl_today",
+            lambda ccl_today: write_historic_to_db(
+                TimeSeries.empty(), ccl_today, TimeSeries.empty(), TimeSeries.empty()
+            ),
+            deps=("ccl_today",),
+            persist=True,
+        ),
+        # También si Ambito falló o venció: sus intentos lentos suben el percentil
+        Node(
+            "db_ccl_latencies",
+            lambda ccl_history: set_fetch_state(
+                CCL_LATENCIES_KEY, json.dumps(ccl_fetcher.latencies)
+            ),
+            deps=("ccl_history",),
+            optional=("ccl_history",),
+            persist=True,
+        ),
+        Node(
+            "db_indec_filename",
+            lambda indec, indec_filename: save_indec_filename(indec_cpi_fetcher, indec_filename),
+            deps=("indec", "indec_filename"),
+            persist=True,
+        ),
+        Node(
+            "db_rem_index",
+            lambda rem: write_rem_publication_index(rem_fetcher.new_index_entries),
+            deps=("rem",),
+            persist=True,
+        ),
+    ]
+
+
+def main() -> None:
     parser = argparse.ArgumentParser(
         description="Fetch all data for Ingresos Tracker. "
-        "Por defecto, actualiza desde la última fecha registrada en el sheet."
+        "Por defecto, cada serie se actualiza desde su última fecha registrada en la DB."
     )
     parser.add_argument(
         "--since",
         type=str,
         default=None,
-        help="Fecha inicio YYYY-MM-DD (opcional, por defecto usa última fecha del sheet)",
+        help="Fecha inicio YYYY-MM-DD para todas las series "
+        "(opcional, por defecto cada serie arranca desde su último dato en la DB)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=FETCH_CONFIG["run_budget_seconds"],
+        help="Segundos máximos para obtener datos; al vencer se guarda lo obtenido "
+        f"(default {FETCH_CONFIG['run_budget_seconds']}, 0 = sin límite)",
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Backfill histórico de CER, inflación, CCL y SPY desde --since: por chunks "
+        "en paralelo, guardando cada uno en la DB; si se corta, retoma donde quedó",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Consultar también las fuentes mensuales (REM, CPI) que según su "
+        "cadencia no pueden tener datos nuevos todavía",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Quedar corriendo y consultar cada fuente según DAEMON_SCHEDULE "
+        "(src/config.py), reusando sesiones, credenciales y la DB entre corridas",
     )
     args = parser.parse_args()
 
+    if args.backfill and not args.since:
+        logger.error("--backfill requires --since")
+        return
+    if args.daemon and (args.since or args.backfill):
+        logger.error("--daemon cannot be combined with --since or --backfill")
+        return
+
+    if args.daemon:
+        # Se autentica y se abre la DB al arrancar: un error de credenciales
+        # aparece enseguida y no en la primera corrida programada
+        get_sheets_client()
+        load_saved_http_state()
+        run_daemon(functools.partial(run_scheduled, args))
+        return
+
+    since_dt = None
     if args.since:
         try:
             since_dt = datetime.strptime(args.since, "%Y-%m-%d").date()
@@ -353,200 +703,112 @@ def main():
         if since_dt < date(2000, 1, 1):
             logger.error("Start date seems unreasonably old (before 2000)")
             return
+
+    if args.backfill:
+        mode = f"backfill:{since_dt}"
     else:
-        since_dt = get_last_date_from_db()
+        mode = f"since:{since_dt}" if since_dt else "incremental"
+        if args.force:
+            mode += ":force"
+
+    # Si ya hay una corrida en curso (timer + corrida manual), se espera a que
+    # termine y, si pedía lo mismo y salió bien, se reusa su resultado
+    with RunCoordinator(mode, wait_seconds=lock_wait_seconds(args.budget)) as run:
+        if run.reused:
+            print(f"Dataset already updated by run {run.reused['run_id']}")
+            return
+        if not run.proceed:
+            print("Another run is still in progress; exiting")
+            return
+        run.finish(run_fetch(args, since_dt))
 
-    today = date.today()
-    until_dt_future = today + timedelta(days=45)
 
-    print(
-        f"Updating dataset from {since_dt} to {today} (CER until {until_dt_future})..."
-    )
+def run_scheduled(args: argparse.Namespace, sources: set[str]) -> None:
+    """Corrida del daemon para las fuentes cuyo cron se cumplió."""
+    mode = f"daemon:{','.join(sorted(sources))}"
+    with RunCoordinator(mode, wait_seconds=lock_wait_seconds(args.budget)) as run:
+        if run.proceed:
+            run.finish(run_fetch(args, None, sources))
 
-    cer_fetcher = CERFetcher()
-    ccl_fetcher = CCLFetcher()
-    spy_fetcher = SPYFetcher()
-    inflacion_fetcher = InflacionMensualFetcher()
-    rem_fetcher = REMFetcher()
-    indec_cpi_fetcher = INDECCPIFetcher()
-    caba_cpi_fetcher = CABACPIFetcher()
-
-    with ThreadPoolExecutor(
-        max_workers=FETCH_CONFIG["max_workers_parallel"]
-    ) as executor:
-        future_cer = executor.submit(cer_fetcher.fetch, since_dt, until_dt_future)
-        future_ccl = executor.submit(ccl_fetcher.fetch, since_dt, today)
-        future_spy = executor.submit(spy_fetcher.fetch, since_dt, today)
-        future_inflacion = executor.submit(inflacion_fetcher.fetch, since_dt, today)
-
-        cer = future_cer.result()
-        ccl = future_ccl.result()
-        spy = future_spy.result()
-        inflacion = future_inflacion.result()
-
-    last_rem_date = get_last_rem_date_from_db()
-    logger.info(f"Last REM date in sheet: {last_rem_date[0]}-{last_rem_date[1]:02d}")
-    rem_reports = rem_fetcher.fetch(last_rem_date)
-    logger.info(
-        f"Rem report, first row data: {next(iter(rem_reports.items()), ('N/A', 'N/A'))}"
-    )
 
-    logger.info("Fetching CPI data from INDEC, CABA, and USA...")
-    cpi_data = {}
-    try:
-        (
-            indec_dates,
-            indec_tn_ng,
-            indec_tn_est,
-            indec_tn_reg,
-            indec_tn_nuc,
-            indec_gba_ng,
-            indec_gba_est,
-            indec_gba_reg,
-            indec_gba_nuc,
-        ) = indec_cpi_fetcher.fetch(since_dt.strftime("%Y-%m-%d"))
-
-        (
-            caba_dates,
-            caba_idx_ng,
-            caba_idx_est,
-            caba_idx_reg,
-            caba_idx_resto,
-            caba_var_ng,
-            caba_var_est,
-            caba_var_reg,
-            caba_var_resto,
-        ) = caba_cpi_fetcher.fetch(since_dt.strftime("%Y-%m-%d"))
-
-        fred_api_key = os.environ.get("FRED_API_KEY")
-        if fred_api_key:
-            usa_cpi_fetcher = USACPIFetcher(api_key=fred_api_key)
-            usa_dates, usa_indices, usa_variations = usa_cpi_fetcher.fetch(
-                since_dt.strftime("%Y-%m-%d")
-            )
-            logger.info(f"USA CPI: Fetched {len(usa_dates)} records")
-        else:
-            logger.warning(
-                "FRED_API_KEY not found in environment. Skipping USA CPI data."
-            )
-            usa_dates, usa_indices, usa_variations = [], [], []
-
-        all_dates_dict = {}
-        for date_row in indec_dates:
-            all_dates_dict[date_row[0]] = {"indec": True, "caba": False, "usa": False}
-        for date_row in caba_dates:
-            if date_row[0] in all_dates_dict:
-                all_dates_dict[date_row[0]]["caba"] = True
-            else:
-                all_dates_dict[date_row[0]] = {"indec": False, "caba": True, "usa": False}
-        for date_row in usa_dates:
-            if date_row[0] in all_dates_dict:
-                all_dates_dict[date_row[0]]["usa"] = True
-            else:
-                all_dates_dict[date_row[0]] = {"indec": False, "caba": False, "usa": True}
-
-        sorted_dates = sorted(
-            all_dates_dict.keys(), key=lambda x: datetime.strptime(x, "%d/%m/%Y")
-        )
+def load_saved_http_state() -> None:
+    """Arranca limiters y breakers con el estado por host de corridas anteriores.
 
-        indec_date_to_idx = {
-            date_row[0]: idx for idx, date_row in enumerate(indec_dates)
-        }
-        caba_date_to_idx = {date_row[0]: idx for idx, date_row in enumerate(caba_dates)}
-        usa_date_to_idx = {date_row[0]: idx for idx, date_row in enumerate(usa_dates)}
-
-        cpi_data = {
-            "dates": [[d] for d in sorted_dates],
-            "indec_tn_nivel_general": [],
-            "indec_tn_estacionales": [],
-            "indec_tn_regulados": [],
-            "indec_tn_nucleo": [],
-            "indec_gba_nivel_general": [],
-            "indec_gba_estacionales": [],
-            "indec_gba_regulados": [],
-            "indec_gba_nucleo": [],
-            "caba_idx_nivel_general": [],
-            "caba_idx_estacionales": [],
-            "caba_idx_regulados": [],
-            "caba_idx_resto": [],
-            "caba_var_nivel_general": [],
-            "caba_var_estacionales": [],
-            "caba_var_regulados": [],
-            "caba_var_resto": [],
-            "usa_cpi_index": [],
-            "usa_variation": [],
-        }
+    Solo en un proceso nuevo: el daemon conserva los suyos en memoria. Así un
+    host que quedó con el breaker abierto se saltea también en la corrida
+    siguiente, hasta que pase `breaker_reset_seconds`.
+    """
+    saved_limits = get_fetch_state(HTTP_LIMITS_KEY)
+    if saved_limits and not limiter_states():
+        load_limiter_states(json.loads(saved_limits))
+    saved_breakers = get_fetch_state(HTTP_BREAKERS_KEY)
+    if saved_breakers and not breaker_states():
+        load_breaker_snapshots(json.loads(saved_breakers))
 
-        for date_str in sorted_dates:
-            indec_idx = indec_date_to_idx.get(date_str)
-            caba_idx = caba_date_to_idx.get(date_str)
-            usa_idx = usa_date_to_idx.get(date_str)
-
-            if indec_idx is not None:
-                cpi_data["indec_tn_nivel_general"].append(indec_tn_ng[indec_idx])
-                cpi_data["indec_tn_estacionales"].append(indec_tn_est[indec_idx])
-                cpi_data["indec_tn_regulados"].append(indec_tn_reg[indec_idx])
-                cpi_data["indec_tn_nucleo"].append(indec_tn_nuc[indec_idx])
-                cpi_data["indec_gba_nivel_general"].append(indec_gba_ng[indec_idx])
-                cpi_data["indec_gba_estacionales"].append(indec_gba_est[indec_idx])
-                cpi_data["indec_gba_regulados"].append(indec_gba_reg[indec_idx])
-                cpi_data["indec_gba_nucleo"].append(indec_gba_nuc[indec_idx])
-            else:
-                for key in [
-                    "indec_tn_nivel_general",
-                    "indec_tn_estacionales",
-                    "indec_tn_regulados",
-                    "indec_tn_nucleo",
-                    "indec_gba_nivel_general",
-                    "indec_gba_estacionales",
-                    "indec_gba_regulados",
-                    "indec_gba_nucleo",
-                ]:
-                    cpi_data[key].append(["N/A"])
-
-            if caba_idx is not None:
-                cpi_data["caba_idx_nivel_general"].append(caba_idx_ng[caba_idx])
-                cpi_data["caba_idx_estacionales"].append(caba_idx_est[caba_idx])
-                cpi_data["caba_idx_regulados"].append(caba_idx_reg[caba_idx])
-                cpi_data["caba_idx_resto"].append(caba_idx_resto[caba_idx])
-                cpi_data["caba_var_nivel_general"].append(caba_var_ng[caba_idx])
-                cpi_data["caba_var_estacionales"].append(caba_var_est[caba_idx])
-                cpi_data["caba_var_regulados"].append(caba_var_reg[caba_idx])
-                cpi_data["caba_var_resto"].append(caba_var_resto[caba_idx])
-            else:
-                for key in [
-                    "caba_idx_nivel_general",
-                    "caba_idx_estacionales",
-                    "caba_idx_regulados",
-                    "caba_idx_resto",
-                    "caba_var_nivel_general",
-                    "caba_var_estacionales",
-                    "caba_var_regulados",
-                    "caba_var_resto",
-                ]:
-                    cpi_data[key].append(["N/A"])
-
-            if usa_idx is not None:
-                cpi_data["usa_cpi_index"].append(usa_indices[usa_idx])
-                cpi_data["usa_variation"].append(usa_variations[usa_idx])
-            else:
-                cpi_data["usa_cpi_index"].append(["N/A"])
-                cpi_data["usa_variation"].append(["N/A"])
-
-        logger.info(f"Fetched CPI data: {len(sorted_dates)} unique dates")
 
-    except Exception as e:
-        logger.error(f"Failed to fetch CPI data: {e}")
-        cpi_data = None
+def save_http_state() -> None:
+    """Guarda límites y breakers por host para la próxima corrida."""
+    set_fetch_state(HTTP_LIMITS_KEY, json.dumps(limiter_states()))
+    set_fetch_state(HTTP_BREAKERS_KEY, json.dumps(breaker_snapshots()))
+
+
+def run_fetch(
+    args: argparse.Namespace, since_dt: date | None, sources: set[str] | None = None
+) -> list[str]:
+    """Corre el fetch (o el backfill) y devuelve lo que quedó incompleto.
 
-    update_sheets(cer, ccl, spy, inflacion, rem_reports, cpi_data)
+    `sources` limita la corrida a esas fuentes (claves de SOURCE_NODES); None = todas.
+    """
+    since = dict.fromkeys(SERIES, since_dt) if since_dt else get_series_since()
+
+    today = date.today()
+    until_dt_future = today + timedelta(days=45)
 
-    write_historic_to_db(cer, ccl, spy, inflacion)
-    if cpi_data:
-        write_cpi_to_db(cpi_data)
-    write_rem_to_db(rem_reports)
+    print(f"Updating dataset until {today} (CER until {until_dt_future}), since:")
+    for name in SERIES:
+        print(f"  {name}: {since[name]}")
+
+    load_saved_http_state()
+    deadline = start_run_deadline(args.budget)
+
+    if args.backfill:
+        progress = run_backfill(since_dt, today, deadline=deadline)
+        save_http_state()
+        for name, (done, total) in progress.items():
+            print(f"  {name}: {done}/{total} chunks")
+        incomplete = [name for name, (done, total) in progress.items() if done < total]
+        if incomplete:
+            print("Backfill incomplete; run again with the same --since to resume")
+        else:
+            print("Backfill complete")
+        if not sync_backfill_to_sheet(since_dt, today):
+            incomplete.append("sheet_historic")
+        return incomplete
+
+    nodes = skip_unavailable_sources(build_fetch_graph(since, today, until_dt_future))
+    # El daemon consulta solo las fuentes cuyo cron se cumplió. Con --since o
+    # --force no se mira la cadencia; si no, las mensuales van solo si toca
+    skipped = set(SOURCE_NODES) - sources if sources is not None else set()
+    if not since_dt and not args.force:
+        skipped |= sources_not_due()
+    nodes = prune_graph(
+        nodes, {node for source in skipped for node in SOURCE_NODES.get(source, (source,))}
+    )
+    results = run_graph(
+        nodes,
+        max_workers=FETCH_CONFIG["max_workers_graph"],
+        deadline=deadline,
+        grace=FETCH_CONFIG["persist_grace_seconds"],
+    )
+    save_http_state()
+    record_source_checks([n.name for n in nodes], set(results))
 
-    print("Dataset updated successfully")
+    failed = [n.name for n in nodes if n.name not in results]
+    if failed:
+        print(f"Dataset updated with failures in: {', '.join(failed)}")
+    else:
+        print("Dataset updated successfully")
+    return failed
 
 
 if __name__ == "__main__":
@@ -19,6 +19,7 @@ from calendar import monthrange
 import requests
 from dotenv import load_dotenv
 
+from src.connectors.http import get_http_session
 from src.connectors.sheets import get_sheets_client
 from src.config import SHEETS
 
@@ -65,7 +66,7 @@ def fetch_monthly_performance(
         "currency": currency,
     }
 
-    response = requests.get(
+    response = get_http_session().get(
         url, headers=get_headers(bearer_token), params=params, timeout=30
     )
     response.raise_for_status()
@@ -0,0 +1,161 @@
+"""Backfill histórico por chunks, en paralelo y con checkpoints (fetch_data --backfill).
+
+Cada serie diaria (CER, inflación, CCL, SPY) se parte en rangos de
+`backfill_chunk_days[serie]` días contados desde `since`, así los límites (y
+los ids de checkpoint) no dependen de la fecha en que se corre. Los chunks de
+todas las series se piden en paralelo; cada uno se guarda en SQLite apenas
+termina y se anota en fetch_state (`backfill:<serie>`), así un backfill de
+varios años interrumpido retoma desde el primer chunk que faltaba. Un chunk
+que la fuente contesta sin datos (feriados, fines de semana) también cuenta
+como hecho; solo los que fallan se reintentan.
+
+El último chunk puede terminar después de hoy: se pide recortado y no se anota,
+porque todavía le faltan días. La hoja histórica la actualiza fetch_data al
+final, desde la DB (ver run_fetch).
+
+CPI (INDEC/CABA) y REM no se parten: sus planillas ya traen toda la historia
+y la corrida normal las procesa de una vez.
+"""
+
+import json
+import logging
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+
+import requests
+
+from src.config import BCRA_VARIABLES, FETCH_CONFIG
+from src.connectors.http import get_http_session
+from src.db.writer import get_fetch_state, set_fetch_state, write_historic_to_db
+from src.deadline import Deadline
+from src.fetchers.bcra import BCRAVariablesFetcher, series_from_frame
+from src.fetchers.ccl import CCLFetcher
+from src.fetchers.spy import SPYFetcher
+from src.timeseries import TimeSeries
+
+logger = logging.getLogger(__name__)
+
+# Serie -> kwarg de write_historic_to_db que la recibe
+_DB_ARGUMENT = {
+    "cer": "cer_data",
+    "inflacion_mensual": "inflacion_data",
+    "ccl": "ccl_data",
+    "spy": "spy_data",
+}
+
+
+def chunk_ranges(since: date, until: date, days: int) -> list[tuple[date, date]]:
+    """Chunks consecutivos de `days` días (ambos inclusive) desde `since` que cubren `until`.
+
+    Los límites dependen solo de `since` y `days`: el último chunk termina
+    después de `until` salvo que caiga justo.
+    """
+    chunks = []
+    start = since
+    while start <= until:
+        end = start + timedelta(days=days - 1)
+        chunks.append((start, end))
+        start = end + timedelta(days=1)
+    return chunks
+
+
+def _build_sources(session: requests.Session) -> dict[str, Callable[[date, date], TimeSeries]]:
+    def bcra_series(name: str) -> Callable[[date, date], TimeSeries]:
+        fetcher = BCRAVariablesFetcher({name: BCRA_VARIABLES[name]}, session)
+        return lambda since, until: series_from_frame(fetcher.fetch(since, until), name)
+
+    ccl_fetcher = CCLFetcher(session)
+    spy_fetcher = SPYFetcher()
+    return {
+        "cer": bcra_series("cer"),
+        "inflacion_mensual": bcra_series("inflacion_mensual"),
+        "ccl": ccl_fetcher.fetch_ambito,
+        # yfinance toma `end` exclusivo; los chunks son inclusivos. SPYFetcher
+        # respeta el deadline y distingue "sin cotizaciones" de un error
+        "spy": lambda since, until: spy_fetcher.fetch(since, until + timedelta(days=1)),
+    }
+
+
+def _checkpoint_key(source: str) -> str:
+    return f"backfill:{source}"
+
+
+def _load_done(source: str) -> set[str]:
+    raw = get_fetch_state(_checkpoint_key(source))
+    return set(json.loads(raw)) if raw else set()
+
+
+def _chunk_id(chunk: tuple[date, date]) -> str:
+    return f"{chunk[0].isoformat()}:{chunk[1].isoformat()}"
+
+
+def run_backfill(
+    since: date,
+    until: date,
+    sources: list[str] | None = None,
+    deadline: Deadline | None = None,
+) -> dict[str, tuple[int, int]]:
+    """Corre el backfill y devuelve serie -> (chunks completos, chunks totales).
+
+    Los chunks que fallan no se marcan: se reintentan en la próxima corrida con
+    el mismo --since. El último (el que pasa `until`) cuenta como completo en
+    esta corrida si salió bien, pero no se anota en el checkpoint.
+    """
+    fetchers = _build_sources(get_http_session())
+    names = sources or list(fetchers)
+    chunk_days = FETCH_CONFIG["backfill_chunk_days"]
+
+    done = {name: _load_done(name) for name in names}
+    # Chunks que terminaron bien en esta corrida, incluido el último (parcial)
+    fetched: dict[str, set[str]] = {name: set() for name in names}
+    chunk_ids: dict[str, set[str]] = {}
+    tasks = []
+    for name in names:
+        chunks = chunk_ranges(since, until, chunk_days[name])
+        chunk_ids[name] = {_chunk_id(c) for c in chunks}
+        pending = [c for c in chunks if _chunk_id(c) not in done[name]]
+        logger.info(
+            f"Backfill {name}: {len(chunks) - len(pending)}/{len(chunks)} chunks already done"
+        )
+        tasks.extend((name, chunk) for chunk in pending)
+
+    with ThreadPoolExecutor(max_workers=FETCH_CONFIG["max_workers_backfill"]) as executor:
+        running: dict[Future, tuple[str, tuple[date, date]]] = {
+            executor.submit(fetchers[name], chunk[0], min(chunk[1], until)): (name, chunk)
+            for name, chunk in tasks
+        }
+        while running:
+            timeout = deadline.remaining() if deadline else None
+            finished, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not finished:
+                logger.warning(
+                    f"Backfill: run deadline reached with {len(running)} chunks pending"
+                )
+                for future in running:
+                    future.cancel()
+                break
+
+            for future in finished:
+                name, chunk = running.pop(future)
+                try:
+                    data = future.result()
+                except Exception as e:
+                    logger.error(f"Backfill {name} {_chunk_id(chunk)}: failed: {e}")
+                    continue
+                if data:
+                    # Se escribe desde este hilo: SQLite recibe un chunk a la vez
+                    series = {arg: TimeSeries.empty() for arg in _DB_ARGUMENT.values()}
+                    series[_DB_ARGUMENT[name]] = data
+                    write_historic_to_db(**series)
+                else:
+                    logger.info(f"Backfill {name} {_chunk_id(chunk)}: no data in range")
+                fetched[name].add(_chunk_id(chunk))
+                if chunk[1] <= until:
+                    done[name].add(_chunk_id(chunk))
+                    set_fetch_state(_checkpoint_key(name), json.dumps(sorted(done[name])))
+
+    return {
+        name: (len((done[name] | fetched[name]) & chunk_ids[name]), len(chunk_ids[name]))
+        for name in names
+    }
@@ -0,0 +1,64 @@
+"""Cadencia de las fuentes: qué fuentes pueden tener datos nuevos en esta corrida.
+
+REM, INDEC, CABA y FRED publican una vez por mes en fechas más o menos
+conocidas; consultarlas todos los días es bajar las mismas planillas para
+nada. Cada una declara su regla en `SOURCE_CADENCE` y la tabla source_status
+guarda cuándo se consultó por última vez y cuándo apareció un dato nuevo:
+
+- Dato nuevo hace menos de `stale_after_days`: no se consulta.
+- Si no: se consulta, como mucho una vez cada `check_every_hours`, hasta
+  que aparezca el siguiente.
+
+Una fuente sin historial (o cuyo último intento falló) siempre se consulta.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from src.config import SOURCE_CADENCE
+from src.db.writer import get_source_markers, get_source_status, record_source_check
+
+logger = logging.getLogger(__name__)
+
+
+def is_due(cadence: dict, status: dict | None, now: datetime) -> bool:
+    """True si la fuente puede tener un dato nuevo según su regla y su historial."""
+    if status is None or status["last_success"] is None:
+        return True
+    if status["last_change"] and now - status["last_change"] < timedelta(
+        days=cadence["stale_after_days"]
+    ):
+        return False
+    return now - status["last_success"] >= timedelta(hours=cadence["check_every_hours"])
+
+
+def sources_not_due(now: datetime | None = None) -> set[str]:
+    """Fuentes con cadencia que esta corrida puede saltear."""
+    now = now or datetime.now()
+    status = get_source_status()
+    due = {
+        name for name, cadence in SOURCE_CADENCE.items() if is_due(cadence, status.get(name), now)
+    }
+    # Si una fuente de un grupo toca, se consultan todas las del grupo
+    groups = {SOURCE_CADENCE[name].get("group") for name in due} - {None}
+    due |= {name for name, cadence in SOURCE_CADENCE.items() if cadence.get("group") in groups}
+
+    for name in sorted(set(SOURCE_CADENCE) - due):
+        last_change = status[name]["last_change"]
+        logger.info(
+            f"Skipping {name}: not due (last new data "
+            f"{f'{last_change:%Y-%m-%d}' if last_change else 'unknown'})"
+        )
+    return set(SOURCE_CADENCE) - due
+
+
+def record_source_checks(fetched: list[str], succeeded: set[str]) -> None:
+    """Anota el resultado de las fuentes con cadencia que corrieron.
+
+    Se llama después de persistir: el marker sale de la DB, así una fuente
+    cuyo dato no llegó a guardarse vuelve a consultarse.
+    """
+    markers = get_source_markers()
+    for name in fetched:
+        if name in SOURCE_CADENCE:
+            record_source_check(name, name in succeeded, markers.get(name))
@@ -27,6 +27,13 @@ SHEETS = {
 # GOOGLE SHEETS - Configuración de filas y límites
 # =============================================================================
 
+# Formato de las fechas que se escriben en cada hoja (USER_ENTERED)
+SHEET_DATE_FORMATS = {
+    "HISTORIC": "%d/%m/%Y",
+    "CPI": "%d/%m/%Y",
+    "REM": "%Y-%m-%d",
+}
+
 SHEET_LIMITS = {
     "first_data_row_ingresos": 3,
     "first_data_row_historic": 4,
@@ -139,7 +146,7 @@ INVERSIONES_COLUMN_FORMATS = {
 # =============================================================================
 
 API_URLS = {
-    "bcra_cer": "https://api.bcra.gob.ar/estadisticas/v4.0/Monetarias/30",
+    "bcra_monetarias": "https://api.bcra.gob.ar/estadisticas/v4.0/Monetarias/{id}",
     "ambito_ccl": "https://mercados.ambito.com//dolarrava/cl/grafico/{desde}/{hasta}",
     "dolarapi_ccl": "https://dolarapi.com/v1/dolares/contadoconliqui",
     "bcra_rem_base": "https://www.bcra.gob.ar",
@@ -151,10 +158,162 @@ FETCH_CONFIG = {
     "bcra_pagination_limit": 3000,
     "timeout_seconds": 30,
     "backfill_from": date(2022, 1, 1),
-    "max_workers_parallel": 5,
+    # Presupuesto de la corrida (--budget): al vencer se cancelan las fuentes
+    # pendientes y la persistencia tiene persist_grace_seconds extra
+    "run_budget_seconds": 600,
+    "persist_grace_seconds": 120,
+    "sheets_timeout_seconds": 60,
+    "db_timeout_seconds": 30,
+    # Días que se vuelven a pedir antes del último dato de cada serie, para
+    # levantar revisiones de la fuente (ver get_series_since)
+    "revision_overlap_days": {
+        "cer": 7,
+        "ccl": 7,
+        "spy": 7,
+        "benchmarks": 7,
+        "inflacion_mensual": 62,
+        "indec": 62,
+        "caba": 62,
+        "usa": 62,
+    },
+    # Nodos del grafo de fetch_data que pueden correr a la vez (fuentes + persistencia)
+    "max_workers_graph": 12,
     "max_workers_rem": 3,
+    # Páginas de la API Monetarias del BCRA pedidas a la vez (tras la primera)
+    "max_workers_bcra_pages": 4,
+    # Backfill histórico (fetch_data --backfill): días por chunk de cada serie
+    # y chunks pedidos a la vez
+    "backfill_chunk_days": {
+        "cer": 365,
+        "inflacion_mensual": 1825,
+        "ccl": 180,
+        "spy": 365,
+    },
+    "max_workers_backfill": 6,
+    # Lock de corrida (src/run_lock.py): una segunda invocación espera a que
+    # termine la activa y reusa su resultado. La espera sale de lo que sobra de
+    # run_timeout_seconds (TimeoutStartSec del unit de systemd) tras --budget,
+    # persist_grace_seconds y run_lock_margin_seconds: con los defaults, 120s.
+    # Si no alcanza, sale sin correr en lugar de que systemd la mate a mitad
+    "run_timeout_seconds": 900,
+    "run_lock_margin_seconds": 60,
+    "run_lock_poll_seconds": 2.0,
+    # Procesos para parsear planillas Excel (src/fetchers/parse_pool.py);
+    # None = uno por core, 1 = parsear en el mismo proceso
+    "max_workers_parse": None,
+    # CCL: si Ambito tarda más que el percentil de sus latencias recientes se
+    # lanza un segundo request; pasado el presupuesto se sigue sin el histórico
+    # (el solapamiento de revision_overlap_days lo recupera en la próxima corrida)
+    "ccl_hedge": {
+        "percentile": 90,
+        "default_seconds": 5.0,
+        "min_seconds": 1.0,
+        "history_size": 50,
+        "ambito_budget_seconds": 25.0,
+    },
+}
+
+# Sesión HTTP compartida (src/connectors/http.py)
+HTTP_CONFIG = {
+    "user_agent": "personal-finance/1.0 (+https://github.com/AlexONEX/personal-finance)",
+    "default_timeout_seconds": FETCH_CONFIG["timeout_seconds"],
+    "default_pool_maxsize": 4,
+    # Requests bloqueantes en vuelo a la vez desde el event loop (AsyncHTTPClient)
+    "max_in_flight_requests": 32,
+    # Reintentos de GET/HEAD ante errores de red, timeouts, 429 y 5xx
+    # (overrideable por host con "max_retries")
+    "max_retries": 3,
+    "backoff_base_seconds": 0.5,
+    "backoff_max_seconds": 8.0,
+    # Circuit breaker por host (src/connectors/resilience.py). Cuenta requests
+    # fallidos seguidos (con sus reintentos agotados), no intentos; igual se
+    # mantiene por encima de max_retries para que un request no alcance a abrirlo
+    "breaker_failure_threshold": 5,
+    "breaker_reset_seconds": 120.0,
+    # Concurrencia por host (AIMD, src/connectors/limiter.py): sube +1 por
+    # ventana de respuestas sanas, baja x decrease_factor ante 429/5xx/timeouts.
+    # Los límites aprendidos se guardan entre corridas en fetch_state.
+    "limiter": {
+        "initial": 4,
+        "min": 1,
+        "max": 16,
+        "latency_target_seconds": 5.0,
+        "decrease_factor": 0.5,
+        "cooldown_seconds": 1.0,
+    },
+}
+
+# Defaults por host. BCRA tiene problemas de certificado conocidos (infraestructura
+# del Banco Central): verify=False SOLO para sus hosts, como excepción necesaria.
+HTTP_HOSTS = {
+    "api.bcra.gob.ar": {"verify": False, "pool_maxsize": 8, "max_concurrency": 8},
+    "www.bcra.gob.ar": {"verify": False, "pool_maxsize": 8, "max_concurrency": 8},
+    # User-Agent de navegador para pasar la detección de bots de Ambito
+    "mercados.ambito.com": {"headers": {"User-Agent": "Mozilla/5.0"}},
+    "dolarapi.com": {"timeout": 10},
+    "www.indec.gob.ar": {"timeout": 10},
+    "api.stlouisfed.org": {"timeout": 10},
+}
+
+# Hosts de los que depende cada nodo fuente de fetch_data: si el circuit
+# breaker de todos ellos está abierto, la fuente se saltea (el estado de los
+# breakers se guarda en fetch_state, así vale también para la corrida siguiente).
+SOURCE_HOSTS = {
+    "bcra": ("api.bcra.gob.ar",),
+    "ccl_history": ("mercados.ambito.com",),
+    "ccl_today": ("dolarapi.com",),
+    "rem": ("www.bcra.gob.ar",),
+    "indec": ("www.indec.gob.ar",),
+    "caba": ("www.estadisticaciudad.gob.ar",),
+    "usa": ("api.stlouisfed.org",),
 }
 
+# Cadencia de las fuentes mensuales de fetch_data (ver src/cadence.py).
+# Una fuente se consulta solo si su último dato nuevo tiene más de
+# stale_after_days días; desde ahí, como mucho una vez cada check_every_hours
+# hasta que aparezca la publicación siguiente. Las fuentes de un mismo
+# "group" se consultan juntas (la hoja CPI se reescribe con las tres).
+# Las que no figuran acá (bcra, ccl, benchmarks) se consultan en cada corrida.
+SOURCE_CADENCE = {
+    "rem": {"stale_after_days": 25, "check_every_hours": 20},
+    "indec": {"stale_after_days": 25, "check_every_hours": 20, "group": "cpi"},
+    "caba": {"stale_after_days": 25, "check_every_hours": 20, "group": "cpi"},
+    "usa": {"stale_after_days": 25, "check_every_hours": 20, "group": "cpi"},
+}
+
+# Modo --daemon (src/daemon.py): cuándo consultar cada fuente, en cron de
+# 5 campos (minuto hora día-del-mes mes día-de-semana, 0 = domingo).
+# Las mensuales además respetan SOURCE_CADENCE.
+DAEMON_SCHEDULE = {
+    "bcra": "0 8 * * *",
+    "ccl": "0 8-18 * * 1-5",
+    "benchmarks": "30 18 * * 1-5",
+    "rem": "0 8 * * *",
+    "indec": "0 8 * * *",
+    "caba": "0 8 * * *",
+    "usa": "0 8 * * *",
+}
+
+# Variables de la API Monetarias del BCRA que baja BCRAVariablesFetcher.
+# "divisor" convierte el valor publicado (ej: 2.7 = 2.7% -> 0.027).
+# Las de HISTORIC_BCRA_VARIABLES van a historic_data (y a la hoja histórica);
+# cualquier otra se guarda en la tabla bcra_series (date, variable, value),
+# con su propio watermark. Para sumar una serie alcanza con agregarla acá, ej:
+#   "a3500": {"id": 5, "divisor": 1}, "badlar": {"id": 7, "divisor": 100}
+BCRA_VARIABLES = {
+    "cer": {"id": 30, "divisor": 1},
+    "inflacion_mensual": {"id": 27, "divisor": 100},
+}
+HISTORIC_BCRA_VARIABLES = ("cer", "inflacion_mensual")
+
+# Benchmarks que baja BenchmarksFetcher, en paralelo (símbolos de Yahoo
+# Finance). HISTORIC_BENCHMARK sigue yendo a historic_data.spy y a la hoja
+# histórica; el resto se guarda en benchmark_prices (date, ticker, close).
+# Sumar un benchmark es agregarlo acá (un request más, en paralelo). Un ticker
+# nuevo se baja desde donde van los demás; para traer su historia, usar --since.
+BENCHMARK_TICKERS = ("SPY", "QQQ", "GLD", "ARGT", "^MERV")
+HISTORIC_BENCHMARK = "SPY"
+
 # Mapeo de meses (español -> número)
 MONTHS_MAP = {
     "enero": 1,
@@ -1,8 +1,16 @@
 """Connectors para APIs externas."""
 
+from .http import AsyncHTTPClient, HostAwareSession, get_async_http_client, get_http_session
+from .http_cache import CachedResponse, HTTPCache
 from .sheets import get_sheets_client, get_worksheet
 
 __all__ = [
+    "AsyncHTTPClient",
+    "CachedResponse",
+    "HTTPCache",
+    "HostAwareSession",
+    "get_async_http_client",
+    "get_http_session",
     "get_sheets_client",
     "get_worksheet",
 ]
@@ -0,0 +1,226 @@
+"""Sesión HTTP compartida con pools, TLS, timeouts y headers por host.
+
+Todos los fetchers reciben esta sesión por inyección (o usan la global de
+`get_http_session`), así los requests al mismo host reutilizan conexiones
+keep-alive en lugar de pagar un handshake TCP+TLS cada vez.
+
+`AsyncHTTPClient` expone esa misma sesión a código asyncio (ver
+`AsyncDataSource`) despachando cada request a un pool acotado de hilos: no es
+I/O async nativo, cada request en vuelo ocupa un hilo.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import HTTP_CONFIG, HTTP_HOSTS
+from src.connectors.limiter import get_limiter
+from src.connectors.resilience import (
+    IDEMPOTENT_METHODS,
+    OPEN,
+    RETRY_STATUSES,
+    CircuitBreaker,
+    backoff_delay,
+    get_breaker,
+)
+from src.deadline import get_run_deadline
+
+logger = logging.getLogger(__name__)
+
+_session: requests.Session | None = None
+_async_client: "AsyncHTTPClient | None" = None
+
+T = TypeVar("T")
+
+
+class DeadlineExceededError(requests.exceptions.Timeout):
+    """Venció el deadline de la corrida (ver src/deadline.py); el request no se envió."""
+
+
+class HostAwareSession(requests.Session):
+    """requests.Session que aplica la configuración de HTTP_HOSTS según el host.
+
+    Por host se puede definir:
+        verify: Verificación TLS (False solo para hosts con certificados rotos)
+        timeout: Timeout por defecto en segundos
+        headers: Headers extra (ej: User-Agent de navegador)
+        pool_maxsize: Conexiones keep-alive que se mantienen abiertas
+        max_concurrency: Tope del límite adaptativo de requests simultáneos
+        max_retries: Reintentos de GET/HEAD (default HTTP_CONFIG["max_retries"])
+
+    Los kwargs explícitos de cada request tienen prioridad sobre estos defaults.
+    Todo request pasa por el circuit breaker de su host (ver resilience.py) y
+    por su límite de concurrencia adaptativo (ver limiter.py).
+    """
+
+    def __init__(
+        self,
+        hosts: dict[str, dict] | None = None,
+        default_timeout: float = HTTP_CONFIG["default_timeout_seconds"],
+        user_agent: str = HTTP_CONFIG["user_agent"],
+    ) -> None:
+        super().__init__()
+        self.hosts = hosts if hosts is not None else HTTP_HOSTS
+        self.default_timeout = default_timeout
+        self.headers["User-Agent"] = user_agent
+
+        default_pool = HTTP_CONFIG["default_pool_maxsize"]
+        self.mount("https://", HTTPAdapter(pool_maxsize=default_pool))
+        self.mount("http://", HTTPAdapter(pool_maxsize=default_pool))
+        for host, cfg in self.hosts.items():
+            pool_maxsize = cfg.get("pool_maxsize", default_pool)
+            self.mount(f"https://{host}/", HTTPAdapter(pool_maxsize=pool_maxsize))
+
+    def request(self, method, url, **kwargs):
+        host = urlsplit(url).hostname or ""
+        cfg = self.hosts.get(host, {})
+
+        timeout = kwargs.pop("timeout", cfg.get("timeout", self.default_timeout))
+        if "verify" in cfg:
+            kwargs.setdefault("verify", cfg["verify"])
+        if "headers" in cfg:
+            kwargs["headers"] = {**cfg["headers"], **(kwargs.get("headers") or {})}
+
+        retries = cfg.get("max_retries", HTTP_CONFIG["max_retries"])
+        if method.upper() not in IDEMPOTENT_METHODS:
+            retries = 0
+        breaker = get_breaker(host)
+        deadline = get_run_deadline()
+
+        attempt = 0
+        while True:
+            if deadline and deadline.expired():
+                raise DeadlineExceededError(f"Run deadline exceeded before {method} {url}")
+            probe = breaker.before_request()
+            try:
+                response = self._send(method, url, host, timeout, deadline, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if deadline and deadline.expired():
+                    # Cortado por el deadline de la corrida, no por el host
+                    raise DeadlineExceededError(
+                        f"Run deadline exceeded during {method} {url}"
+                    ) from e
+                if self._exhausted(breaker, attempt, retries):
+                    breaker.record_failure()
+                    raise
+                reason = e
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success()
+                    return response
+                if self._exhausted(breaker, attempt, retries):
+                    # 429 es el host pidiendo calma, no un host caído
+                    if response.status_code != 429:
+                        breaker.record_failure()
+                    return response
+                response.close()
+                reason = response.status_code
+            finally:
+                if probe:
+                    breaker.release_probe()
+
+            self._wait_before_retry(method, url, attempt, retries, reason)
+            attempt += 1
+
+    def _exhausted(self, breaker: CircuitBreaker, attempt: int, retries: int) -> bool:
+        """True si el request ya no se reintenta y su fallo cuenta para el breaker.
+
+        El breaker cuenta requests fallidos, no intentos: los reintentos de un
+        mismo request no lo abren. Si otro request lo abrió mientras tanto, se
+        corta acá en lugar de esperar el backoff para chocar con CircuitOpenError.
+        """
+        return attempt == retries or breaker.state == OPEN
+
+    def _send(self, method, url, host, timeout, deadline, **kwargs):
+        """Un intento, dentro del límite de concurrencia adaptativo del host."""
+        limiter = get_limiter(host)
+        if not limiter.acquire(timeout=deadline.remaining() if deadline else None):
+            raise DeadlineExceededError(f"Run deadline exceeded waiting to {method} {url}")
+
+        started = time.monotonic()
+        healthy = False
+        try:
+            response = super().request(
+                method, url, timeout=deadline.clamp(timeout) if deadline else timeout, **kwargs
+            )
+            healthy = response.status_code not in RETRY_STATUSES
+            return response
+        finally:
+            limiter.release(healthy, time.monotonic() - started)
+
+    def _wait_before_retry(self, method, url, attempt, retries, reason) -> None:
+        delay = backoff_delay(
+            attempt, HTTP_CONFIG["backoff_base_seconds"], HTTP_CONFIG["backoff_max_seconds"]
+        )
+        deadline = get_run_deadline()
+        if deadline and deadline.remaining() <= delay:
+            raise DeadlineExceededError(f"Run deadline leaves no time to retry {method} {url}")
+        logger.warning(
+            f"HTTP: {method} {url} failed ({reason}), "
+            f"retry {attempt + 1}/{retries} in {delay:.1f}s"
+        )
+        time.sleep(delay)
+
+
+def get_http_session() -> requests.Session:
+    """Devuelve la sesión HTTP compartida del proceso (se crea la primera vez)."""
+    global _session
+    if _session is None:
+        _session = HostAwareSession()
+    return _session
+
+
+class AsyncHTTPClient:
+    """Cliente para corrutinas sobre la sesión compartida.
+
+    Adaptación, no I/O asyncio nativo: no hay cliente HTTP async (httpx,
+    aiohttp) entre las dependencias, y el circuit breaker, los reintentos y el
+    límite adaptativo por host viven en la sesión de `requests`. Cada llamada
+    bloqueante (un request, un parse del cache) se despacha a un pool acotado
+    a `max_in_flight` hilos y se espera desde el event loop, así que cada
+    request en vuelo sigue ocupando un hilo. Lo que se gana es que todas las
+    fuentes comparten ese único tope y el mismo pool de conexiones, en lugar
+    de un ThreadPoolExecutor por fuente.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        max_in_flight: int = HTTP_CONFIG["max_in_flight_requests"],
+    ) -> None:
+        self.session = session or get_http_session()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="http"
+        )
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Ejecuta una llamada bloqueante (que hace I/O) sin bloquear el loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return await self.run(self.session.get, url, **kwargs)
+
+    async def head(self, url: str, **kwargs: Any) -> requests.Response:
+        return await self.run(self.session.head, url, **kwargs)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_async_http_client() -> AsyncHTTPClient:
+    """Devuelve el AsyncHTTPClient compartido (sobre `get_http_session`)."""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncHTTPClient(get_http_session())
+    return _async_client
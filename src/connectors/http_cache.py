@@ -0,0 +1,264 @@
+"""Cache HTTP en disco con GET condicional para fuentes que cambian poco.
+
+Guarda, por URL, el último cuerpo recibido junto con su ETag/Last-Modified y
+hash. En cada request manda If-None-Match / If-Modified-Since: si el servidor
+contesta 304 no se transfiere nada y se devuelve el cuerpo cacheado. Además
+`parse` memoriza el resultado de parsear un cuerpo, así un archivo sin cambios
+tampoco se vuelve a parsear. La entrada parseada se guarda como JSON (nunca
+pickle: el directorio es compartido) y solo se reutiliza si coinciden la
+versión del formato, el parser con sus argumentos y el hash del cuerpo.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.connectors.http import get_http_session
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_CACHE_DIR = "/srv/data/personal-finance/http-cache"
+
+# Subirla cuando cambie la lógica de algún parser o el formato de las entradas:
+# invalida todo lo parseado que haya en disco.
+_PARSE_CACHE_VERSION = 2
+
+
+class CachedResponse:
+    """Respuesta de HTTPCache.get, compatible con lo que usan los fetchers de requests.Response.
+
+    Attributes:
+        changed: False si el servidor devolvió 304 o el cuerpo tiene el mismo
+            hash que la última vez
+        content_hash: sha256 del cuerpo
+    """
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        headers: dict[str, str],
+        content: bytes,
+        changed: bool,
+        content_hash: str | None,
+    ) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.changed = changed
+        self.content_hash = content_hash
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class HTTPCache:
+    """Cache de respuestas en disco indexado por URL (incluyendo query string)."""
+
+    def __init__(
+        self, session: requests.Session | None = None, directory: str | None = None
+    ) -> None:
+        self.session = session or get_http_session()
+        self.directory = Path(directory or os.getenv("HTTP_CACHE_DIR", _DEFAULT_CACHE_DIR))
+
+    def get(self, url: str, params: dict | None = None, **kwargs) -> CachedResponse:
+        """GET condicional. Solo se cachean respuestas 200.
+
+        Los errores de red se propagan igual que con session.get; los HTTP
+        4xx/5xx se devuelven y el caller decide (raise_for_status).
+        """
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        paths = self._paths(full_url)
+        meta = self._load_meta(paths["meta"])
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if meta and paths["body"].exists():
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        resp = self.session.get(full_url, headers=headers, **kwargs)
+
+        if resp.status_code == 304 and meta:
+            logger.info(f"HTTP cache: {full_url} not modified (304)")
+            return CachedResponse(
+                full_url,
+                200,
+                meta.get("headers", {}),
+                paths["body"].read_bytes(),
+                changed=False,
+                content_hash=meta["hash"],
+            )
+
+        if resp.status_code != 200:
+            return CachedResponse(
+                full_url, resp.status_code, dict(resp.headers), resp.content, True, None
+            )
+
+        content_hash = hashlib.sha256(resp.content).hexdigest()
+        changed = not meta or meta.get("hash") != content_hash
+        if not changed:
+            logger.info(f"HTTP cache: {full_url} unchanged (same hash)")
+
+        self._store(
+            paths,
+            resp.content,
+            {
+                "url": full_url,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "hash": content_hash,
+                "headers": {
+                    k: v for k, v in resp.headers.items() if k.lower() == "content-type"
+                },
+            },
+        )
+        return CachedResponse(
+            full_url, 200, dict(resp.headers), resp.content, changed, content_hash
+        )
+
+    def parse(
+        self, response: CachedResponse, parser: Callable[..., Any], *args, **kwargs
+    ) -> Any:
+        """Parsea `response.content`, reutilizando el resultado si el cuerpo no cambió.
+
+        Llama a `parser(response.content, *args, **kwargs)`. La entrada en disco
+        queda atada al nombre calificado del parser, sus argumentos y
+        `_PARSE_CACHE_VERSION`, así cambiar cualquiera de ellos la invalida.
+        Solo se cachean str y DataFrames con celdas escalares o fechas.
+        """
+        paths = self._paths(response.url)
+        parse_key = _parse_key(parser, args, kwargs)
+        if not response.changed and paths["parsed"].exists():
+            try:
+                entry = json.loads(paths["parsed"].read_text())
+                if (
+                    entry.get("version") == _PARSE_CACHE_VERSION
+                    and entry.get("parser") == parse_key
+                    and entry.get("hash") == response.content_hash
+                ):
+                    return _decode_parsed(entry["value"])
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"HTTP cache: discarding parsed entry for {response.url}: {e}")
+
+        value = parser(response.content, *args, **kwargs)
+        if response.content_hash:
+            try:
+                entry = {
+                    "version": _PARSE_CACHE_VERSION,
+                    "parser": parse_key,
+                    "hash": response.content_hash,
+                    "value": _encode_parsed(value),
+                }
+                self._write_atomic(paths["parsed"], json.dumps(entry).encode())
+            except TypeError as e:
+                logger.debug(f"HTTP cache: not caching parsed {response.url}: {e}")
+            except OSError as e:
+                logger.warning(f"HTTP cache: failed to store parsed {response.url}: {e}")
+        return value
+
+    def _paths(self, full_url: str) -> dict[str, Path]:
+        key = hashlib.sha256(full_url.encode()).hexdigest()[:32]
+        return {
+            "meta": self.directory / f"{key}.json",
+            "body": self.directory / f"{key}.body",
+            "parsed": self.directory / f"{key}.parsed.json",
+        }
+
+    def _load_meta(self, path: Path) -> dict | None:
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"HTTP cache: ignoring unreadable entry {path}: {e}")
+            return None
+
+    def _store(self, paths: dict[str, Path], content: bytes, meta: dict) -> None:
+        try:
+            self._write_atomic(paths["body"], content)
+            self._write_atomic(paths["meta"], json.dumps(meta).encode())
+        except OSError as e:
+            logger.warning(f"HTTP cache: failed to store {meta['url']}: {e}")
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+def _parse_key(parser: Callable[..., Any], args: tuple, kwargs: dict) -> str:
+    """Identifica parser + argumentos: módulo.nombre_calificado(args, kwargs)."""
+    name = f"{parser.__module__}.{parser.__qualname__}"
+    return f"{name}{(tuple(args), sorted(kwargs.items()))!r}"
+
+
+def _encode_cell(value: Any) -> Any:
+    if value is None or isinstance(value, str | bool | int | float):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    raise TypeError(f"unsupported cell type {type(value).__name__}")
+
+
+def _decode_cell(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "datetime" in value:
+            return datetime.fromisoformat(value["datetime"])
+        return date.fromisoformat(value["date"])
+    return value
+
+
+def _encode_parsed(value: Any) -> dict:
+    """Resultado de un parser -> dict serializable a JSON (TypeError si no se soporta)."""
+    if isinstance(value, str):
+        return {"type": "str", "value": value}
+    if isinstance(value, pd.DataFrame):
+        return {
+            "type": "frame",
+            "index": [_encode_cell(v) for v in value.index],
+            "columns": [_encode_cell(v) for v in value.columns],
+            "data": [[_encode_cell(v) for v in row] for row in value.to_numpy(dtype=object)],
+        }
+    raise TypeError(f"unsupported parsed type {type(value).__name__}")
+
+
+def _decode_parsed(entry: dict) -> Any:
+    if entry["type"] == "str":
+        return entry["value"]
+    if entry["type"] == "frame":
+        data = np.full((len(entry["index"]), len(entry["columns"])), None, dtype=object)
+        for i, row in enumerate(entry["data"]):
+            data[i, :] = [_decode_cell(v) for v in row]
+        return pd.DataFrame(
+            data,
+            index=[_decode_cell(v) for v in entry["index"]],
+            columns=[_decode_cell(v) for v in entry["columns"]],
+        )
+    raise ValueError(f"unknown parsed entry type {entry['type']!r}")
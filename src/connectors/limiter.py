@@ -0,0 +1,102 @@
+"""Límite de concurrencia adaptativo (AIMD) por host.
+
+Cada host tiene un límite de requests simultáneos que:
+- sube de a poco (+1 por "ventana" de `limit` respuestas sanas: rápidas y sin error),
+- baja a la mitad ante 429, 5xx, errores de red o timeouts (como mucho una
+  vez por `cooldown_seconds`, para no castigar varias veces la misma ráfaga).
+
+Así BCRA no recibe más requests de los que aguanta y los hosts holgados
+(FRED) no quedan limitados por un pool fijo. `limiter_states` /
+`load_limiter_states` permiten guardar los límites entre corridas.
+"""
+
+import logging
+import threading
+import time
+
+from src.config import HTTP_CONFIG, HTTP_HOSTS
+
+logger = logging.getLogger(__name__)
+
+
+class AIMDLimiter:
+    """Semáforo cuyo tamaño se ajusta con additive-increase/multiplicative-decrease."""
+
+    def __init__(
+        self,
+        host: str,
+        initial: float | None = None,
+        min_limit: float | None = None,
+        max_limit: float | None = None,
+    ) -> None:
+        cfg = HTTP_CONFIG["limiter"]
+        host_cfg = HTTP_HOSTS.get(host, {})
+        self.host = host
+        self.min_limit = min_limit or cfg["min"]
+        self.max_limit = max_limit or host_cfg.get("max_concurrency", cfg["max"])
+        self.limit = self._bounded(initial or cfg["initial"])
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Espera un lugar libre; False si pasa `timeout` sin conseguirlo."""
+        with self._cond:
+            ok = self._cond.wait_for(lambda: self.in_flight < int(self.limit), timeout)
+            if ok:
+                self.in_flight += 1
+            return ok
+
+    def release(self, healthy: bool, latency: float | None = None) -> None:
+        """Libera el lugar y ajusta el límite según cómo salió el request.
+
+        Args:
+            healthy: False ante 429/5xx/error de red/timeout
+            latency: Segundos que tardó la respuesta (las lentas no suben el límite)
+        """
+        cfg = HTTP_CONFIG["limiter"]
+        with self._cond:
+            self.in_flight -= 1
+            if not healthy:
+                now = time.monotonic()
+                if now - self._last_decrease >= cfg["cooldown_seconds"]:
+                    previous = self.limit
+                    self.limit = self._bounded(self.limit * cfg["decrease_factor"])
+                    self._last_decrease = now
+                    logger.info(
+                        f"HTTP limiter: {self.host} concurrency {previous:.1f} -> {self.limit:.1f}"
+                    )
+            elif latency is None or latency <= cfg["latency_target_seconds"]:
+                self.limit = self._bounded(self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def _bounded(self, value: float) -> float:
+        return min(self.max_limit, max(self.min_limit, value))
+
+
+_limiters: dict[str, AIMDLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(host: str) -> AIMDLimiter:
+    """Devuelve el limiter del host (compartido por todo el proceso)."""
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = AIMDLimiter(host)
+        return _limiters[host]
+
+
+def limiter_states() -> dict[str, float]:
+    """Límite actual de cada host, para persistirlo entre corridas."""
+    with _limiters_lock:
+        return {host: round(lim.limit, 2) for host, lim in _limiters.items()}
+
+
+def load_limiter_states(states: dict[str, float]) -> None:
+    """Arranca los limiters desde los límites guardados de una corrida anterior."""
+    with _limiters_lock:
+        for host, limit in states.items():
+            if host in _limiters:
+                _limiters[host].limit = _limiters[host]._bounded(limit)
+            else:
+                _limiters[host] = AIMDLimiter(host, initial=limit)
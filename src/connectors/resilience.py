@@ -0,0 +1,182 @@
+"""Reintentos con backoff y circuit breakers por host para la sesión HTTP.
+
+- Los requests idempotentes (GET/HEAD) que fallan por red, timeout o 5xx/429
+  se reintentan con backoff exponencial con jitter completo.
+- Cada host tiene un breaker: tras `failure_threshold` requests fallidos seguidos
+  (cada uno con sus reintentos agotados; los reintentos no suman) queda
+  abierto y los requests siguientes fallan al instante con CircuitOpenError
+  (en lugar de esperar el timeout entero). Pasado `reset_seconds` deja pasar
+  un request de prueba (half-open): si sale bien se cierra, si no se reabre.
+
+`breaker_states()` expone el estado para que la corrida pueda saltear
+fuentes cuyo host está caído. `breaker_snapshots` / `load_breaker_snapshots`
+permiten guardarlo entre corridas: sin eso, cada corrida one-shot arrancaría
+con todos los breakers cerrados.
+"""
+
+import logging
+import random
+import threading
+import time
+
+import requests
+
+from src.config import HTTP_CONFIG
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """El breaker del host está abierto: el request no se envió.
+
+    Hereda de ConnectionError para que los `except RequestException` de los
+    fetchers lo traten como cualquier otro fallo de red.
+    """
+
+
+class CircuitBreaker:
+    """Breaker de un host (thread-safe)."""
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = HTTP_CONFIG["breaker_failure_threshold"],
+        reset_seconds: float = HTTP_CONFIG["breaker_reset_seconds"],
+    ) -> None:
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return HALF_OPEN
+        return OPEN
+
+    def before_request(self) -> bool:
+        """Levanta CircuitOpenError si el host no acepta requests ahora.
+
+        Devuelve True si el request es la prueba del estado half-open: el
+        caller debe llamar a `release_probe` cuando termine, salga como salga.
+        """
+        with self._lock:
+            state = self._state()
+            if state == OPEN or (state == HALF_OPEN and self._probing):
+                raise CircuitOpenError(f"Circuit open for {self.host}")
+            if state == HALF_OPEN:
+                self._probing = True
+                return True
+            return False
+
+    def release_probe(self) -> None:
+        """Libera la prueba half-open aunque no haya registrado éxito ni fallo.
+
+        Sin esto, un 429 o una excepción inesperada durante la prueba dejaría
+        el host bloqueado para siempre.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"HTTP: circuit for {self.host} closed")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(
+                        f"HTTP: circuit for {self.host} opened after "
+                        f"{self._failures} consecutive failures"
+                    )
+                self._opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        """Fallos seguidos y momento de apertura (epoch) para persistirlos."""
+        with self._lock:
+            opened_at = None
+            if self._opened_at is not None:
+                opened_at = time.time() - (time.monotonic() - self._opened_at)
+            return {"failures": self._failures, "opened_at": opened_at}
+
+    def restore(self, snapshot: dict) -> None:
+        """Carga un `snapshot` de otra corrida (el reloj monotónico no se comparte)."""
+        with self._lock:
+            self._failures = int(snapshot.get("failures", 0))
+            opened_at = snapshot.get("opened_at")
+            self._opened_at = (
+                None if opened_at is None else time.monotonic() - (time.time() - opened_at)
+            )
+            self._probing = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """Devuelve el breaker del host (compartido por todo el proceso)."""
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
+
+
+def breaker_states() -> dict[str, str]:
+    """Estado actual de cada host que ya recibió requests."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.host: b.state for b in breakers}
+
+
+def breaker_snapshots() -> dict[str, dict]:
+    """Breakers con fallos o abiertos, para persistirlos entre corridas."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    snapshots = {b.host: b.snapshot() for b in breakers}
+    return {
+        host: snap
+        for host, snap in snapshots.items()
+        if snap["failures"] or snap["opened_at"] is not None
+    }
+
+
+def load_breaker_snapshots(snapshots: dict[str, dict]) -> None:
+    """Arranca los breakers desde el estado guardado por una corrida anterior."""
+    for host, snap in snapshots.items():
+        get_breaker(host).restore(snap)
+
+
+def is_host_available(host: str) -> bool:
+    """False si el breaker del host está abierto (un request fallaría al instante)."""
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+    return breaker is None or breaker.state != OPEN
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Backoff exponencial con jitter completo para el reintento `attempt` (0-based)."""
+    return random.uniform(0, min(cap, base * 2**attempt))
@@ -2,14 +2,22 @@
 
 import logging
 import os
+import threading
+from collections.abc import Sequence
+from datetime import date
 from pathlib import Path
+from typing import Any
 
 import gspread
+import numpy as np
+import pandas as pd
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials as OAuthCredentials
 from google.oauth2.service_account import Credentials as ServiceAccountCredentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 
+from src.timeseries import datetime64_to_ordinals, ordinals_to_datetime64
+
 logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
@@ -17,11 +25,20 @@ OAUTH_CREDENTIALS_FILE = "credentials.json"
 OAUTH_TOKEN_FILE = "token.json"
 SERVICE_ACCOUNT_FILE = "service_account.json"
 
+# Día 0 de los serials de fecha de Google Sheets
+SHEETS_EPOCH = date(1899, 12, 30)
+
+_client: gspread.Client | None = None
+_client_lock = threading.Lock()
+
 
 def get_sheets_client() -> gspread.Client:
     """Get authenticated gspread client.
 
     Tries OAuth first (if credentials.json exists), falls back to service account.
+    The client is built once per process and reused: its credentials refresh
+    the access token on their own, so a long-running process (--daemon)
+    authenticates only at startup.
 
     Returns:
         Authenticated gspread client
@@ -29,6 +46,14 @@ def get_sheets_client() -> gspread.Client:
     Raises:
         FileNotFoundError: If neither OAuth nor service account credentials found
     """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = _build_sheets_client()
+        return _client
+
+
+def _build_sheets_client() -> gspread.Client:
     # Try OAuth first
     if Path(OAUTH_CREDENTIALS_FILE).exists():
         return _get_oauth_client()
@@ -93,3 +118,30 @@ def get_worksheet(spreadsheet_id: str, sheet_name: str) -> gspread.Worksheet:
     """
     client = get_sheets_client()
     return client.open_by_key(spreadsheet_id).worksheet(sheet_name)
+
+
+def format_sheet_dates(days: np.ndarray, fmt: str) -> list[str]:
+    """Ordinales (`date.toordinal()`) -> textos de fecha para escribir en la hoja.
+
+    Es la única conversión a texto: el resto del pipeline trabaja con `date`
+    u ordinales, y acá se formatea toda la columna de una vez.
+    """
+    return pd.DatetimeIndex(ordinals_to_datetime64(days)).strftime(fmt).tolist()
+
+
+def parse_sheet_dates(cells: Sequence[Any], fmt: str) -> np.ndarray:
+    """Celdas de fecha leídas de la hoja -> ordinales int32 (0 si no es una fecha).
+
+    Acepta texto en `fmt` (FORMATTED_VALUE) y serials numéricos
+    (UNFORMATTED_VALUE, días desde `SHEETS_EPOCH`).
+    """
+    values = pd.Series(list(cells), dtype=object)
+    serials = pd.to_numeric(values, errors="coerce")
+    texts = pd.to_datetime(values.where(serials.isna()), format=fmt, errors="coerce")
+
+    days = np.zeros(len(values), dtype=np.int32)
+    is_text = texts.notna().to_numpy()
+    days[is_text] = datetime64_to_ordinals(texts[is_text].to_numpy())
+    is_serial = serials.notna().to_numpy()
+    days[is_serial] = SHEETS_EPOCH.toordinal() + np.floor(serials[is_serial]).astype(np.int64)
+    return days
@@ -0,0 +1,115 @@
+"""Modo --daemon: un proceso residente que corre las fuentes según su cron.
+
+Con el timer de systemd cada corrida paga el arranque entero: importar
+pandas/yfinance/openpyxl/SQLAlchemy, autenticar con Google y abrir
+conexiones nuevas a cada host. El daemon lo paga una vez; después reusa la
+sesión HTTP (pools keep-alive, breakers y limiters), el cliente de gspread
+ya autorizado, el engine de SQLite y el pool de parseo, así un refresh
+horario del CCL cuesta lo que cuestan sus requests.
+
+`CronSchedule` entiende lo mínimo de cron: `*`, `*/n`, `a-b`, `a-b/n`, `a/n`,
+números y listas separadas por coma.
+"""
+
+import logging
+import signal
+import threading
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from src.config import DAEMON_SCHEDULE
+
+logger = logging.getLogger(__name__)
+
+# (mínimo, máximo) de cada campo de cron
+_FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+
+def _parse_field(field: str, low: int, high: int) -> set[int]:
+    values: set[int] = set()
+    for part in field.split(","):
+        base, _, step = part.partition("/")
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start, end = (int(v) for v in base.split("-"))
+        else:
+            # "5/15" = desde 5 hasta el máximo, cada 15
+            start = int(base)
+            end = high if step else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field out of range: {part!r}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return values
+
+
+class CronSchedule:
+    """Expresión cron de 5 campos (minuto hora día mes día-de-semana)."""
+
+    def __init__(self, expr: str) -> None:
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expr!r}")
+        self.expr = expr
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_field(f, low, high) for f, (low, high) in zip(fields, _FIELD_RANGES, strict=True)
+        )
+        # Como en cron: si día-del-mes y día-de-semana están restringidos,
+        # alcanza con que coincida uno de los dos
+        self._either_day = fields[2] != "*" and fields[4] != "*"
+
+    def matches(self, dt: datetime) -> bool:
+        return self._matches_day(dt) and dt.hour in self.hours and dt.minute in self.minutes
+
+    def next_after(self, dt: datetime) -> datetime:
+        """Primer minuto estrictamente posterior a `dt` que cumple la expresión."""
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # 4 años: alcanza para un 29 de febrero
+        limit = candidate + timedelta(days=4 * 366)
+        while candidate < limit:
+            if not self._matches_day(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never fires: {self.expr!r}")
+
+    def _matches_day(self, dt: datetime) -> bool:
+        if dt.month not in self.months:
+            return False
+        day_ok = dt.day in self.days
+        weekday_ok = dt.isoweekday() % 7 in self.weekdays
+        return day_ok or weekday_ok if self._either_day else day_ok and weekday_ok
+
+
+def run_daemon(
+    run: Callable[[set[str]], None],
+    schedule: dict[str, str] | None = None,
+    stop: threading.Event | None = None,
+) -> None:
+    """Corre `run(fuentes)` cada vez que el cron de alguna fuente se cumple.
+
+    Las fuentes que coinciden en el mismo minuto van en una sola corrida.
+    Termina con SIGTERM/SIGINT (o `stop.set()`), sin cortar la corrida en curso.
+    """
+    crons = {name: CronSchedule(expr) for name, expr in (schedule or DAEMON_SCHEDULE).items()}
+    stop = stop or threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: stop.set())
+
+    while not stop.is_set():
+        fire_at = min(cron.next_after(datetime.now()) for cron in crons.values())
+        due = {name for name, cron in crons.items() if cron.matches(fire_at)}
+        logger.info(f"Daemon: next run at {fire_at:%Y-%m-%d %H:%M} ({', '.join(sorted(due))})")
+        if stop.wait(max(0.0, (fire_at - datetime.now()).total_seconds())):
+            break
+        try:
+            run(due)
+        except Exception as e:
+            logger.exception(f"Daemon: run for {', '.join(sorted(due))} failed: {e}")
+
+    logger.info("Daemon: stopped")
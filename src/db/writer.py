@@ -1,17 +1,48 @@
 import logging
 import os
+import threading
 from datetime import date, datetime, timedelta
 
-from sqlalchemy import Column, Date, Float, Integer, MetaData, Table, create_engine, func, select
+import pandas as pd
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    case,
+    create_engine,
+    func,
+    select,
+    update,
+)
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.engine import Engine
 
+from src.config import (
+    BCRA_VARIABLES,
+    BENCHMARK_TICKERS,
+    FETCH_CONFIG,
+    HISTORIC_BCRA_VARIABLES,
+    HISTORIC_BENCHMARK,
+)
+from src.timeseries import TimeSeries, to_rows
+
 logger = logging.getLogger(__name__)
 
-_BACKFILL_FROM = date(2022, 1, 1)
+_BACKFILL_FROM = FETCH_CONFIG["backfill_from"]
 _DEFAULT_DB = "sqlite:////srv/data/personal-finance/personal-finance.db"
 
+# Ventana de revisión de las series sin entrada en revision_overlap_days
+# (las variables extra de BCRA_VARIABLES)
+_DEFAULT_OVERLAP_DAYS = 7
+
 _engine: Engine | None = None
+_engine_lock = threading.Lock()
 
 _meta = MetaData()
 
@@ -44,6 +75,30 @@ _cpi = Table(
     Column("usa_cpi", Float),
 )
 
+# Variables de BCRA_VARIABLES que no van a historic_data, en formato angosto:
+# sumar una variable no cambia el esquema.
+_bcra_series = Table(
+    "bcra_series",
+    _meta,
+    Column("id", Integer, primary_key=True),
+    Column("date", Date, nullable=False),
+    Column("variable", String, nullable=False),
+    Column("value", Float),
+    UniqueConstraint("date", "variable"),
+)
+
+# Cierres de los benchmarks (ver BENCHMARK_TICKERS) en formato angosto: sumar
+# un ticker no cambia el esquema. SPY sigue en historic_data.spy.
+_benchmarks = Table(
+    "benchmark_prices",
+    _meta,
+    Column("id", Integer, primary_key=True),
+    Column("date", Date, nullable=False),
+    Column("ticker", String, nullable=False),
+    Column("close", Float),
+    UniqueConstraint("date", "ticker"),
+)
+
 _rem = Table(
     "rem_projections",
     _meta,
@@ -59,24 +114,185 @@ _rem = Table(
     Column("m12", Float),
 )
 
+# Índice de publicaciones REM ya procesadas: URL de la publicación -> XLSX
+# resuelto -> hash del contenido -> proyecciones parseadas.
+_rem_index = Table(
+    "rem_publication_index",
+    _meta,
+    Column("id", Integer, primary_key=True),
+    Column("publication_url", String, unique=True),
+    Column("publication_date", Date),
+    Column("xlsx_url", String),
+    Column("content_hash", String),
+    Column("m0", Float),
+    Column("m1", Float),
+    Column("m2", Float),
+    Column("m3", Float),
+    Column("m4", Float),
+    Column("m5", Float),
+    Column("m6", Float),
+    Column("m12", Float),
+    Column("fetched_at", DateTime),
+)
+
+# Estado chico que los fetchers necesitan recordar entre corridas (clave -> valor)
+_fetch_state = Table(
+    "fetch_state",
+    _meta,
+    Column("key", String, primary_key=True),
+    Column("value", String),
+    Column("updated_at", DateTime),
+)
+
+# Una fila por invocación de fetch_data (ver src/run_lock.py)
+_run_state = Table(
+    "run_state",
+    _meta,
+    Column("run_id", String, primary_key=True),
+    Column("mode", String, nullable=False),
+    Column("pid", Integer),
+    Column("started_at", DateTime),
+    Column("finished_at", DateTime),
+    Column("status", String, nullable=False),  # running | success | partial | failed | abandoned
+    Column("summary", String),
+)
+
+# Último chequeo / último dato nuevo de cada fuente con cadencia (ver src/cadence.py).
+# `marker` es el último período guardado; cuando cambia, hubo publicación nueva.
+_source_status = Table(
+    "source_status",
+    _meta,
+    Column("source", String, primary_key=True),
+    Column("last_check", DateTime),
+    Column("last_success", DateTime),
+    Column("last_change", DateTime),
+    Column("marker", String),
+)
+
+_REM_PROJECTION_COLS = ["m0", "m1", "m2", "m3", "m4", "m5", "m6", "m12"]
+
 
 def _get_engine() -> Engine:
     global _engine
-    if _engine is None:
-        db_url = os.getenv("DATABASE_URL", _DEFAULT_DB)
-        _engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    # Los nodos de persistencia llegan en paralelo: el engine se publica recién
+    # con las tablas creadas, si no otro hilo podría usarlo antes
+    with _engine_lock:
+        if _engine is None:
+            db_url = os.getenv("DATABASE_URL", _DEFAULT_DB)
+            # timeout: cuánto espera sqlite un lock antes de fallar (acota la corrida)
+            engine = create_engine(
+                db_url,
+                connect_args={
+                    "check_same_thread": False,
+                    "timeout": FETCH_CONFIG["db_timeout_seconds"],
+                },
+            )
+            # Solo crea las tablas que falten; las existentes no se tocan.
+            _meta.create_all(engine)
+            _engine = engine
     return _engine
 
 
-def get_last_date_from_db() -> date:
+# Serie -> (tabla, columna cuya última fecha no nula es su watermark)
+_SERIES_WATERMARK_COLUMNS = {
+    "cer": (_historic, "cer"),
+    "ccl": (_historic, "ccl"),
+    "spy": (_historic, "spy"),
+    "inflacion_mensual": (_historic, "inflacion_mensual"),
+    "indec": (_cpi, "indec_tn_nivel_general"),
+    "caba": (_cpi, "caba_nivel_general"),
+    "usa": (_cpi, "usa_cpi"),
+}
+
+
+def get_series_watermarks() -> dict[str, date | None]:
+    """Última fecha con dato no nulo de cada serie (None si no tiene ninguno)."""
+    watermarks: dict[str, date | None] = {}
     with _get_engine().connect() as conn:
-        result = conn.execute(select(func.max(_historic.c.date))).scalar()
-    if result:
+        for table in (_historic, _cpi):
+            names = [n for n, (t, _) in _SERIES_WATERMARK_COLUMNS.items() if t is table]
+            stmt = select(
+                *(
+                    func.max(
+                        case(
+                            (table.c[_SERIES_WATERMARK_COLUMNS[n][1]].isnot(None), table.c.date)
+                        )
+                    ).label(n)
+                    for n in names
+                )
+            )
+            row = conn.execute(stmt).mappings().one()
+            watermarks.update({n: row[n] for n in names})
+
+        extra = [n for n in BCRA_VARIABLES if n not in HISTORIC_BCRA_VARIABLES]
+        if extra:
+            last = dict(
+                conn.execute(
+                    select(_bcra_series.c.variable, func.max(_bcra_series.c.date)).group_by(
+                        _bcra_series.c.variable
+                    )
+                ).all()
+            )
+            watermarks.update({n: last.get(n) for n in extra})
+
+        # Se bajan todos juntos: manda el ticker más atrasado. Los que nunca
+        # trajeron datos (ej: Yahoo sin ^MERV) no cuentan, si no cada corrida
+        # volvería a bajar todo desde backfill_from. None solo si ninguno tiene.
+        last = dict(
+            conn.execute(
+                select(_benchmarks.c.ticker, func.max(_benchmarks.c.date)).group_by(
+                    _benchmarks.c.ticker
+                )
+            ).all()
+        )
+        dates = [
+            last[t] for t in BENCHMARK_TICKERS if t != HISTORIC_BENCHMARK and t in last
+        ]
+        watermarks["benchmarks"] = min(dates, default=None)
+    return watermarks
+
+
+def get_series_since() -> dict[str, date]:
+    """Fecha desde la cual pedir cada serie: su watermark menos la ventana de revisión."""
+    overlaps = FETCH_CONFIG["revision_overlap_days"]
+    today = date.today()
+    since: dict[str, date] = {}
+    for name, watermark in get_series_watermarks().items():
+        if watermark is None:
+            since[name] = _BACKFILL_FROM
+            continue
         # CER se escribe con proyección a futuro (~45 días); no usarla como
         # referencia de "última fecha real" o el "desde" del próximo fetch
-        # queda siempre en el futuro y CER/CCL/SPY dejan de actualizarse.
-        return min(result, date.today()) - timedelta(days=7)
-    return _BACKFILL_FROM
+        # queda siempre en el futuro y CER deja de actualizarse.
+        overlap = overlaps.get(name, _DEFAULT_OVERLAP_DAYS)
+        since[name] = min(watermark, today) - timedelta(days=overlap)
+    return since
+
+
+def get_historic_series(since: date, until: date) -> dict[str, TimeSeries]:
+    """Series de historic_data entre dos fechas (inclusive), por columna.
+
+    Mismas claves que los argumentos de write_historic_to_db.
+    """
+    columns = {
+        "cer_data": _historic.c.cer,
+        "ccl_data": _historic.c.ccl,
+        "spy_data": _historic.c.spy,
+        "inflacion_data": _historic.c.inflacion_mensual,
+    }
+    stmt = select(_historic.c.date, *columns.values()).where(
+        _historic.c.date.between(since, until)
+    )
+    with _get_engine().connect() as conn:
+        frame = pd.DataFrame(conn.execute(stmt).all(), columns=["date", *columns])
+
+    if frame.empty:
+        return {arg: TimeSeries.empty() for arg in columns}
+    index = pd.DatetimeIndex(frame["date"])
+    return {
+        arg: TimeSeries.from_series(frame[arg].astype("float64").set_axis(index))
+        for arg in columns
+    }
 
 
 def get_last_rem_date_from_db() -> tuple[int, int]:
@@ -88,26 +304,17 @@ def get_last_rem_date_from_db() -> tuple[int, int]:
 
 
 def write_historic_to_db(
-    cer_data: dict[date, float],
-    ccl_data: dict[date, float],
-    spy_data: dict[date, float],
-    inflacion_data: dict[date, float],
+    cer_data: TimeSeries,
+    ccl_data: TimeSeries,
+    spy_data: TimeSeries,
+    inflacion_data: TimeSeries,
 ) -> None:
-    all_dates = set(cer_data) | set(ccl_data) | set(spy_data) | set(inflacion_data)
-    if not all_dates:
+    rows = to_rows(
+        {"cer": cer_data, "ccl": ccl_data, "spy": spy_data, "inflacion_mensual": inflacion_data}
+    )
+    if not rows:
         return
 
-    rows = [
-        {
-            "date": d,
-            "cer": cer_data.get(d),
-            "ccl": ccl_data.get(d),
-            "spy": spy_data.get(d),
-            "inflacion_mensual": inflacion_data.get(d),
-        }
-        for d in sorted(all_dates)
-    ]
-
     stmt = sqlite_insert(_historic).values(rows)
     stmt = stmt.on_conflict_do_update(
         index_elements=["date"],
@@ -127,49 +334,84 @@ def write_historic_to_db(
     logger.info(f"DB: upserted {len(rows)} historic_data rows")
 
 
-def _cpi_float(cpi_data: dict, key: str, i: int) -> float | None:
-    series = cpi_data.get(key, [])
-    if i >= len(series):
-        return None
-    val = series[i][0] if series[i] else None
-    if val == "N/A" or val is None:
-        return None
-    try:
-        return float(val)
-    except (ValueError, TypeError):
-        return None
-
+def write_bcra_series_to_db(frame: pd.DataFrame) -> None:
+    """Guarda las columnas de un frame de BCRAVariablesFetcher en bcra_series.
 
-def write_cpi_to_db(cpi_data: dict) -> None:
-    dates_rows = cpi_data.get("dates", [])
-    if not dates_rows:
+    Una fila por (fecha, variable) con dato; los NaN no se escriben.
+    """
+    if frame.empty:
+        return
+    long = (
+        frame.rename_axis("date")
+        .reset_index()
+        .melt(id_vars="date", var_name="variable", value_name="value")
+        .dropna(subset=["value"])
+    )
+    rows = long.to_dict("records")
+    if not rows:
         return
 
-    rows = []
-    for i, date_row in enumerate(dates_rows):
-        try:
-            d = datetime.strptime(date_row[0], "%d/%m/%Y").date()
-        except (ValueError, IndexError):
-            continue
-        rows.append(
-            {
-                "date": d,
-                "indec_tn_nivel_general": _cpi_float(cpi_data, "indec_tn_nivel_general", i),
-                "indec_tn_nucleo": _cpi_float(cpi_data, "indec_tn_nucleo", i),
-                "indec_tn_estacionales": _cpi_float(cpi_data, "indec_tn_estacionales", i),
-                "indec_tn_regulados": _cpi_float(cpi_data, "indec_tn_regulados", i),
-                "indec_gba_nivel_general": _cpi_float(cpi_data, "indec_gba_nivel_general", i),
-                "indec_gba_nucleo": _cpi_float(cpi_data, "indec_gba_nucleo", i),
-                "indec_gba_estacionales": _cpi_float(cpi_data, "indec_gba_estacionales", i),
-                "indec_gba_regulados": _cpi_float(cpi_data, "indec_gba_regulados", i),
-                "caba_nivel_general": _cpi_float(cpi_data, "caba_idx_nivel_general", i),
-                "usa_cpi": _cpi_float(cpi_data, "usa_cpi_index", i),
-            }
-        )
+    stmt = sqlite_insert(_bcra_series).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["date", "variable"],
+        set_={"value": stmt.excluded.value},
+    )
 
+    with _get_engine().begin() as conn:
+        conn.execute(stmt)
+
+    logger.info(f"DB: upserted {len(rows)} bcra_series rows")
+
+
+def write_benchmarks_to_db(benchmarks: dict[str, TimeSeries]) -> None:
+    rows = [
+        {"date": d, "ticker": ticker, "close": close}
+        for ticker, series in benchmarks.items()
+        for d, close in series.items()
+    ]
     if not rows:
         return
 
+    stmt = sqlite_insert(_benchmarks).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["date", "ticker"],
+        set_={"close": func.coalesce(stmt.excluded.close, _benchmarks.c.close)},
+    )
+
+    with _get_engine().begin() as conn:
+        conn.execute(stmt)
+
+    logger.info(f"DB: upserted {len(rows)} benchmark_prices rows")
+
+
+# Columna de cpi_data -> columna del frame de CPI (ver src/fetchers/cpi_frame.py)
+_CPI_FRAME_COLUMNS = {
+    "indec_tn_nivel_general": "indec_tn_nivel_general",
+    "indec_tn_nucleo": "indec_tn_nucleo",
+    "indec_tn_estacionales": "indec_tn_estacionales",
+    "indec_tn_regulados": "indec_tn_regulados",
+    "indec_gba_nivel_general": "indec_gba_nivel_general",
+    "indec_gba_nucleo": "indec_gba_nucleo",
+    "indec_gba_estacionales": "indec_gba_estacionales",
+    "indec_gba_regulados": "indec_gba_regulados",
+    "caba_nivel_general": "caba_idx_nivel_general",
+    "usa_cpi": "usa_cpi_index",
+}
+
+
+def write_cpi_to_db(cpi_data: pd.DataFrame) -> None:
+    if cpi_data.empty:
+        return
+
+    # Las columnas de fuentes faltantes quedan en None y el coalesce no las pisa
+    frame = cpi_data.reindex(columns=list(_CPI_FRAME_COLUMNS.values()))
+    frame.columns = list(_CPI_FRAME_COLUMNS)
+    cells = frame.astype(object).where(frame.notna(), None)
+    rows = [
+        {"date": d, **row}
+        for d, row in zip(frame.index, cells.to_dict(orient="records"), strict=True)
+    ]
+
     cpi_cols = [col.name for col in _cpi.c if col.name not in ("id", "date")]
     stmt = sqlite_insert(_cpi).values(rows)
     stmt = stmt.on_conflict_do_update(
@@ -183,18 +425,14 @@ def write_cpi_to_db(cpi_data: dict) -> None:
     logger.info(f"DB: upserted {len(rows)} cpi_data rows")
 
 
-def write_rem_to_db(rem_reports: dict[str, list[float]]) -> None:
+def write_rem_to_db(rem_reports: dict[date, list[float]]) -> None:
     if not rem_reports:
         return
 
     rows = []
-    for month_key, projections in rem_reports.items():
+    for pub_date, projections in rem_reports.items():
         if len(projections) < 8:
             continue
-        try:
-            pub_date = date.fromisoformat(month_key)
-        except ValueError:
-            continue
         rows.append(
             {
                 "publication_date": pub_date,
@@ -223,3 +461,162 @@ def write_rem_to_db(rem_reports: dict[str, list[float]]) -> None:
         conn.execute(stmt)
 
     logger.info(f"DB: upserted {len(rows)} rem_projection rows")
+
+
+def get_rem_publication_index() -> dict[str, dict]:
+    with _get_engine().connect() as conn:
+        rows = conn.execute(select(_rem_index)).mappings().all()
+
+    return {
+        row["publication_url"]: {
+            "publication_date": row["publication_date"],
+            "xlsx_url": row["xlsx_url"],
+            "content_hash": row["content_hash"],
+            "projections": [row[col] for col in _REM_PROJECTION_COLS],
+        }
+        for row in rows
+    }
+
+
+def write_rem_publication_index(entries: list[dict]) -> None:
+    if not entries:
+        return
+
+    now = datetime.now()
+    rows = [
+        {
+            "publication_url": e["publication_url"],
+            "publication_date": e["publication_date"],
+            "xlsx_url": e["xlsx_url"],
+            "content_hash": e["content_hash"],
+            **dict(zip(_REM_PROJECTION_COLS, e["projections"], strict=True)),
+            "fetched_at": now,
+        }
+        for e in entries
+        if len(e["projections"]) == len(_REM_PROJECTION_COLS)
+    ]
+    if not rows:
+        return
+
+    index_cols = [col.name for col in _rem_index.c if col.name not in ("id", "publication_url")]
+    stmt = sqlite_insert(_rem_index).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["publication_url"],
+        set_={col: getattr(stmt.excluded, col) for col in index_cols},
+    )
+
+    with _get_engine().begin() as conn:
+        conn.execute(stmt)
+
+    logger.info(f"DB: upserted {len(rows)} rem_publication_index rows")
+
+
+def get_fetch_state(key: str) -> str | None:
+    with _get_engine().connect() as conn:
+        return conn.execute(
+            select(_fetch_state.c.value).where(_fetch_state.c.key == key)
+        ).scalar()
+
+
+def set_fetch_state(key: str, value: str) -> None:
+    stmt = sqlite_insert(_fetch_state).values(key=key, value=value, updated_at=datetime.now())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={"value": stmt.excluded.value, "updated_at": stmt.excluded.updated_at},
+    )
+    with _get_engine().begin() as conn:
+        conn.execute(stmt)
+
+
+def start_run_state(run_id: str, mode: str, pid: int) -> None:
+    """Registra una corrida nueva; las que quedaron "running" pasan a "abandoned".
+
+    Se llama con el lock de corrida tomado, así que ninguna otra está viva.
+    """
+    with _get_engine().begin() as conn:
+        conn.execute(
+            update(_run_state)
+            .where(_run_state.c.status == "running")
+            .values(status="abandoned", finished_at=datetime.now())
+        )
+        conn.execute(
+            _run_state.insert().values(
+                run_id=run_id, mode=mode, pid=pid, started_at=datetime.now(), status="running"
+            )
+        )
+
+
+def finish_run_state(run_id: str, status: str, summary: str | None = None) -> None:
+    with _get_engine().begin() as conn:
+        conn.execute(
+            update(_run_state)
+            .where(_run_state.c.run_id == run_id)
+            .values(status=status, summary=summary, finished_at=datetime.now())
+        )
+
+
+def get_active_run_state() -> dict | None:
+    """Corrida marcada "running" (la dueña del lock, si sigue viva)."""
+    with _get_engine().connect() as conn:
+        row = conn.execute(
+            select(_run_state)
+            .where(_run_state.c.status == "running")
+            .order_by(_run_state.c.started_at.desc())
+        ).first()
+    return dict(row._mapping) if row else None
+
+
+def get_run_state(run_id: str) -> dict | None:
+    with _get_engine().connect() as conn:
+        row = conn.execute(select(_run_state).where(_run_state.c.run_id == run_id)).first()
+    return dict(row._mapping) if row else None
+
+
+def get_last_finished_run_state(since: datetime) -> dict | None:
+    """Última corrida que terminó a partir de `since` (o None)."""
+    with _get_engine().connect() as conn:
+        row = conn.execute(
+            select(_run_state)
+            .where(_run_state.c.finished_at >= since)
+            .order_by(_run_state.c.finished_at.desc())
+        ).first()
+    return dict(row._mapping) if row else None
+
+
+def get_source_markers() -> dict[str, str | None]:
+    """Último período guardado de cada fuente mensual (REM y las de CPI)."""
+    watermarks = get_series_watermarks()
+    markers = {name: watermarks[name] for name in ("indec", "caba", "usa")}
+    with _get_engine().connect() as conn:
+        markers["rem"] = conn.execute(select(func.max(_rem.c.publication_date))).scalar()
+    return {name: m.isoformat() if m else None for name, m in markers.items()}
+
+
+def get_source_status() -> dict[str, dict]:
+    with _get_engine().connect() as conn:
+        rows = conn.execute(select(_source_status)).mappings().all()
+    return {row["source"]: dict(row) for row in rows}
+
+
+def record_source_check(source: str, success: bool, marker: str | None) -> None:
+    """Anota un chequeo de la fuente; si `marker` avanzó, también un cambio.
+
+    El primer marker visto es la línea de base y no cuenta como cambio.
+    """
+    now = datetime.now()
+    with _get_engine().begin() as conn:
+        previous = conn.execute(
+            select(_source_status).where(_source_status.c.source == source)
+        ).mappings().first()
+        values = {"last_check": now}
+        if success:
+            values["last_success"] = now
+            values["marker"] = marker
+            if previous and previous["marker"] and marker != previous["marker"]:
+                values["last_change"] = now
+        if previous:
+            conn.execute(
+                update(_source_status).where(_source_status.c.source == source).values(**values)
+            )
+        else:
+            conn.execute(_source_status.insert().values(source=source, **values))
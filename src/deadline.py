@@ -0,0 +1,47 @@
+"""Deadline de la corrida, compartido por el scheduler, la sesión HTTP y la DB.
+
+`start_run_deadline` fija cuándo vence la corrida. Desde ese momento:
+- HostAwareSession recorta el timeout de cada request al tiempo restante y
+  deja de mandar requests una vez vencido.
+- run_graph cancela los nodos fuente que no terminaron y deja correr los de
+  persistencia (con `persist_grace_seconds` extra) para guardar lo obtenido.
+"""
+
+import time
+
+_run_deadline: "Deadline | None" = None
+
+
+class Deadline:
+    """Instante (reloj monotónico) en que vence la corrida."""
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def clamp(self, timeout: float | tuple[float, float] | None):
+        """Recorta un timeout de requests (float o (connect, read)) al tiempo restante."""
+        # urllib3 no acepta timeouts <= 0
+        remaining = max(self.remaining(), 0.01)
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(min(t, remaining) if t is not None else remaining for t in timeout)
+        return min(timeout, remaining)
+
+
+def start_run_deadline(seconds: float | None) -> Deadline | None:
+    """Arranca (o con None, desactiva) el deadline global de la corrida."""
+    global _run_deadline
+    _run_deadline = Deadline(seconds) if seconds else None
+    return _run_deadline
+
+
+def get_run_deadline() -> Deadline | None:
+    return _run_deadline
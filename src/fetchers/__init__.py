@@ -1,35 +1,61 @@
 """Módulo de fetchers para obtener datos de fuentes externas.
 
 Estructura:
-- base.py: Clase abstracta DataSource
+- base.py: Clases abstractas DataSource y AsyncDataSource
+- bcra.py: Fetcher genérico de variables Monetarias (BCRA API)
 - cer.py: Fetcher para CER (BCRA API)
 - ccl.py: Fetcher para CCL (Ambito + dolarapi)
 - rem.py: Fetcher para REM (BCRA web scraping + Excel)
 - spy.py: Fetcher para SPY (yfinance)
+- benchmarks.py: Fetcher de varios benchmarks en una sola descarga (yfinance)
 - inflacion_mensual.py: Fetcher para Inflación Mensual (BCRA API)
 - cpi_indec.py: Fetcher para CPI INDEC
 - cpi_caba.py: Fetcher para CPI CABA
 - cpi_usa.py: Fetcher para CPI USA (FRED)
+- async_sources.py: Versiones asyncio de los fetchers HTTP
 """
 
-from src.fetchers.base import DataSource
-from src.fetchers.cer import CERFetcher
+from src.fetchers.async_sources import (
+    AsyncBCRAVariablesFetcher,
+    AsyncCABACPIFetcher,
+    AsyncCCLFetcher,
+    AsyncCERFetcher,
+    AsyncINDECCPIFetcher,
+    AsyncInflacionMensualFetcher,
+    AsyncREMFetcher,
+    AsyncUSACPIFetcher,
+)
+from src.fetchers.base import AsyncDataSource, DataSource
+from src.fetchers.bcra import BCRAVariablesFetcher
+from src.fetchers.benchmarks import BenchmarksFetcher
 from src.fetchers.ccl import CCLFetcher
-from src.fetchers.rem import REMFetcher
-from src.fetchers.spy import SPYFetcher
-from src.fetchers.inflacion_mensual import InflacionMensualFetcher
-from src.fetchers.cpi_indec import INDECCPIFetcher
+from src.fetchers.cer import CERFetcher
 from src.fetchers.cpi_caba import CABACPIFetcher
+from src.fetchers.cpi_indec import INDECCPIFetcher
 from src.fetchers.cpi_usa import USACPIFetcher
+from src.fetchers.inflacion_mensual import InflacionMensualFetcher
+from src.fetchers.rem import REMFetcher
+from src.fetchers.spy import SPYFetcher
 
 __all__ = [
     "DataSource",
+    "BCRAVariablesFetcher",
     "CERFetcher",
     "CCLFetcher",
     "REMFetcher",
     "SPYFetcher",
+    "BenchmarksFetcher",
     "InflacionMensualFetcher",
     "INDECCPIFetcher",
     "CABACPIFetcher",
     "USACPIFetcher",
+    "AsyncDataSource",
+    "AsyncBCRAVariablesFetcher",
+    "AsyncCERFetcher",
+    "AsyncInflacionMensualFetcher",
+    "AsyncCCLFetcher",
+    "AsyncREMFetcher",
+    "AsyncINDECCPIFetcher",
+    "AsyncCABACPIFetcher",
+    "AsyncUSACPIFetcher",
 ]
@@ -0,0 +1,348 @@
+"""Versiones asyncio de los fetchers sobre un único AsyncHTTPClient.
+
+Cada clase envuelve a su fetcher sincrónico y usa solo sus métodos públicos
+(un paso de I/O por método: una página, una publicación, un probe, el
+parseo), así un cambio interno del fetcher no rompe la versión async. Lo que
+cambia es cómo se reparte el trabajo: páginas, publicaciones y probes quedan
+como tareas del mismo event loop, acotadas por semáforos por fuente y por el
+límite global de requests en vuelo del cliente, en lugar de un
+ThreadPoolExecutor por fuente.
+
+No es I/O asyncio nativo: no hay cliente HTTP async entre las dependencias y
+la sesión (breaker, reintentos, límite por host) es de `requests`, así que
+cada request en vuelo ocupa un hilo del pool compartido de AsyncHTTPClient
+(ver src/connectors/http.py).
+"""
+
+import asyncio
+import logging
+from datetime import date
+
+import pandas as pd
+import requests
+
+from src.config import BCRA_VARIABLES, FETCH_CONFIG
+from src.connectors.http import AsyncHTTPClient, get_async_http_client
+from src.connectors.http_cache import CachedResponse, HTTPCache
+from src.fetchers.base import AsyncDataSource
+from src.fetchers.bcra import BCRAVariablesFetcher, remaining_offsets, series_from_frame
+from src.fetchers.ccl import CCLFetcher
+from src.fetchers.cpi_caba import CABACPIFetcher
+from src.fetchers.cpi_indec import INDECCPIFetcher
+from src.fetchers.cpi_usa import USACPIFetcher
+from src.fetchers.rem import REMFetcher
+from src.timeseries import TimeSeries
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBCRAVariablesFetcher:
+    """Async de BCRAVariablesFetcher: todas las páginas de todas las variables en vuelo."""
+
+    def __init__(
+        self,
+        variables: dict[str, dict] | None = None,
+        client: AsyncHTTPClient | None = None,
+    ) -> None:
+        self.client = client or get_async_http_client()
+        self._fetcher = BCRAVariablesFetcher(variables, self.client.session)
+        self.variables = self._fetcher.variables
+
+    async def fetch(
+        self, since: date, until: date, since_by_name: dict[str, date] | None = None
+    ) -> pd.DataFrame:
+        """Mismo contrato que BCRAVariablesFetcher.fetch."""
+        limit = FETCH_CONFIG["bcra_pagination_limit"]
+        names = list(self.variables)
+        starts = {name: (since_by_name or {}).get(name, since) for name in names}
+        slots = asyncio.Semaphore(FETCH_CONFIG["max_workers_bcra_pages"])
+
+        async def bounded(func, *args):
+            async with slots:
+                return await self.client.run(func, *args)
+
+        first_pages = await asyncio.gather(
+            *(
+                bounded(self._fetcher.fetch_page, name, starts[name], until, limit, 0)
+                for name in names
+            )
+        )
+
+        pending = [
+            (name, offset)
+            for name, (records, total) in zip(names, first_pages, strict=True)
+            for offset in remaining_offsets(len(records), total)
+        ]
+        pages = await asyncio.gather(
+            *(
+                bounded(
+                    self._fetcher.fetch_page, name, starts[name], until, limit, offset
+                )
+                for name, offset in pending
+            )
+        )
+
+        records_by_name = {
+            name: list(records) for name, (records, _) in zip(names, first_pages, strict=True)
+        }
+        for (name, _), (records, _) in zip(pending, pages, strict=True):
+            records_by_name[name].extend(records)
+
+        return self._fetcher.build_frame(records_by_name, starts, since, until)
+
+
+class AsyncCERFetcher(AsyncDataSource):
+    """Async de CERFetcher."""
+
+    def __init__(self, client: AsyncHTTPClient | None = None) -> None:
+        self._fetcher = AsyncBCRAVariablesFetcher({"cer": BCRA_VARIABLES["cer"]}, client)
+
+    async def fetch(self, since: date, until: date) -> TimeSeries:
+        results = series_from_frame(await self._fetcher.fetch(since, until), "cer")
+        logger.info(f"CER: fetched {len(results)} records from {since} to {until}")
+        return results
+
+
+class AsyncInflacionMensualFetcher(AsyncDataSource):
+    """Async de InflacionMensualFetcher."""
+
+    def __init__(self, client: AsyncHTTPClient | None = None) -> None:
+        self._fetcher = AsyncBCRAVariablesFetcher(
+            {"inflacion_mensual": BCRA_VARIABLES["inflacion_mensual"]}, client
+        )
+
+    async def fetch(self, since: date, until: date) -> TimeSeries:
+        results = series_from_frame(await self._fetcher.fetch(since, until), "inflacion_mensual")
+        logger.info(
+            f"Inflación mensual: fetched {len(results)} records from {since} to {until}"
+        )
+        return results
+
+
+class AsyncCCLFetcher(AsyncDataSource):
+    """Async de CCLFetcher con request duplicado (hedge) a Ambito.
+
+    `fetch_today` (dolarapi) y `fetch_history` (Ambito) son independientes:
+    fetch_data los corre como nodos separados, así la cotización de hoy se
+    guarda apenas contesta dolarapi sin esperar a Ambito. En `fetch_history`,
+    si Ambito no contestó tras `hedge_after()` segundos se lanza un segundo
+    intento y gana el primero que conteste sin error (aunque sea con una serie
+    vacía); si todos fallan, o pasado `ambito_budget_seconds`, levanta el error.
+    `fetch` junta ambos y, sin histórico, devuelve al menos la cotización de hoy.
+    """
+
+    def __init__(
+        self,
+        client: AsyncHTTPClient | None = None,
+        latencies: list[float] | None = None,
+    ) -> None:
+        self.client = client or get_async_http_client()
+        self._fetcher = CCLFetcher(self.client.session, latencies)
+
+    @property
+    def latencies(self) -> list[float]:
+        return self._fetcher.latencies
+
+    @latencies.setter
+    def latencies(self, value: list[float]) -> None:
+        self._fetcher.latencies = list(value)
+
+    async def fetch(self, since: date, until: date) -> TimeSeries:
+        today = asyncio.ensure_future(self.fetch_today(since, until))
+        try:
+            historical_data = await self.fetch_history(since, until)
+        except (TimeoutError, requests.exceptions.RequestException, ValueError) as e:
+            logger.warning(f"CCL Ambito: no historical data, keeping only today's quote: {e!r}")
+            historical_data = TimeSeries.empty()
+        return self._fetcher.combine(historical_data, await today)
+
+    async def fetch_today(self, since: date, until: date) -> TimeSeries:
+        """Cotización de hoy de dolarapi (serie vacía si no hay o cae fuera del rango)."""
+        quote = await self.client.run(self._fetcher.fetch_today)
+        return self._fetcher.today_series(quote, since, until)
+
+    async def fetch_history(self, since: date, until: date) -> TimeSeries:
+        """Histórico de Ambito con hedge, acotado por `ambito_budget_seconds`.
+
+        Raises:
+            TimeoutError: Si Ambito no contestó dentro del presupuesto
+            requests.RequestException, ValueError: Si fallaron todos los intentos
+        """
+        budget = FETCH_CONFIG["ccl_hedge"]["ambito_budget_seconds"]
+        try:
+            return await asyncio.wait_for(self._fetch_ambito_hedged(since, until), budget)
+        except TimeoutError:
+            raise TimeoutError(f"CCL Ambito: no data within {budget:.0f}s") from None
+
+    async def _fetch_ambito_hedged(self, since: date, until: date) -> TimeSeries:
+        def attempt() -> asyncio.Future:
+            return asyncio.ensure_future(
+                self.client.run(self._fetcher.fetch_ambito_timed, since, until)
+            )
+
+        hedge_after = self._fetcher.hedge_after()
+        attempts = {attempt()}
+        done, _ = await asyncio.wait(attempts, timeout=hedge_after)
+        if not done:
+            logger.info(f"CCL Ambito: no response after {hedge_after:.1f}s, sending hedged request")
+            attempts.add(attempt())
+
+        try:
+            pending = set(attempts)
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # El hilo del intento perdedor termina solo; su resultado se descarta
+            for task in attempts:
+                task.cancel()
+
+
+class AsyncREMFetcher:
+    """Async de REMFetcher: cada publicación nueva es una tarea del loop.
+
+    `index` y `new_index_entries` se comportan igual que en REMFetcher.
+    """
+
+    def __init__(
+        self,
+        index: dict[str, dict] | None = None,
+        client: AsyncHTTPClient | None = None,
+        cache: HTTPCache | None = None,
+    ) -> None:
+        self.client = client or get_async_http_client()
+        self._fetcher = REMFetcher(index, self.client.session, cache)
+
+    @property
+    def index(self) -> dict[str, dict]:
+        return self._fetcher.index
+
+    @index.setter
+    def index(self, value: dict[str, dict]) -> None:
+        self._fetcher.index = value
+
+    @property
+    def new_index_entries(self) -> list[dict]:
+        return self._fetcher.new_index_entries
+
+    async def fetch(self, since_date: tuple[int, int]) -> dict[date, list[float]]:
+        """Mismo contrato que REMFetcher.fetch."""
+        links = await self.client.run(self._fetcher.get_publication_links, since_date)
+        new_links = self._fetcher.start_batch(links)
+        slots = asyncio.Semaphore(FETCH_CONFIG["max_workers_rem"])
+
+        async def process(pub):
+            async with slots:
+                return await self.client.run(self._fetcher.fetch_publication, pub)
+
+        entries = await asyncio.gather(*(process(pub) for pub in new_links))
+        return self._fetcher.collect_reports(since_date, links, new_links, list(entries))
+
+
+class AsyncINDECCPIFetcher:
+    """Async de INDECCPIFetcher: los meses candidatos se prueban como tareas del loop."""
+
+    def __init__(
+        self,
+        client: AsyncHTTPClient | None = None,
+        cache: HTTPCache | None = None,
+        last_filename: str | None = None,
+    ) -> None:
+        self.client = client or get_async_http_client()
+        self._fetcher = INDECCPIFetcher(self.client.session, cache, last_filename)
+
+    @property
+    def last_filename(self) -> str | None:
+        return self._fetcher.last_filename
+
+    @last_filename.setter
+    def last_filename(self, value: str | None) -> None:
+        self._fetcher.last_filename = value
+
+    @property
+    def resolved_filename(self) -> str | None:
+        return self._fetcher.resolved_filename
+
+    async def fetch(self, start_date: date = date(2022, 2, 1)) -> pd.DataFrame:
+        """Mismo contrato que INDECCPIFetcher.fetch."""
+        response = await self._download_latest_available_excel()
+        return await self.client.run(self._fetcher.parse, response, start_date)
+
+    async def _download_latest_available_excel(self) -> CachedResponse:
+        fetcher = self._fetcher
+        candidates = fetcher.candidate_filenames()
+
+        if fetcher.last_filename in candidates:
+            newer = candidates[: candidates.index(fetcher.last_filename)]
+            filename = await self._probe_newest(newer) or fetcher.last_filename
+            response = await self._download(filename)
+            if response:
+                return fetcher.resolved(filename, response)
+            logger.warning(f"INDEC CPI: {filename} no longer available, probing all")
+
+        filename = await self._probe_newest(candidates)
+        if filename:
+            response = await self._download(filename)
+            if response:
+                return fetcher.resolved(filename, response)
+
+        raise ValueError("No INDEC file found")
+
+    async def _probe_newest(self, filenames: list[str]) -> str | None:
+        found = await asyncio.gather(
+            *(
+                self.client.run(self._fetcher.probe_url, self._fetcher.build_excel_url(f))
+                for f in filenames
+            )
+        )
+        return next((f for f, ok in zip(filenames, found, strict=True) if ok), None)
+
+    async def _download(self, filename: str) -> CachedResponse | None:
+        return await self.client.run(
+            self._fetcher.try_download_from_url, self._fetcher.build_excel_url(filename)
+        )
+
+
+class AsyncCABACPIFetcher:
+    """Async de CABACPIFetcher."""
+
+    def __init__(
+        self,
+        page_url: str | None = None,
+        client: AsyncHTTPClient | None = None,
+        cache: HTTPCache | None = None,
+    ) -> None:
+        self.client = client or get_async_http_client()
+        self._fetcher = CABACPIFetcher(page_url, self.client.session, cache)
+
+    async def fetch(self, start_date: date = date(2022, 2, 1)) -> pd.DataFrame:
+        """Mismo contrato que CABACPIFetcher.fetch."""
+        fetcher = self._fetcher
+        excel_url = await self.client.run(fetcher.scrape_latest_excel_url)
+        response = await self.client.run(fetcher.download_excel_from_url, excel_url)
+        return await self.client.run(fetcher.parse, response, start_date)
+
+
+class AsyncUSACPIFetcher:
+    """Async de USACPIFetcher (FRED)."""
+
+    def __init__(
+        self,
+        api_key: str,
+        series_id: str = USACPIFetcher.DEFAULT_SERIES_ID,
+        client: AsyncHTTPClient | None = None,
+    ) -> None:
+        self.client = client or get_async_http_client()
+        self._fetcher = USACPIFetcher(api_key, series_id, self.client.session)
+
+    async def fetch(self, start_date: date) -> pd.DataFrame:
+        """Mismo contrato que USACPIFetcher.fetch."""
+        monthly_records = await self.client.run(
+            self._fetcher.fetch_monthly_records, start_date
+        )
+        return self._fetcher.process_monthly_records(monthly_records)
@@ -3,16 +3,40 @@
 from abc import ABC, abstractmethod
 from datetime import date
 
+from src.timeseries import TimeSeries
+
 
 class DataSource(ABC):
     """Interfaz abstracta para fuentes de datos.
 
     Todas las fuentes de datos deben implementar el método fetch()
-    que devuelve un diccionario de fecha -> valor.
+    que devuelve una TimeSeries (fecha -> valor).
+    """
+
+    @abstractmethod
+    def fetch(self, since: date, until: date) -> TimeSeries:
+        """Obtiene datos históricos desde una fecha hasta otra.
+
+        Args:
+            since: Fecha de inicio (inclusive)
+            until: Fecha de fin (inclusive)
+
+        Returns:
+            TimeSeries de fecha -> valor
+        """
+        pass
+
+
+class AsyncDataSource(ABC):
+    """Contraparte asyncio de DataSource.
+
+    Mismo contrato que DataSource.fetch pero como corrutina, para que varias
+    fuentes (y sus páginas) queden en vuelo a la vez sobre un único event
+    loop y un único AsyncHTTPClient.
     """
 
     @abstractmethod
-    def fetch(self, since: date, until: date) -> dict[date, float]:
+    async def fetch(self, since: date, until: date) -> TimeSeries:
         """Obtiene datos históricos desde una fecha hasta otra.
 
         Args:
@@ -20,6 +44,6 @@ class DataSource(ABC):
             until: Fecha de fin (inclusive)
 
         Returns:
-            Diccionario de fecha -> valor (dict[date, float])
+            TimeSeries de fecha -> valor
         """
         pass
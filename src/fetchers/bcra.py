@@ -0,0 +1,188 @@
+"""Fetcher genérico para variables de la API de Estadísticas Monetarias del BCRA (v4.0).
+
+Una sola instancia baja N variables (CER, inflación mensual, A3500, BADLAR...)
+sobre una sesión HTTP compartida: las primeras páginas de todas las variables
+salen en paralelo y, con el `count` de cada una, el resto de los offsets
+también, todo en el mismo pool de conexiones.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import pandas as pd
+import requests
+
+from src.config import API_URLS, BCRA_VARIABLES, FETCH_CONFIG
+from src.connectors.http import get_http_session
+from src.timeseries import TimeSeries
+
+logger = logging.getLogger(__name__)
+
+
+class BCRAVariablesFetcher:
+    """Obtiene varias series de la API Monetarias del BCRA en un solo paso.
+
+    Nota: No implementa DataSource porque devuelve todas las series juntas
+    (un DataFrame alineado por fecha en lugar de una TimeSeries).
+    """
+
+    def __init__(
+        self,
+        variables: dict[str, dict] | None = None,
+        session: requests.Session | None = None,
+    ) -> None:
+        """Inicializa el fetcher.
+
+        Args:
+            variables: Nombre -> {"id": ID de la variable, "divisor": valor por
+                el que se divide cada dato (ej: 100 para pasar % a decimal)}.
+                Por defecto, todas las de BCRA_VARIABLES.
+            session: Sesión HTTP; por defecto la compartida del proceso
+        """
+        self.variables = variables if variables is not None else BCRA_VARIABLES
+        self.session = session or get_http_session()
+
+    def fetch(
+        self, since: date, until: date, since_by_name: dict[str, date] | None = None
+    ) -> pd.DataFrame:
+        """Obtiene todas las variables entre dos fechas.
+
+        Args:
+            since: Fecha de inicio
+            until: Fecha de fin
+            since_by_name: Fecha de inicio propia de algunas variables (su
+                watermark); las que no figuran usan `since`
+
+        Returns:
+            DataFrame indexado por fecha (date), una columna float por
+            variable y NaN donde una serie no tiene dato ese día
+        """
+        limit = FETCH_CONFIG["bcra_pagination_limit"]
+        names = list(self.variables)
+        starts = {name: (since_by_name or {}).get(name, since) for name in names}
+
+        with ThreadPoolExecutor(max_workers=FETCH_CONFIG["max_workers_bcra_pages"]) as executor:
+            first_pages = list(
+                executor.map(
+                    lambda name: self.fetch_page(name, starts[name], until, limit, 0),
+                    names,
+                )
+            )
+
+            pending = [
+                (
+                    name,
+                    executor.submit(
+                        self.fetch_page, name, starts[name], until, limit, offset
+                    ),
+                )
+                for name, (records, total) in zip(names, first_pages, strict=True)
+                for offset in remaining_offsets(len(records), total)
+            ]
+
+            records_by_name = {
+                name: list(records) for name, (records, _) in zip(names, first_pages, strict=True)
+            }
+            for name, future in pending:
+                records_by_name[name].extend(future.result()[0])
+
+        return self.build_frame(records_by_name, starts, since, until)
+
+    def build_frame(
+        self,
+        records_by_name: dict[str, list[dict]],
+        starts: dict[str, date],
+        since: date,
+        until: date,
+    ) -> pd.DataFrame:
+        names = list(self.variables)
+        columns = {
+            name: self._parse_records(name, records_by_name[name]) for name in names
+        }
+        frame = pd.DataFrame(columns, columns=names).sort_index()
+
+        logger.info(
+            "BCRA: fetched "
+            + ", ".join(f"{name}={frame[name].count()}" for name in names)
+            + f" records from {min(starts.values(), default=since)} to {until}"
+        )
+        return frame
+
+    def fetch_page(
+        self, name: str, since: date, until: date, limit: int, offset: int
+    ) -> tuple[list[dict], int]:
+        """_fetch_page con log de errores.
+
+        Los errores se propagan (la sesión ya reintentó los transitorios):
+        devolver una página vacía dejaría la serie con huecos silenciosos.
+        """
+        try:
+            return self._fetch_page(name, since, until, limit, offset)
+        except requests.exceptions.SSLError as e:
+            logger.error(f"BCRA {name}: SSL verification failed: {e}")
+            raise
+        except requests.exceptions.RequestException as e:
+            logger.error(f"BCRA {name}: request failed at offset {offset}: {e}")
+            raise
+        except (KeyError, ValueError) as e:
+            logger.error(f"BCRA {name}: invalid response format at offset {offset}: {e}")
+            raise
+
+    def _fetch_page(
+        self, name: str, since: date, until: date, limit: int, offset: int
+    ) -> tuple[list[dict], int]:
+        # verify=False para BCRA lo aplica la sesión (ver HTTP_HOSTS)
+        resp = self.session.get(
+            API_URLS["bcra_monetarias"].format(id=self.variables[name]["id"]),
+            params={
+                "desde": since.isoformat(),
+                "hasta": until.isoformat(),
+                "limit": limit,
+                "offset": offset,
+            },
+        )
+        resp.raise_for_status()
+        body = resp.json()
+
+        detalle = []
+        for variable in body.get("results", []):
+            detalle.extend(variable.get("detalle", []))
+
+        total = body.get("metadata", {}).get("resultset", {}).get("count", 0)
+        return detalle, total
+
+    def _parse_records(self, name: str, records: list[dict]) -> pd.Series:
+        divisor = self.variables[name].get("divisor", 1)
+        values: dict[date, float] = {}
+
+        for record in records:
+            if "fecha" not in record or "valor" not in record:
+                logger.warning(f"BCRA {name}: skipping malformed record: {record}")
+                continue
+            try:
+                d = datetime.strptime(record["fecha"], "%Y-%m-%d").date()
+                values[d] = float(record["valor"]) / divisor
+            except (ValueError, TypeError) as e:
+                logger.warning(f"BCRA {name}: invalid date or value in record {record}: {e}")
+                continue
+
+        return pd.Series(values, dtype="float64")
+
+
+def remaining_offsets(page_size: int, total: int) -> range:
+    """Offsets que faltan pedir tras la primera página.
+
+    El servidor puede devolver menos de `limit` por página; se usa el tamaño
+    real de la primera para calcular los offsets restantes.
+    """
+    if not page_size or page_size >= total:
+        return range(0)
+    return range(page_size, total, page_size)
+
+
+def series_from_frame(frame: pd.DataFrame, name: str) -> TimeSeries:
+    """Extrae una columna del resultado de BCRAVariablesFetcher como TimeSeries."""
+    if name not in frame:
+        return TimeSeries.empty()
+    return TimeSeries.from_series(frame[name])
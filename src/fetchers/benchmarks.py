@@ -0,0 +1,94 @@
+"""Fetcher de benchmarks (SPY, QQQ, GLD, ARGT, ^MERV...) usando yfinance.
+
+Los tickers de `BENCHMARK_TICKERS` se bajan en paralelo (yfinance pide cada
+ticker por separado, también dentro de `yf.download`) con `raise_errors`:
+un error de red o de Yahoo se propaga y la corrida marca la fuente como
+fallida, mientras que un ticker sin cotizaciones en el rango simplemente no
+aparece en el resultado.
+"""
+
+import logging
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import yfinance as yf
+from yfinance.exceptions import YFPricesMissingError
+
+from src.config import BENCHMARK_TICKERS, FETCH_CONFIG
+from src.connectors.http import DeadlineExceededError
+from src.deadline import get_run_deadline
+from src.timeseries import TimeSeries
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_closes(ticker: str, since: date, until: date) -> TimeSeries:
+    """Cierres diarios de un ticker; serie vacía si Yahoo no tiene precios en el rango.
+
+    El timeout de yfinance se recorta al deadline de la corrida.
+
+    Raises:
+        DeadlineExceededError: Si el deadline de la corrida ya venció
+        Exception: Cualquier otro error de yfinance o de red
+    """
+    timeout = FETCH_CONFIG["timeout_seconds"]
+    deadline = get_run_deadline()
+    if deadline:
+        if deadline.expired():
+            raise DeadlineExceededError(
+                f"Run deadline exceeded before {ticker} {since}..{until}"
+            )
+        timeout = deadline.clamp(timeout)
+
+    try:
+        df = yf.Ticker(ticker).history(
+            start=since, end=until, interval="1d", timeout=timeout, raise_errors=True
+        )
+    except YFPricesMissingError:
+        logger.info(f"{ticker}: no prices from {since} to {until}")
+        return TimeSeries.empty()
+    return TimeSeries.from_series(df["Close"])
+
+
+class BenchmarksFetcher:
+    """Obtiene precios de cierre diarios de varios tickers en paralelo.
+
+    Nota: No implementa DataSource porque devuelve una serie por ticker
+    (dict[str, TimeSeries] en lugar de una TimeSeries).
+    """
+
+    def __init__(self, tickers: Sequence[str] | None = None) -> None:
+        self.tickers = list(tickers or BENCHMARK_TICKERS)
+
+    def fetch(self, since: date, until: date) -> dict[str, TimeSeries]:
+        """Obtiene los cierres históricos de todos los tickers.
+
+        Args:
+            since: Fecha de inicio
+            until: Fecha de fin (exclusiva, como en yfinance)
+
+        Returns:
+            Diccionario de ticker -> TimeSeries de fecha -> precio de cierre.
+            Los tickers sin datos en el rango no aparecen.
+
+        Raises:
+            Exception: El primer error de red o de yfinance de cualquier ticker,
+                así la fuente queda como fallida y los watermarks no avanzan.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.tickers) or 1) as executor:
+            futures = {
+                ticker: executor.submit(fetch_closes, ticker, since, until)
+                for ticker in self.tickers
+            }
+            closes = {ticker: future.result() for ticker, future in futures.items()}
+
+        out = {ticker: series for ticker, series in closes.items() if series}
+        missing = [t for t in self.tickers if t not in out]
+        if missing:
+            logger.info(f"Benchmarks: no new prices for {', '.join(missing)}")
+        logger.info(
+            f"Benchmarks: fetched {sum(len(s) for s in out.values())} closes "
+            f"for {len(out)} tickers from {since} to {until}"
+        )
+        return out
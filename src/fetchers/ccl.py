@@ -1,84 +1,173 @@
 """Fetcher para CCL (Contado Con Liquidación) usando Ambito y dolarapi como fallback."""
 
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import date, datetime
 
 import requests
 
 from src.config import API_URLS, FETCH_CONFIG
+from src.connectors.http import get_http_session
 from src.fetchers.base import DataSource
+from src.timeseries import TimeSeries
 
 logger = logging.getLogger(__name__)
 
 
 class CCLFetcher(DataSource):
-    """Obtiene cotización de dólar CCL desde múltiples fuentes."""
-
-    def fetch(self, since: date, until: date) -> dict[date, float]:
+    """Obtiene cotización de dólar CCL desde múltiples fuentes.
+
+    Guarda en `latencies` los tiempos de respuesta recientes de Ambito (también
+    los de los intentos que fallan o vencen por timeout); con ellos
+    `hedge_after` decide cuándo vale la pena lanzar un segundo intento (ver
+    AsyncCCLFetcher). Se pueden pasar las de corridas anteriores.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        latencies: list[float] | None = None,
+    ) -> None:
+        self.session = session or get_http_session()
+        self.latencies = list(latencies or [])
+        # Los intentos duplicados a Ambito registran su latencia desde hilos distintos
+        self._latencies_lock = threading.Lock()
+
+    def fetch(self, since: date, until: date) -> TimeSeries:
         """Obtiene valores históricos de CCL.
 
-        Primero intenta Ambito (histórico), luego complementa con dolarapi (hoy).
+        Ambito (histórico) y dolarapi (hoy) se piden a la vez. Ambito tiene
+        `ambito_budget_seconds` para contestar, igual que en AsyncCCLFetcher:
+        pasado ese tiempo se sigue solo con la cotización de hoy.
 
         Args:
             since: Fecha de inicio
             until: Fecha de fin
 
         Returns:
-            Diccionario de fecha -> valor CCL
+            TimeSeries de fecha -> valor CCL
+        """
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            historical = executor.submit(self.fetch_ambito_timed, since, until)
+            today = executor.submit(self.fetch_today)
+            try:
+                historical_data = historical.result(
+                    timeout=FETCH_CONFIG["ccl_hedge"]["ambito_budget_seconds"]
+                )
+            except FutureTimeoutError:
+                logger.warning("CCL Ambito: no data within budget, keeping only today's quote")
+                historical_data = TimeSeries.empty()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.warning(f"CCL Ambito: no historical data, keeping only today's quote: {e}")
+                historical_data = TimeSeries.empty()
+            today_data = self.today_series(today.result(), since, until)
+        finally:
+            # El hilo de Ambito vencido termina solo; no se lo espera
+            executor.shutdown(wait=False)
+        return self.combine(historical_data, today_data)
+
+    def hedge_after(self) -> float:
+        """Segundos tras los cuales se dispara el intento duplicado a Ambito.
+
+        Es el percentil `ccl_hedge["percentile"]` de las latencias recientes
+        (con un piso), o `default_seconds` si todavía no hay historia.
         """
-        historical_data = self._fetch_ambito(since, until)
-        today_data = self._fetch_today()
-        if today_data and since <= today_data[0] <= until:
-            historical_data[today_data[0]] = today_data[1]
+        cfg = FETCH_CONFIG["ccl_hedge"]
+        with self._latencies_lock:
+            ordered = sorted(self.latencies)
+        if not ordered:
+            return cfg["default_seconds"]
+        idx = min(len(ordered) - 1, int(len(ordered) * cfg["percentile"] / 100))
+        return max(cfg["min_seconds"], ordered[idx])
+
+    def fetch_ambito_timed(self, since: date, until: date) -> TimeSeries:
+        """fetch_ambito registrando su latencia.
+
+        Se registra también si falla o vence el timeout: si no, los intentos
+        lentos nunca subirían el percentil y `hedge_after` quedaría bajo.
+        """
+        started = time.monotonic()
+        try:
+            return self.fetch_ambito(since, until)
+        finally:
+            self.record_latency(time.monotonic() - started)
+
+    def record_latency(self, seconds: float) -> None:
+        with self._latencies_lock:
+            self.latencies.append(seconds)
+            del self.latencies[: -FETCH_CONFIG["ccl_hedge"]["history_size"]]
+
+    def today_series(
+        self, quote: tuple[date, float] | None, since: date, until: date
+    ) -> TimeSeries:
+        """Cotización de `fetch_today` como serie (vacía si no hay o cae fuera del rango)."""
+        if quote and since <= quote[0] <= until:
+            return TimeSeries.from_pairs([quote[0]], [quote[1]])
+        return TimeSeries.empty()
+
+    def combine(self, historical_data: TimeSeries, today_data: TimeSeries) -> TimeSeries:
+        """Suma la cotización de hoy (dolarapi) al histórico de Ambito."""
+        combined = historical_data.combine(today_data)
+        if combined:
+            logger.info(
+                f"CCL: {len(combined)} records from {combined.first_date} to {combined.last_date}"
+            )
+        else:
+            logger.info("CCL: no records")
+        return combined
 
-        logger.info(
-            f"CCL: fetched {len(historical_data)} records from {since} to {until}"
-        )
-        return historical_data
+    def fetch_ambito(self, since: date, until: date) -> TimeSeries:
+        """Obtiene datos históricos de CCL desde Ambito.com.
 
-    def _fetch_ambito(self, since: date, until: date) -> dict[date, float]:
-        """Obtiene datos históricos de CCL desde Ambito.com."""
+        Los errores de red o de formato se propagan: una serie vacía significa
+        que Ambito contestó bien y no tiene datos en el rango (ej: un fin de
+        semana), así el hedge y el backfill distinguen ambos casos.
+        """
         url = API_URLS["ambito_ccl"].format(
             desde=since.isoformat(), hasta=until.isoformat()
         )
-        out = {}
+        dates: list[date] = []
+        values: list[float] = []
 
         try:
-            # User-Agent needed to bypass Ambito's bot detection
-            resp = requests.get(
-                url,
-                timeout=FETCH_CONFIG["timeout_seconds"],
-                headers={"User-Agent": "Mozilla/5.0"},
-            )
+            # El User-Agent para la detección de bots de Ambito lo pone la sesión
+            resp = self.session.get(url)
             resp.raise_for_status()
             data = resp.json()
-
-            if not isinstance(data, list):
-                logger.error("CCL Ambito: unexpected response format (not a list)")
-                return out
-
-            for row in data[1:]:
-                if not isinstance(row, list) or len(row) < 2:
-                    logger.warning(f"CCL Ambito: skipping malformed row: {row}")
-                    continue
-                try:
-                    d = datetime.strptime(str(row[0]).strip(), "%d/%m/%Y").date()
-                    out[d] = float(row[1])
-                except (ValueError, TypeError, IndexError) as e:
-                    logger.warning(f"CCL Ambito: invalid row {row}: {e}")
-                    continue
-
         except requests.exceptions.RequestException as e:
             logger.warning(f"CCL Ambito: request failed: {e}")
-        except (ValueError, KeyError) as e:
+            raise
+        except ValueError as e:
             logger.error(f"CCL Ambito: invalid response format: {e}")
+            raise
+
+        if not isinstance(data, list):
+            logger.error("CCL Ambito: unexpected response format (not a list)")
+            raise ValueError("CCL Ambito: response is not a list")
+
+        for row in data[1:]:
+            if not isinstance(row, list) or len(row) < 2:
+                logger.warning(f"CCL Ambito: skipping malformed row: {row}")
+                continue
+            try:
+                d = datetime.strptime(str(row[0]).strip(), "%d/%m/%Y").date()
+                value = float(row[1])
+            except (ValueError, TypeError, IndexError) as e:
+                logger.warning(f"CCL Ambito: invalid row {row}: {e}")
+                continue
+            dates.append(d)
+            values.append(value)
 
-        return out
+        return TimeSeries.from_pairs(dates, values)
 
-    def _fetch_today(self) -> tuple[date, float] | None:
+    def fetch_today(self) -> tuple[date, float] | None:
         """Obtiene cotización de CCL del día desde dolarapi.com."""
         try:
-            resp = requests.get(API_URLS["dolarapi_ccl"], timeout=10)
+            resp = self.session.get(API_URLS["dolarapi_ccl"])
             resp.raise_for_status()
             body = resp.json()
 
@@ -1,15 +1,18 @@
 """Fetcher for CABA Argentina CPI (Índice de Precios al Consumidor CABA)."""
 
-import io
 import logging
-from datetime import datetime
-from typing import Any
+from datetime import date
 
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
-from src.fetchers.cpi_formatters import format_for_sheets, parse_numeric_value
+from src.connectors.http import get_http_session
+from src.connectors.http_cache import CachedResponse, HTTPCache
+from src.fetchers.cpi_formatters import parse_numeric_block
+from src.fetchers.cpi_frame import CABA_COLUMNS, build_cpi_frame
+from src.fetchers.excel_reader import read_xlsx
+from src.fetchers.parse_pool import run_parser
 
 logger = logging.getLogger(__name__)
 
@@ -33,60 +36,57 @@ class CABACPIFetcher:
         "resto": 8,
     }
 
-    def __init__(self, page_url: str | None = None) -> None:
+    def __init__(
+        self,
+        page_url: str | None = None,
+        session: requests.Session | None = None,
+        cache: HTTPCache | None = None,
+    ) -> None:
         """Initialize the CABA CPI fetcher.
 
         Args:
             page_url: Optional custom page URL to scrape Excel from
+            session: HTTP session (defaults to the shared one)
+            cache: On-disk conditional-GET cache for the page and workbook
         """
         self.page_url = page_url or self.DEFAULT_PAGE_URL
+        self.session = session or get_http_session()
+        self.cache = cache or HTTPCache(self.session)
 
-    def fetch(
-        self, start_date: str = "2022-02-01"
-    ) -> tuple[
-        list[list[str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[str]],
-        list[list[str]],
-        list[list[str]],
-        list[list[str]],
-    ]:
+    def fetch(self, start_date: date = date(2022, 2, 1)) -> pd.DataFrame:
         """Fetch CABA CPI data.
 
         Args:
-            start_date: Start date in YYYY-MM-DD format
+            start_date: First month to keep
 
         Returns:
-            Tuple containing:
-            - dates
-            - indices_nivel_general
-            - indices_estacionales
-            - indices_regulados
-            - indices_resto
-            - variations_nivel_general
-            - variations_estacionales
-            - variations_regulados
-            - variations_resto
+            CPI frame (see cpi_frame) indexed by month with the CABA_COLUMNS:
+            indices and monthly percentage variations for nivel general,
+            estacionales, regulados and resto
         """
-        excel_url = self._scrape_latest_excel_url()
-        response = self._download_excel_from_url(excel_url)
-        df = self._parse_excel_to_dataframe(response.content)
+        excel_url = self.scrape_latest_excel_url()
+        response = self.download_excel_from_url(excel_url)
+        return self.parse(response, start_date)
+
+    def parse(self, response: CachedResponse, start_date: date) -> pd.DataFrame:
+        """Turn a downloaded workbook into a CPI frame (through the parse cache)."""
+        cols = [0, *self.INDICES_COLUMNS.values(), *self.VARIATIONS_COLUMNS.values()]
+        df = self.cache.parse(
+            response, self._parse_excel_to_dataframe, cols, self.DATA_START_ROW
+        )
         return self._extract_all_cpi_data(df, start_date)
 
-    def _scrape_latest_excel_url(self) -> str:
+    def scrape_latest_excel_url(self) -> str:
         """Scrape the latest Excel URL from the CABA statistics page."""
-        html_content = self._fetch_page_content()
-        return self._find_excel_url_in_html(html_content)
+        response = self._fetch_page_content()
+        return self.cache.parse(response, self._find_excel_url_in_html)
 
-    def _fetch_page_content(self) -> bytes:
-        """Fetch the HTML content from the page."""
-        response = requests.get(self.page_url)
+    def _fetch_page_content(self) -> CachedResponse:
+        """Fetch the HTML page (conditional GET against the cache)."""
+        response = self.cache.get(self.page_url)
         response.raise_for_status()
         logger.info(f"CABA CPI: Fetched page content from {self.page_url}")
-        return response.content
+        return response
 
     def _find_excel_url_in_html(self, html_content: bytes) -> str:
         """Find the Excel URL in the HTML content."""
@@ -103,144 +103,55 @@ class CABACPIFetcher:
         """Check if link is an IPCBA Excel file."""
         return ".xlsx" in href and "IPCBA" in href
 
-    def _download_excel_from_url(self, url: str) -> requests.Response:
-        """Download Excel file from URL."""
-        response = requests.get(url)
+    def download_excel_from_url(self, url: str) -> CachedResponse:
+        """Download Excel file from URL (conditional GET against the cache)."""
+        response = self.cache.get(url)
         response.raise_for_status()
         logger.info(f"CABA CPI: Downloaded Excel file from {url}")
         return response
 
-    def _parse_excel_to_dataframe(self, content: bytes) -> pd.DataFrame:
-        """Parse Excel content to DataFrame."""
-        return pd.read_excel(io.BytesIO(content), sheet_name=0, header=None)
-
-    def _extract_all_cpi_data(
-        self, df: pd.DataFrame, start_date: str
-    ) -> tuple[
-        list[list[str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[str]],
-        list[list[str]],
-        list[list[str]],
-        list[list[str]],
-    ]:
-        """Extract all CPI data from DataFrame."""
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-
-        dates: list[list[str]] = []
-        indices = {key: [] for key in self.INDICES_COLUMNS}
-        variations = {key: [] for key in self.VARIATIONS_COLUMNS}
-
-        for row_idx in range(self.DATA_START_ROW, len(df)):
-            date_str = self._extract_formatted_date_from_row(df, row_idx, start_dt)
-            if date_str is None:
-                break
-            if date_str == "":
-                continue
-
-            dates.append([date_str])
-            self._append_index_values_from_row(df, row_idx, indices)
-            self._append_variation_values_from_row(df, row_idx, variations)
-
-        return (
-            dates,
-            indices["nivel_general"],
-            indices["estacionales"],
-            indices["regulados"],
-            indices["resto"],
-            variations["nivel_general"],
-            variations["estacionales"],
-            variations["regulados"],
-            variations["resto"],
-        )
-
-    def _extract_formatted_date_from_row(
-        self, df: pd.DataFrame, row_idx: int, start_date: datetime
-    ) -> str | None:
-        """Extract and format date from row."""
-        row_date = df.iloc[row_idx, 0]
-
-        if pd.isna(row_date):
-            return None
-
-        if self._is_invalid_date_marker(row_date):
-            return None
-
-        date_obj = self._parse_date_from_cell(row_date)
-        if not date_obj:
-            return ""
+    def _parse_excel_to_dataframe(
+        self, content: bytes, cols: list[int], first_row: int
+    ) -> pd.DataFrame:
+        """Read only the date, indices and variations columns into a DataFrame.
 
-        if date_obj < start_date:
-            return ""
-
-        return date_obj.strftime("%d/%m/%Y")
+        The frame is indexed by the original sheet row numbers, starting at
+        first_row, so the column constants keep working with `.loc`.
+        """
+        block = run_parser(read_xlsx, content, cols=cols, first_row=first_row)
+        return pd.DataFrame(
+            block,
+            index=range(first_row, first_row + len(block)),
+            columns=cols,
+        )
 
-    def _is_invalid_date_marker(self, value: Any) -> bool:
-        """Check if value is an invalid date marker."""
-        if not isinstance(value, str):
-            return False
-        return value.startswith("///") or "no corresponde" in value.lower()
+    def _extract_all_cpi_data(self, df: pd.DataFrame, start_date: date) -> pd.DataFrame:
+        """Extract all CPI data from DataFrame.
 
-    def _parse_date_from_cell(self, date_val: Any) -> datetime | None:
-        """Parse a date value from the Excel file."""
-        try:
-            if isinstance(date_val, str):
-                return datetime.strptime(date_val, "%Y-%m-%d")
-            return pd.to_datetime(date_val)
-        except (ValueError, TypeError):
-            return None
+        Works on the whole block at once: the data block ends at the first
+        empty or "no corresponde" date, dates are coerced in one
+        `to_datetime`, rows before start_date are masked out and the eight
+        value columns are sliced and converted together.
+        """
+        columns = {
+            **{f"caba_idx_{key}": col for key, col in self.INDICES_COLUMNS.items()},
+            **{f"caba_var_{key}": col for key, col in self.VARIATIONS_COLUMNS.items()},
+        }
+
+        date_cells = df[0]
+        text = date_cells.astype(str)
+        block_end = (
+            date_cells.isna()
+            | text.str.startswith("///")
+            | text.str.lower().str.contains("no corresponde", regex=False)
+        )
+        date_cells = date_cells[~block_end.cummax()]
 
-    def _append_index_values_from_row(
-        self, df: pd.DataFrame, row_idx: int, indices: dict
-    ) -> None:
-        """Append index values from row."""
-        for key, col_idx in self.INDICES_COLUMNS.items():
-            value = self._extract_numeric_value_from_cell(df, row_idx, col_idx)
-            indices[key].append([value])
+        dates = pd.to_datetime(date_cells, errors="coerce", format="%Y-%m-%d")
+        keep = dates.notna() & (dates >= pd.Timestamp(start_date))
+        block = parse_numeric_block(df.loc[keep[keep].index, list(columns.values())])
 
-    def _append_variation_values_from_row(
-        self, df: pd.DataFrame, row_idx: int, variations: dict
-    ) -> None:
-        """Append variation values from row."""
-        for key, col_idx in self.VARIATIONS_COLUMNS.items():
-            value = self._extract_percentage_from_cell(df, row_idx, col_idx)
-            variations[key].append([value])
-
-    def _extract_numeric_value_from_cell(
-        self, df: pd.DataFrame, row: int, col: int
-    ) -> float | str:
-        """Extract numeric value from cell."""
-        value = df.iloc[row, col]
-        return self._format_as_numeric(value)
-
-    def _extract_percentage_from_cell(
-        self, df: pd.DataFrame, row: int, col: int
-    ) -> float | str:
-        """Extract percentage value from cell."""
-        value = df.iloc[row, col]
-        return self._format_as_percentage(value)
-
-    def _format_as_numeric(self, value: Any) -> float | str:
-        """Format value as numeric for sheets."""
-        if self._is_empty_value(value):
-            return "N/A"
-
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return "N/A"
-
-    def _format_as_percentage(self, value: Any) -> float | str:
-        """Format value as percentage for sheets."""
-        if self._is_empty_value(value):
-            return "N/A"
-
-        parsed = parse_numeric_value(value)
-        return format_for_sheets(parsed, is_percentage=True)
-
-    def _is_empty_value(self, value: Any) -> bool:
-        """Check if value is empty."""
-        return pd.isna(value) or value == "///" or value == ""
+        return build_cpi_frame(
+            dates[keep].dt.date.tolist(),
+            {column: block[columns[column]].to_numpy() for column in CABA_COLUMNS},
+        )
@@ -1,61 +1,13 @@
 """Formatters for CPI data."""
 
-from typing import Any
+import pandas as pd
 
 
-def parse_numeric_value(value: Any) -> float | None:
-    """Parse a value into a float or None."""
-    if value is None:
-        return None
+def parse_numeric_block(block: pd.DataFrame) -> pd.DataFrame:
+    """Parse a whole block of cells into floats.
 
-    if isinstance(value, int | float):
-        if str(value).strip() in ("", "-", "N/A", "nan"):
-            return None
-        return float(value)
-
-    if isinstance(value, str):
-        value = value.strip()
-        # Handle common empty or invalid values
-        if value in ("", "-", "N/A", "///", ".", ".."):
-            return None
-
-        # Remove percentage symbol if it exists
-        value = value.replace("%", "").strip()
-
-        # Check if valid before attempting conversion
-        if not value or value in (".", ".."):
-            return None
-
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return None
-
-    # For pandas NaN, etc.
-    try:
-        import pandas as pd
-
-        if pd.isna(value):
-            return None
-    except ImportError:
-        pass
-
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return None
-
-
-def format_for_sheets(value: float | None, is_percentage: bool = False) -> float | str:
-    """Format a value for Google Sheets.
-
-    Args:
-        value: The numeric value to format
-        is_percentage: If True, value is already a percentage (e.g., 5.2 for 5.2%)
-
-    Returns:
-        The formatted value or "N/A" if None
+    Strips whitespace and "%" from every cell as text and coerces the result
+    to float64; empty markers ("", "-", "///", "N/A", ...) become NaN.
     """
-    if value is None:
-        return "N/A"
-    return value
+    text = block.astype(str).replace(r"[\s%]", "", regex=True)
+    return text.apply(pd.to_numeric, errors="coerce").astype("float64")
@@ -0,0 +1,81 @@
+"""Columnar CPI frame shared by the INDEC, CABA and USA fetchers.
+
+Each CPI fetcher returns a DataFrame indexed by date (`datetime.date`, one
+row per month) with float64 columns named after the CPI sheet columns, NaN
+where the source has no value. `merge_cpi_frames` outer-joins the sources
+in one step; the CPI sheet payload and the `cpi_data` DB rows are both
+built from that single aligned frame.
+"""
+
+from collections.abc import Sequence
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+INDEC_COLUMNS = (
+    "indec_tn_nivel_general",
+    "indec_tn_estacionales",
+    "indec_tn_regulados",
+    "indec_tn_nucleo",
+    "indec_gba_nivel_general",
+    "indec_gba_estacionales",
+    "indec_gba_regulados",
+    "indec_gba_nucleo",
+)
+CABA_COLUMNS = (
+    "caba_idx_nivel_general",
+    "caba_idx_estacionales",
+    "caba_idx_regulados",
+    "caba_idx_resto",
+    "caba_var_nivel_general",
+    "caba_var_estacionales",
+    "caba_var_regulados",
+    "caba_var_resto",
+)
+USA_COLUMNS = ("usa_cpi_index", "usa_variation")
+
+CPI_SOURCE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "indec": INDEC_COLUMNS,
+    "caba": CABA_COLUMNS,
+    "usa": USA_COLUMNS,
+}
+# CPI sheet order (columns B..S; column A is the date)
+CPI_COLUMNS = (*INDEC_COLUMNS, *CABA_COLUMNS, *USA_COLUMNS)
+
+
+def build_cpi_frame(
+    dates: Sequence[date], values: dict[str, Sequence[float | None]]
+) -> pd.DataFrame:
+    """Build a CPI frame from parallel date/value sequences.
+
+    None values become NaN. Repeated dates keep the last row, and rows are
+    sorted by date.
+    """
+    frame = pd.DataFrame(
+        {column: np.asarray(vals, dtype="float64") for column, vals in values.items()},
+        index=pd.Index(list(dates), name="date", dtype=object),
+        columns=list(values),
+    )
+    return frame[~frame.index.duplicated(keep="last")].sort_index()
+
+
+def merge_cpi_frames(frames: dict[str, pd.DataFrame | None]) -> pd.DataFrame:
+    """Outer-join the available source frames on date.
+
+    Sources passed as None are left out entirely, so their columns are
+    absent from the result (see `missing_cpi_sources`).
+    """
+    available = [frame for frame in frames.values() if frame is not None]
+    if not available:
+        return build_cpi_frame([], {})
+    return pd.concat(available, axis=1, join="outer").sort_index()
+
+
+def missing_cpi_sources(frame: pd.DataFrame) -> list[str]:
+    """Sources whose columns are absent from a merged frame."""
+    return [
+        source
+        for source, columns in CPI_SOURCE_COLUMNS.items()
+        if not set(columns) <= set(frame.columns)
+    ]
@@ -1,14 +1,18 @@
 """Fetcher for INDEC Argentina CPI (Índice de Precios al Consumidor)."""
 
-import io
 import logging
-from datetime import datetime, timedelta
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 
 import pandas as pd
 import requests
 
-from src.fetchers.cpi_formatters import format_for_sheets, parse_numeric_value
+from src.connectors.http import get_http_session
+from src.connectors.http_cache import CachedResponse, HTTPCache
+from src.fetchers.cpi_formatters import parse_numeric_block
+from src.fetchers.cpi_frame import INDEC_COLUMNS, build_cpi_frame
+from src.fetchers.excel_reader import read_xls
+from src.fetchers.parse_pool import run_parser
 
 logger = logging.getLogger(__name__)
 
@@ -32,170 +36,167 @@ class INDECCPIFetcher:
         "regulados": 56,
     }
 
-    def __init__(self) -> None:
-        """Initialize the INDEC CPI fetcher."""
+    MONTHS_TO_PROBE = 5
+
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        cache: HTTPCache | None = None,
+        last_filename: str | None = None,
+    ) -> None:
+        """Initialize the INDEC CPI fetcher.
+
+        Args:
+            session: HTTP session (defaults to the shared one)
+            cache: On-disk conditional-GET cache for the monthly workbook
+            last_filename: Filename resolved on a previous run; it is tried
+                first and only newer months are probed
+        """
         self.base_url = self.BASE_URL
+        self.session = session or get_http_session()
+        self.cache = cache or HTTPCache(self.session)
+        self.last_filename = last_filename
+        self.resolved_filename: str | None = None
 
-    def fetch(
-        self, start_date: str = "2022-02-01"
-    ) -> tuple[
-        list[list[str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-    ]:
+    def fetch(self, start_date: date = date(2022, 2, 1)) -> pd.DataFrame:
         """Fetch INDEC CPI data.
 
         Args:
-            start_date: Start date in YYYY-MM-DD format
+            start_date: First month to keep
 
         Returns:
-            Tuple containing:
-            - dates
-            - total_nacional_nivel_general
-            - total_nacional_estacionales
-            - total_nacional_regulados
-            - total_nacional_nucleo
-            - gba_nivel_general
-            - gba_estacionales
-            - gba_regulados
-            - gba_nucleo
+            CPI frame (see cpi_frame) indexed by month with the INDEC_COLUMNS:
+            total nacional and GBA nivel general, estacionales, regulados and
+            núcleo, as monthly percentage variations
         """
         response = self._download_latest_available_excel()
-        df = self._parse_excel_to_dataframe(response.content)
+        return self.parse(response, start_date)
+
+    def parse(self, response: CachedResponse, start_date: date) -> pd.DataFrame:
+        """Turn a downloaded workbook into a CPI frame (through the parse cache)."""
+        rows = [
+            self.DATE_ROW,
+            *self.TOTAL_NACIONAL_ROWS.values(),
+            *self.GBA_ROWS.values(),
+        ]
+        df = self.cache.parse(response, self._parse_excel_to_dataframe, rows)
         return self._extract_all_cpi_data(df, start_date)
 
-    def _download_latest_available_excel(self) -> requests.Response:
+    def _download_latest_available_excel(self) -> CachedResponse:
         """Download the latest available INDEC Excel file."""
-        for month_offset in range(5):
-            target_date = datetime.now() - timedelta(days=month_offset * 30)
-            url = self._build_excel_url_for_date(target_date)
+        candidates = self.candidate_filenames()
 
-            response = self._try_download_from_url(url)
+        if self.last_filename in candidates:
+            # Only months newer than the remembered file can bring news
+            newer = candidates[: candidates.index(self.last_filename)]
+            filename = self._probe_newest(newer) or self.last_filename
+            response = self.try_download_from_url(self.build_excel_url(filename))
             if response:
-                logger.info(f"INDEC CPI: Downloaded file from {url}")
-                return response
+                return self.resolved(filename, response)
+            logger.warning(f"INDEC CPI: {filename} no longer available, probing all")
+
+        filename = self._probe_newest(candidates)
+        if filename:
+            response = self.try_download_from_url(self.build_excel_url(filename))
+            if response:
+                return self.resolved(filename, response)
 
         raise ValueError("No INDEC file found")
 
-    def _build_excel_url_for_date(self, date: datetime) -> str:
-        """Build the Excel file URL for a given date."""
+    def resolved(self, filename: str, response: CachedResponse) -> CachedResponse:
+        logger.info(f"INDEC CPI: Downloaded file from {self.build_excel_url(filename)}")
+        self.resolved_filename = filename
+        return response
+
+    def candidate_filenames(self) -> list[str]:
+        """Filenames for the last MONTHS_TO_PROBE months, newest first."""
+        now = datetime.now()
+        return [
+            self._build_excel_filename_for_date(now - timedelta(days=offset * 30))
+            for offset in range(self.MONTHS_TO_PROBE)
+        ]
+
+    def _probe_newest(self, filenames: list[str]) -> str | None:
+        """Probe all filenames concurrently and return the newest valid one."""
+        if not filenames:
+            return None
+        with ThreadPoolExecutor(max_workers=len(filenames)) as executor:
+            found = list(
+                executor.map(lambda f: self.probe_url(self.build_excel_url(f)), filenames)
+            )
+        return next((f for f, ok in zip(filenames, found, strict=True) if ok), None)
+
+    def probe_url(self, url: str) -> bool:
+        """Check that an Excel file exists without downloading its body.
+
+        Uses HEAD; if the server rejects it, falls back to a 1-byte range GET.
+        """
+        try:
+            response = self.session.head(url, allow_redirects=True)
+            if response.status_code in (405, 501):
+                response = self.session.get(url, headers={"Range": "bytes=0-0"}, stream=True)
+                response.close()
+                if response.status_code == 206:
+                    response.status_code = 200
+            return self._is_valid_excel_response(response)
+        except requests.RequestException as e:
+            logger.debug(f"INDEC CPI: Failed to probe {url}: {e}")
+            return False
+
+    def _build_excel_filename_for_date(self, date: datetime) -> str:
+        """Build the Excel filename for a given date."""
         month = date.strftime("%m")
         year = date.strftime("%y")
-        filename = f"sh_ipc_{month}_{year}.xls"
+        return f"sh_ipc_{month}_{year}.xls"
+
+    def build_excel_url(self, filename: str) -> str:
+        """Build the Excel file URL for a given filename."""
         return f"{self.base_url}{filename}"
 
-    def _try_download_from_url(self, url: str) -> requests.Response | None:
-        """Try to download file from URL."""
+    def try_download_from_url(self, url: str) -> CachedResponse | None:
+        """Try to download file from URL (conditional GET against the cache)."""
         try:
-            response = requests.get(url, timeout=10)
+            response = self.cache.get(url)
             if self._is_valid_excel_response(response):
                 return response
         except requests.RequestException as e:
             logger.debug(f"INDEC CPI: Failed to download from {url}: {e}")
         return None
 
-    def _is_valid_excel_response(self, response: requests.Response) -> bool:
+    def _is_valid_excel_response(self, response: CachedResponse | requests.Response) -> bool:
         """Check if response is a valid Excel file."""
         if response.status_code != 200:
             return False
         content_type = response.headers.get("Content-Type", "")
         return "excel" in content_type.lower()
 
-    def _parse_excel_to_dataframe(self, content: bytes) -> pd.DataFrame:
-        """Parse Excel content to DataFrame."""
-        return pd.read_excel(
-            io.BytesIO(content), sheet_name=0, header=None, engine="xlrd"
-        )
-
-    def _extract_all_cpi_data(
-        self, df: pd.DataFrame, start_date: str
-    ) -> tuple[
-        list[list[str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-        list[list[float | str]],
-    ]:
-        """Extract all CPI data from DataFrame."""
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-
-        dates: list[list[str]] = []
-        total_nacional = {key: [] for key in self.TOTAL_NACIONAL_ROWS}
-        gba = {key: [] for key in self.GBA_ROWS}
-
-        for col_idx in range(1, len(df.columns)):
-            date_str = self._extract_formatted_date_from_column(df, col_idx, start_dt)
-            if not date_str:
-                continue
-
-            dates.append([date_str])
-            self._append_values_for_region(
-                df, col_idx, total_nacional, self.TOTAL_NACIONAL_ROWS
-            )
-            self._append_values_for_region(df, col_idx, gba, self.GBA_ROWS)
-
-        return (
-            dates,
-            total_nacional["nivel_general"],
-            total_nacional["estacionales"],
-            total_nacional["regulados"],
-            total_nacional["nucleo"],
-            gba["nivel_general"],
-            gba["estacionales"],
-            gba["regulados"],
-            gba["nucleo"],
-        )
-
-    def _extract_formatted_date_from_column(
-        self, df: pd.DataFrame, col_idx: int, start_date: datetime
-    ) -> str | None:
-        """Extract and format date from column."""
-        date_val = df.iloc[self.DATE_ROW, col_idx]
-
-        if pd.isna(date_val):
-            return None
-
-        date_obj = self._parse_date_value(date_val)
-        if not date_obj or date_obj < start_date:
-            return None
+    def _parse_excel_to_dataframe(self, content: bytes, rows: list[int]) -> pd.DataFrame:
+        """Read only the date row and the CPI rows into a DataFrame.
 
-        return date_obj.strftime("%d/%m/%Y")
+        The frame is indexed by the original sheet row numbers, so the
+        row constants keep working with `.loc`.
+        """
+        block = run_parser(read_xls, content, rows=rows)
+        return pd.DataFrame(block, index=rows)
 
-    def _parse_date_value(self, date_val: Any) -> datetime | None:
-        """Parse a date value from the Excel file."""
-        try:
-            if isinstance(date_val, str):
-                return pd.to_datetime(date_val, errors="coerce")
-            return pd.to_datetime(date_val)
-        except (ValueError, TypeError):
-            return None
+    def _extract_all_cpi_data(self, df: pd.DataFrame, start_date: date) -> pd.DataFrame:
+        """Extract all CPI data from DataFrame.
 
-    def _append_values_for_region(
-        self, df: pd.DataFrame, col_idx: int, region_data: dict, row_mapping: dict
-    ) -> None:
-        """Append values for a specific region."""
-        for key, row_idx in row_mapping.items():
-            value = self._extract_percentage_from_cell(df, row_idx, col_idx)
-            region_data[key].append([value])
-
-    def _extract_percentage_from_cell(
-        self, df: pd.DataFrame, row: int, col: int
-    ) -> float | str:
-        """Extract percentage value from cell."""
-        value = df.iloc[row, col]
-        return self._format_as_percentage(value)
-
-    def _format_as_percentage(self, value: Any) -> float | str:
-        """Format value as percentage for sheets."""
-        parsed = parse_numeric_value(value)
-        return format_for_sheets(parsed, is_percentage=True)
+        Works on the whole block at once: the date row is coerced in one
+        `to_datetime`, months before start_date are masked out and the eight
+        CPI rows are sliced and converted together.
+        """
+        rows = {
+            **{f"indec_tn_{key}": row for key, row in self.TOTAL_NACIONAL_ROWS.items()},
+            **{f"indec_gba_{key}": row for key, row in self.GBA_ROWS.items()},
+        }
+
+        # Column 0 holds the row labels; each other column is a month
+        dates = pd.to_datetime(df.loc[self.DATE_ROW].iloc[1:], errors="coerce", format="mixed")
+        months = dates.notna() & (dates >= pd.Timestamp(start_date))
+        block = parse_numeric_block(df.loc[list(rows.values()), months[months].index])
+
+        return build_cpi_frame(
+            dates[months].dt.date.tolist(),
+            {column: block.loc[rows[column]].to_numpy() for column in INDEC_COLUMNS},
+        )
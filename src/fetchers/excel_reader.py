@@ -0,0 +1,125 @@
+"""Lectura acotada de celdas de planillas Excel oficiales (REM, INDEC, CABA).
+
+En lugar de cargar el libro completo, se recorren solo las filas y columnas
+declaradas (openpyxl en modo read-only para .xlsx, xlrd `on_demand` para .xls)
+y se devuelven como un array 2D compacto. Filas y columnas son 0-based, igual
+que `iloc` sobre un DataFrame leído con `header=None`.
+"""
+
+import io
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+import openpyxl
+import xlrd
+
+
+def read_xlsx(
+    content: bytes,
+    cols: Sequence[int] | None = None,
+    rows: Sequence[int] | None = None,
+    first_row: int = 0,
+    sheet_index: int = 0,
+) -> np.ndarray:
+    """Lee celdas de un .xlsx sin cargar el libro completo en memoria.
+
+    Args:
+        content: Bytes del archivo
+        cols: Columnas a leer (None = todas)
+        rows: Filas a leer; si es None se leen desde `first_row` hasta el final
+        first_row: Primera fila cuando `rows` es None
+        sheet_index: Hoja a leer
+
+    Returns:
+        Array de objetos (len(rows), len(cols)); las celdas vacías son None
+    """
+    wb = openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    try:
+        sheet = wb.worksheets[sheet_index]
+        min_row = min(rows) if rows else first_row
+        max_row = max(rows) if rows else None
+        min_col = min(cols) if cols else 0
+        max_col = max(cols) if cols else None
+
+        block = sheet.iter_rows(
+            min_row=min_row + 1,
+            max_row=max_row + 1 if max_row is not None else None,
+            min_col=min_col + 1,
+            max_col=max_col + 1 if max_col is not None else None,
+            values_only=True,
+        )
+        wanted_rows = set(rows) if rows else None
+        selected = []
+        for row_idx, values in enumerate(block, start=min_row):
+            if wanted_rows is not None and row_idx not in wanted_rows:
+                continue
+            selected.append(_pick(values, cols, min_col))
+    finally:
+        wb.close()
+
+    if rows:
+        by_row = dict(zip(sorted(wanted_rows), selected, strict=False))
+        selected = [by_row.get(r, _pick((), cols, min_col)) for r in rows]
+    return _to_array(selected, cols)
+
+
+def read_xls(
+    content: bytes,
+    cols: Sequence[int] | None = None,
+    rows: Sequence[int] | None = None,
+    first_row: int = 0,
+    sheet_index: int = 0,
+) -> np.ndarray:
+    """Lee celdas de un .xls (BIFF) cargando solo la hoja pedida.
+
+    Las celdas de tipo fecha se convierten a datetime, igual que hace
+    `pd.read_excel`. Mismos argumentos y resultado que `read_xlsx`.
+    """
+    book = xlrd.open_workbook(file_contents=content, on_demand=True)
+    try:
+        sheet = book.sheet_by_index(sheet_index)
+        row_indices = list(rows) if rows else range(first_row, sheet.nrows)
+        col_indices = list(cols) if cols else range(sheet.ncols)
+
+        selected = []
+        for r in row_indices:
+            if r >= sheet.nrows:
+                selected.append([None] * len(col_indices))
+                continue
+            selected.append(
+                [_xls_value(sheet, r, c, book.datemode) for c in col_indices]
+            )
+    finally:
+        book.release_resources()
+
+    return _to_array(selected, col_indices)
+
+
+def _pick(values: Sequence[Any], cols: Sequence[int] | None, offset: int) -> list[Any]:
+    if cols is None:
+        return list(values)
+    return [values[c - offset] if c - offset < len(values) else None for c in cols]
+
+
+def _xls_value(sheet: xlrd.sheet.Sheet, row: int, col: int, datemode: int) -> Any:
+    if col >= sheet.row_len(row):
+        return None
+    cell_type = sheet.cell_type(row, col)
+    if cell_type in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+        return None
+    value = sheet.cell_value(row, col)
+    if cell_type == xlrd.XL_CELL_DATE:
+        try:
+            return xlrd.xldate_as_datetime(value, datemode)
+        except (ValueError, OverflowError):
+            return value
+    return value
+
+
+def _to_array(selected: list[list[Any]], cols: Sequence[int] | None) -> np.ndarray:
+    width = len(cols) if cols is not None else max((len(r) for r in selected), default=0)
+    out = np.full((len(selected), width), None, dtype=object)
+    for i, row in enumerate(selected):
+        out[i, : len(row)] = row[:width]
+    return out
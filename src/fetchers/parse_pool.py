@@ -0,0 +1,65 @@
+"""Etapa de parseo en procesos aparte para las planillas Excel (REM, INDEC, CABA).
+
+Leer un .xls/.xlsx con xlrd/openpyxl es Python puro y CPU-bound: desde los
+threads de fetch compite por el GIL. `run_parser` manda los bytes descargados
+a un ProcessPoolExecutor compartido y devuelve el array compacto que arma
+`excel_reader`, así un backfill de decenas de libros usa todos los cores.
+
+Las funciones que se pasan deben ser de nivel de módulo (picklables), como
+`read_xlsx` / `read_xls`.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+from src.config import FETCH_CONFIG
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_pool: ProcessPoolExecutor | None = None
+_pool_disabled = False
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    global _pool, _pool_disabled
+    with _pool_lock:
+        if _pool is None and not _pool_disabled:
+            workers = FETCH_CONFIG["max_workers_parse"] or os.cpu_count() or 1
+            if workers <= 1:
+                _pool_disabled = True
+                return None
+            try:
+                # forkserver: no hereda los locks de los threads de fetch. Los
+                # lectores se importan una vez en el server y los workers los heredan.
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload(["src.fetchers.excel_reader"])
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Parse pool unavailable, parsing in-process: {e}")
+                _pool_disabled = True
+        return _pool
+
+
+def run_parser(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Ejecuta `func(*args, **kwargs)` en el pool de procesos (o inline si no hay pool)."""
+    global _pool
+    pool = _get_pool()
+    if pool is None:
+        return func(*args, **kwargs)
+    try:
+        return pool.submit(func, *args, **kwargs).result()
+    except BrokenProcessPool as e:
+        logger.warning(f"Parse pool broke ({e}), restarting it and parsing in-process")
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        return func(*args, **kwargs)
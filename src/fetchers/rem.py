@@ -4,14 +4,20 @@ Realiza web scraping de publicaciones mensuales del BCRA y parsea archivos Excel
 para extraer proyecciones de inflación.
 """
 
-import io
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any
 
-import openpyxl
 import requests
 from bs4 import BeautifulSoup
 
 from src.config import API_URLS, FETCH_CONFIG, MONTHS_MAP
+from src.connectors.http import get_http_session
+from src.connectors.http_cache import HTTPCache
+from src.fetchers.excel_reader import read_xlsx
+from src.fetchers.parse_pool import run_parser
 
 logger = logging.getLogger(__name__)
 
@@ -20,52 +26,128 @@ class REMFetcher:
     """Obtiene proyecciones de inflación REM desde publicaciones del BCRA.
 
     Nota: No implementa DataSource porque devuelve un formato diferente
-    (dict[str, list[float]] en lugar de dict[date, float]).
+    (dict[date, list[float]] en lugar de una TimeSeries).
+
+    Las publicaciones presentes en `index` (ver `get_rem_publication_index`)
+    se sirven desde ahí sin ninguna llamada HTTP; las nuevas que se procesan
+    quedan en `new_index_entries` para persistirlas.
     """
 
-    def fetch(self, since_date: tuple[int, int]) -> dict[str, list[float]]:
+    def __init__(
+        self,
+        index: dict[str, dict] | None = None,
+        session: requests.Session | None = None,
+        cache: HTTPCache | None = None,
+    ) -> None:
+        self.session = session or get_http_session()
+        self.cache = cache or HTTPCache(self.session)
+        self.index = index or {}
+        self.new_index_entries: list[dict] = []
+        self._by_hash: dict[str, dict] = {}
+
+    def fetch(self, since_date: tuple[int, int]) -> dict[date, list[float]]:
         """Obtiene reportes REM desde una fecha específica.
 
         Args:
             since_date: Tupla (año, mes) desde donde obtener datos
 
         Returns:
-            Diccionario de "YYYY-MM-DD" -> lista de 8 proyecciones
+            Diccionario de mes de publicación (día 1) -> lista de 8 proyecciones
             [M, M+1, M+2, M+3, M+4, M+5, M+6, 12m]
 
         Note:
             Los datos de inflación que trae BCRA son nominales (ej: 3% = 3),
             los dividimos por 100 para dejarlo en formato decimal (0.03).
         """
-        links = self._get_publication_links(since_date)
-        reports = {}
+        links = self.get_publication_links(since_date)
+        new_links = self.start_batch(links)
+
+        # Cada publicación recorre scrape -> download -> parse en su propio
+        # worker; map() conserva el orden de `new_links` (ordenados por fecha).
+        with ThreadPoolExecutor(max_workers=FETCH_CONFIG["max_workers_rem"]) as executor:
+            entries = list(executor.map(self.fetch_publication, new_links))
+
+        return self.collect_reports(since_date, links, new_links, entries)
+
+    def start_batch(self, links: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Prepara el lookup por hash y devuelve las publicaciones a procesar."""
+        self._by_hash = {e["content_hash"]: e for e in self.index.values()}
+        return [pub for pub in links if not self._is_indexed(pub)]
+
+    def collect_reports(
+        self,
+        since_date: tuple[int, int],
+        links: list[dict[str, Any]],
+        new_links: list[dict[str, Any]],
+        new_entries: list[dict[str, Any] | None],
+    ) -> dict[date, list[float]]:
+        """Arma los reportes combinando el índice con las publicaciones nuevas."""
+        entries = dict(
+            zip((pub["url"] for pub in new_links), new_entries, strict=True)
+        )
+        self.new_index_entries = [e for e in new_entries if e]
 
+        reports = {}
         for pub in links:
-            xlsx_url = self._get_xlsx_from_publication(pub["url"])
-            if xlsx_url:
-                projections = self._download_and_parse_excel(xlsx_url)
-                if projections:
-                    month_key = f"{pub['date'][0]}-{pub['date'][1]:02d}-01"
-                    reports[month_key] = projections
+            entry = entries[pub["url"]] if pub["url"] in entries else self.index[pub["url"]]
+            if entry and entry["projections"]:
+                reports[date(pub["date"][0], pub["date"][1], 1)] = entry["projections"]
 
-        logger.info(f"REM: fetched {len(reports)} reports since {since_date}")
+        logger.info(
+            f"REM: fetched {len(reports)} reports since {since_date} "
+            f"({len(links) - len(new_links)} from index, {len(new_links)} new)"
+        )
 
         return reports
 
-    def _get_publication_links(
+    def _is_indexed(self, pub: dict[str, Any]) -> bool:
+        entry = self.index.get(pub["url"])
+        return bool(entry and all(v is not None for v in entry["projections"]))
+
+    def fetch_publication(self, pub: dict[str, Any]) -> dict[str, Any] | None:
+        """Procesa una publicación completa; los errores quedan aislados en ella.
+
+        Returns:
+            Entrada del índice (URLs, hash y proyecciones) o None si falló.
+        """
+        try:
+            xlsx_url = self._get_xlsx_from_publication(pub["url"])
+            if not xlsx_url:
+                return None
+            content = self._download_excel(xlsx_url)
+            if content is None:
+                return None
+
+            content_hash = hashlib.sha256(content).hexdigest()
+            known = self._by_hash.get(content_hash)
+            # Mismo archivo publicado bajo otra URL: no hace falta parsearlo.
+            projections = known["projections"] if known else self._parse_excel(content, xlsx_url)
+            if not projections:
+                return None
+
+            return {
+                "publication_url": pub["url"],
+                "publication_date": date(pub["date"][0], pub["date"][1], 1),
+                "xlsx_url": xlsx_url,
+                "content_hash": content_hash,
+                "projections": projections,
+            }
+        except Exception as e:
+            logger.error(f"REM: failed to process publication {pub['period']}: {e}")
+            return None
+
+    def get_publication_links(
         self, since_date: tuple[int, int]
-    ) -> list[dict[str, any]]:
+    ) -> list[dict[str, Any]]:
         """Obtiene links de publicaciones REM desde la API JSON del BCRA.
 
         La página de publicaciones renderiza la tabla por JS; este endpoint es
         el que ese widget consume (`data-module="publicaciones-tabla"`).
         """
         try:
-            r = requests.get(
+            r = self.session.get(
                 API_URLS["bcra_rem_publications"],
                 params={"category": "rem", "lang": "es", "action": "total"},
-                timeout=FETCH_CONFIG["timeout_seconds"],
-                verify=False,  # BCRA has cert issues
             )
             r.raise_for_status()
             publicaciones = r.json()["data"]["publicaciones"]
@@ -95,9 +177,7 @@ class REMFetcher:
     def _get_xlsx_from_publication(self, pub_url: str) -> str | None:
         """Extrae URL del archivo Excel desde una página de publicación."""
         try:
-            r = requests.get(
-                pub_url, timeout=FETCH_CONFIG["timeout_seconds"], verify=False
-            )
+            r = self.cache.get(pub_url)
             r.raise_for_status()
             soup = BeautifulSoup(r.text, "html.parser")
 
@@ -122,18 +202,26 @@ class REMFetcher:
 
         return None
 
-    def _download_and_parse_excel(self, url: str) -> list[float]:
-        """Descarga y parsea archivo Excel de proyecciones REM."""
+    def _download_excel(self, url: str) -> bytes | None:
+        """Descarga el archivo Excel de proyecciones REM."""
         try:
-            r = requests.get(url, timeout=FETCH_CONFIG["timeout_seconds"], verify=False)
+            r = self.cache.get(url)
             r.raise_for_status()
+            return r.content
+        except requests.exceptions.RequestException as e:
+            logger.error(f"REM: failed to download XLSX from {url}: {e}")
+            return None
 
-            wb = openpyxl.load_workbook(io.BytesIO(r.content), data_only=True)
-            sheet = wb.worksheets[0]
+    def _parse_excel(self, content: bytes, url: str) -> list[float]:
+        """Parsea el archivo Excel de proyecciones REM.
+
+        Solo lee la columna D, filas 7 a 14: M..M+6 y luego la de 12 meses.
+        """
+        try:
+            block = run_parser(read_xlsx, content, cols=[3], rows=range(6, 14))
 
             projections = []
-            for row in range(7, 14):  # M a M+6
-                val = sheet.cell(row=row, column=4).value
+            for row, val in enumerate(block[:, 0], start=7):
                 if val is not None:
                     try:
                         projections.append(float(val) / 100.0)
@@ -145,21 +233,8 @@ class REMFetcher:
                 else:
                     projections.append(0.0)
 
-            val_12m = sheet.cell(row=14, column=4).value
-            if val_12m is not None:
-                try:
-                    projections.append(float(val_12m) / 100.0)
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"REM: invalid 12m projection: {val_12m} ({e})")
-                    projections.append(0.0)
-            else:
-                projections.append(0.0)
-
             return projections
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"REM: failed to download XLSX from {url}: {e}")
-            return []
         except Exception as e:
             logger.error(f"REM: failed to parse XLSX from {url}: {e}")
             return []
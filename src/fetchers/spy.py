@@ -3,43 +3,33 @@
 import logging
 from datetime import date
 
-import yfinance as yf
-
 from src.fetchers.base import DataSource
+from src.fetchers.benchmarks import fetch_closes
+from src.timeseries import TimeSeries
 
 logger = logging.getLogger(__name__)
 
 
 class SPYFetcher(DataSource):
-    """Obtiene precios de cierre de SPY usando yfinance."""
+    """Obtiene precios de cierre de SPY usando yfinance.
+
+    Lo usa el backfill por chunks de historic_data.spy; la corrida normal baja
+    SPY junto con el resto de los benchmarks (ver BenchmarksFetcher). Los
+    errores se propagan y un rango sin cotizaciones devuelve una serie vacía,
+    así el backfill sabe qué chunks reintentar. El timeout de yfinance se
+    recorta al deadline de la corrida.
+    """
 
-    def fetch(self, since: date, until: date) -> dict[date, float]:
+    def fetch(self, since: date, until: date) -> TimeSeries:
         """Obtiene precios históricos de cierre de SPY.
 
         Args:
             since: Fecha de inicio
-            until: Fecha de fin
+            until: Fecha de fin (exclusiva, como en yfinance)
 
         Returns:
-            Diccionario de fecha -> precio de cierre
+            TimeSeries de fecha -> precio de cierre
         """
-        out = {}
-
-        try:
-            ticker = yf.Ticker("SPY")
-            df = ticker.history(start=since, end=until, interval="1d")
-
-            if df.empty:
-                logger.warning(f"SPY: no data returned for {since} to {until}")
-                return out
-
-            for idx, row in df.iterrows():
-                d = idx.date() if hasattr(idx, "date") else idx
-                out[d] = float(row["Close"])
-
-            logger.info(f"SPY: fetched {len(out)} days from {since} to {until}")
-
-        except Exception as e:
-            logger.error(f"SPY: failed to fetch data: {e}")
-
+        out = fetch_closes("SPY", since, until)
+        logger.info(f"SPY: fetched {len(out)} days from {since} to {until}")
         return out
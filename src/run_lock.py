@@ -0,0 +1,150 @@
+"""Corrida única de fetch_data: lock de archivo + tabla run_state.
+
+El timer de systemd puede dispararse mientras hay una corrida manual. Sin
+coordinación, las dos piden todo a cada fuente y pisan sus upserts y sus
+escrituras a Sheets. Con `RunCoordinator`:
+
+- La primera invocación toma el lock (flock) y registra su corrida en run_state.
+- Una segunda invocación se engancha a la activa: espera a que suelte el lock
+  (hasta `lock_wait_seconds(budget)`). Si esa corrida terminó bien y pedía lo mismo
+  (mismo modo), reusa su resultado, que ya quedó en la DB y Sheets, y sale sin
+  pedir nada. Si terminó con fallos o pedía otra cosa, corre ella, arrancando
+  desde las fechas que dejó la anterior.
+
+El lock lo libera el sistema operativo si el proceso muere; la fila que quedó
+"running" se marca "abandoned" en la corrida siguiente.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from src.config import FETCH_CONFIG
+from src.db.writer import (
+    finish_run_state,
+    get_active_run_state,
+    get_last_finished_run_state,
+    get_run_state,
+    start_run_state,
+)
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_LOCK_FILE = "/srv/data/personal-finance/fetch_data.lock"
+
+
+def lock_wait_seconds(budget: float) -> float:
+    """Cuánto puede esperar el lock una corrida de `budget` segundos (0 = sin límite).
+
+    Espera + budget + persist_grace_seconds tienen que entrar en
+    run_timeout_seconds (TimeoutStartSec del unit), con margen: si no, systemd
+    mataría la corrida a mitad de las escrituras a la DB y Sheets.
+    """
+    cfg = FETCH_CONFIG
+    spent = budget + cfg["persist_grace_seconds"] if budget else 0.0
+    return max(0.0, cfg["run_timeout_seconds"] - cfg["run_lock_margin_seconds"] - spent)
+
+
+class RunCoordinator:
+    """Context manager que decide si esta invocación corre, reusa o sale.
+
+    Después de entrar:
+        proceed: True si esta invocación tiene el lock y debe correr
+        reused: Fila run_state de la corrida cuyo resultado se reusó (o None)
+    """
+
+    def __init__(
+        self, mode: str, lock_path: str | None = None, wait_seconds: float | None = None
+    ) -> None:
+        self.mode = mode
+        if wait_seconds is None:
+            wait_seconds = lock_wait_seconds(FETCH_CONFIG["run_budget_seconds"])
+        self.wait_seconds = wait_seconds
+        self.lock_path = lock_path or os.getenv("RUN_LOCK_FILE", _DEFAULT_LOCK_FILE)
+        self.run_id: str | None = None
+        self.proceed = False
+        self.reused: dict | None = None
+        self._file = None
+        self._finished = False
+
+    def __enter__(self) -> "RunCoordinator":
+        waiting_since = datetime.now()
+        Path(self.lock_path).parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.lock_path, "a")
+        if self._try_lock():
+            self._start()
+            return self
+
+        active = get_active_run_state()
+        if active:
+            logger.info(
+                f"Run {active['run_id']} (pid {active['pid']}, {active['mode']}) in progress "
+                f"since {active['started_at']:%H:%M:%S}; waiting for it"
+            )
+        else:
+            logger.info("Another run holds the lock; waiting for it")
+
+        if not self._wait_for_lock():
+            logger.warning(
+                f"Active run still going after {self.wait_seconds:.0f}s; exiting"
+            )
+            return self
+
+        # Con el lock tomado ninguna corrida nueva puede arrancar: se relee
+        # run_state. Si la dueña del lock terminó entre el intento de lock y
+        # get_active_run_state, `active` es None pero su fila ya está cerrada.
+        if active:
+            previous = get_run_state(active["run_id"])
+        else:
+            previous = get_last_finished_run_state(waiting_since)
+        if previous and previous["status"] == "success" and previous["mode"] == self.mode:
+            logger.info(f"Reusing results of run {previous['run_id']}")
+            self.reused = previous
+            self._unlock()
+            return self
+
+        self._start()
+        return self
+
+    def finish(self, failed: list[str]) -> None:
+        """Registra el resultado de la corrida (nodos fallidos en summary)."""
+        status = "partial" if failed else "success"
+        finish_run_state(self.run_id, status, json.dumps({"failed": failed}))
+        self._finished = True
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.proceed and not self._finished:
+            finish_run_state(self.run_id, "failed", json.dumps({"error": repr(exc)}))
+        self._unlock()
+
+    def _try_lock(self) -> bool:
+        try:
+            fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _wait_for_lock(self) -> bool:
+        limit = time.monotonic() + self.wait_seconds
+        while time.monotonic() < limit:
+            time.sleep(FETCH_CONFIG["run_lock_poll_seconds"])
+            if self._try_lock():
+                return True
+        return False
+
+    def _start(self) -> None:
+        self.run_id = uuid.uuid4().hex[:12]
+        start_run_state(self.run_id, self.mode, os.getpid())
+        self.proceed = True
+        logger.info(f"Run {self.run_id} started ({self.mode})")
+
+    def _unlock(self) -> None:
+        if self._file is not None:
+            # Cerrar el archivo suelta el flock
+            self._file.close()
+            self._file = None
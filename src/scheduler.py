@@ -0,0 +1,218 @@
+"""Scheduler de tareas con dependencias (DAG) sobre un event loop asyncio.
+
+Cada nodo declara de qué otros nodos depende; apenas todas sus dependencias
+terminan se lanza, así las fuentes independientes corren en paralelo y las
+etapas posteriores (merge, Sheets, DB) arrancan sin esperar al resto.
+
+Los nodos `async def` (fetchers de `async_sources`) se esperan directamente
+en el loop; los sincrónicos (gspread, SQLAlchemy, yfinance) corren en un
+ThreadPoolExecutor de `max_workers` hilos.
+
+Con un `Deadline`, al vencer se cancelan los nodos que no terminaron salvo
+los marcados `persist`, que siguen (hasta `grace` segundos más) para guardar
+lo que sí llegó.
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.deadline import Deadline
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Node:
+    """Nodo del grafo.
+
+    Attributes:
+        name: Identificador único; también es el nombre del kwarg con el que
+            su resultado llega a los nodos que dependen de él.
+        func: Callable (o corrutina) que recibe como kwargs los resultados de `deps`.
+        deps: Nombres de los nodos de los que depende.
+        optional: Subconjunto de `deps` cuyo fallo se tolera: el nodo corre
+            igual y recibe None en su lugar. Si falla cualquier otra
+            dependencia, el nodo se omite.
+        persist: No se cancela al vencer el deadline. Para la persistencia
+            (Sheets/DB) y los pasos rápidos que la alimentan, así se guarda
+            lo que ya terminó.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    deps: tuple[str, ...] = field(default_factory=tuple)
+    optional: tuple[str, ...] = field(default_factory=tuple)
+    persist: bool = False
+
+
+def run_graph(
+    nodes: list[Node],
+    max_workers: int,
+    deadline: Deadline | None = None,
+    grace: float = 0.0,
+) -> dict[str, Any]:
+    """Ejecuta el grafo en un event loop nuevo (ver `run_graph_async`)."""
+    return asyncio.run(run_graph_async(nodes, max_workers, deadline, grace))
+
+
+async def run_graph_async(
+    nodes: list[Node],
+    max_workers: int,
+    deadline: Deadline | None = None,
+    grace: float = 0.0,
+) -> dict[str, Any]:
+    """Ejecuta el grafo y devuelve los resultados de los nodos exitosos.
+
+    Los nodos que fallan (o se omiten por dependencias fallidas) no aparecen
+    en el diccionario devuelto; el error queda logueado. Los cancelados por
+    el deadline cuentan como fallidos.
+
+    Raises:
+        ValueError: Si hay nombres duplicados, dependencias desconocidas o ciclos.
+    """
+    by_name = {n.name: n for n in nodes}
+    if len(by_name) != len(nodes):
+        raise ValueError("Duplicate node names in graph")
+    for n in nodes:
+        unknown = [d for d in n.deps if d not in by_name]
+        if unknown:
+            raise ValueError(f"Node {n.name} depends on unknown nodes: {unknown}")
+        if not set(n.optional) <= set(n.deps):
+            raise ValueError(f"Node {n.name} has optional entries outside deps")
+    _check_acyclic(by_name)
+
+    loop = asyncio.get_running_loop()
+    results: dict[str, Any] = {}
+    failed: set[str] = set()
+    tasks: dict[str, asyncio.Task] = {}
+
+    async def run(node: Node) -> None:
+        started = time.monotonic()
+        try:
+            # asyncio.wait (no gather) para que cancelar una dependencia no
+            # cancele también a este nodo; el estado queda en results/failed
+            if node.deps:
+                await asyncio.wait([tasks[d] for d in node.deps])
+
+            failed_deps = [d for d in node.deps if d in failed and d not in node.optional]
+            if failed_deps:
+                logger.warning(f"Skipping {node.name}: failed dependencies {failed_deps}")
+                failed.add(node.name)
+                return
+
+            kwargs = {d: results.get(d) for d in node.deps}
+            started = time.monotonic()
+            if inspect.iscoroutinefunction(node.func):
+                results[node.name] = await node.func(**kwargs)
+            else:
+                results[node.name] = await loop.run_in_executor(
+                    executor, functools.partial(node.func, **kwargs)
+                )
+            logger.info(f"{node.name}: done in {time.monotonic() - started:.1f}s")
+        except asyncio.CancelledError:
+            failed.add(node.name)
+            logger.error(f"{node.name}: cancelled by run deadline")
+        except Exception as e:
+            failed.add(node.name)
+            logger.error(f"{node.name}: failed after {time.monotonic() - started:.1f}s: {e}")
+
+    async def enforce_deadline() -> None:
+        await asyncio.sleep(deadline.remaining())
+        unfinished = [n.name for n in nodes if not n.persist and not tasks[n.name].done()]
+        if unfinished:
+            logger.warning(f"Run deadline reached, cancelling: {', '.join(unfinished)}")
+        for name in unfinished:
+            tasks[name].cancel()
+
+        await asyncio.sleep(grace)
+        for name, task in tasks.items():
+            if not task.done():
+                logger.error(f"{name}: still running after deadline grace, abandoning")
+                task.cancel()
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    watchdog = asyncio.ensure_future(enforce_deadline()) if deadline else None
+    try:
+        for node in nodes:
+            tasks[node.name] = asyncio.ensure_future(run(node))
+        await asyncio.gather(*tasks.values())
+    finally:
+        if watchdog:
+            watchdog.cancel()
+        # Los hilos cancelados terminan solos (sus timeouts están acotados por
+        # el deadline); no se los espera.
+        executor.shutdown(wait=deadline is None, cancel_futures=True)
+
+    return results
+
+
+def prune_graph(nodes: list[Node], removed: set[str]) -> list[Node]:
+    """Saca del grafo los nodos `removed` y los que ya no pueden correr sin ellos.
+
+    Un nodo se va si le falta una dependencia obligatoria, todas las que
+    tenía o todas sus opcionales. Si solo le faltan algunas opcionales, corre
+    igual y las recibe como None.
+    También se van los nodos auxiliares cuyos consumidores se fueron todos
+    (p. ej. un watermark o la hoja de cálculo que nadie va a usar); los que
+    nunca tuvieron consumidores (escrituras) solo dependen de la primera regla.
+    """
+    removed = set(removed)
+    consumers: dict[str, set[str]] = {node.name: set() for node in nodes}
+    for node in nodes:
+        for dep in node.deps:
+            consumers.setdefault(dep, set()).add(node.name)
+
+    changed = True
+    while changed:
+        changed = False
+        for node in nodes:
+            if node.name in removed:
+                continue
+            gone = [d for d in node.deps if d in removed]
+            starved = bool(gone) and (
+                len(gone) == len(node.deps)
+                or not set(gone) <= set(node.optional)
+                or set(node.optional) <= set(gone)
+            )
+            unused = bool(consumers[node.name]) and consumers[node.name] <= removed
+            if starved or unused:
+                removed.add(node.name)
+                changed = True
+
+    kept = []
+    for node in nodes:
+        if node.name in removed:
+            continue
+        gone = tuple(d for d in node.deps if d in removed)
+        if gone:
+            node.func = functools.partial(node.func, **dict.fromkeys(gone))
+            node.deps = tuple(d for d in node.deps if d not in gone)
+            node.optional = tuple(d for d in node.optional if d not in gone)
+        kept.append(node)
+    return kept
+
+
+def _check_acyclic(by_name: dict[str, Node]) -> None:
+    visiting: set[str] = set()
+    visited: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"Cycle detected at node {name}")
+        visiting.add(name)
+        for dep in by_name[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        visited.add(name)
+
+    for name in by_name:
+        visit(name)
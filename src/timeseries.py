@@ -0,0 +1,196 @@
+"""Serie temporal diaria respaldada por arrays (fechas como ordinales int32, valores float64).
+
+Reemplaza a los `dict[date, float]` que devolvían los fetchers: un backfill
+de varios años eran millones de objetos `date` y `float` sueltos, y cada
+paso (unir, ordenar, `.get()`) los recorría en Python. `TimeSeries` guarda
+dos arrays ordenados y las operaciones de conjunto son de numpy:
+
+- `asof(d)`: último valor en o antes de `d`, por búsqueda binaria (O(log n)).
+- `align(*series)`: unión de fechas de N series y matriz de valores (NaN
+  donde una serie no tiene dato).
+- `slice(since, until)`, `combine(other)`, `to_rows(columns)` para la DB.
+
+Los ordinales son los de `date.toordinal()`, así `date.fromordinal` los vuelve a fecha.
+"""
+
+from collections.abc import Iterable, Iterator
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Ordinal de 1970-01-01: pasa de datetime64[D] (días desde epoch) a date.toordinal()
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def dates_to_ordinals(dates: Iterable[date]) -> np.ndarray:
+    """Fechas (date, datetime o Timestamp) -> ordinales int32."""
+    return datetime64_to_ordinals(np.asarray(list(dates), dtype="datetime64[D]"))
+
+
+def datetime64_to_ordinals(values: np.ndarray) -> np.ndarray:
+    """Array datetime64 (cualquier unidad, sin NaT) -> ordinales int32."""
+    days = np.asarray(values).astype("datetime64[D]").astype(np.int64)
+    return (days + _EPOCH_ORDINAL).astype(np.int32)
+
+
+def ordinals_to_datetime64(days: np.ndarray) -> np.ndarray:
+    """Ordinales int32 -> array datetime64[D] (sin pasar por objetos `date`)."""
+    return (np.asarray(days, dtype=np.int64) - _EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+def ordinals_to_dates(days: np.ndarray) -> list[date]:
+    """Ordinales int32 -> lista de `date`."""
+    return ordinals_to_datetime64(days).tolist()
+
+
+class TimeSeries:
+    """Serie de valores por día, ordenada y sin fechas repetidas.
+
+    Attributes:
+        days: Ordinales (int32) de las fechas, crecientes
+        values: Valor de cada fecha (float64; NaN = sin dato)
+    """
+
+    __slots__ = ("days", "values")
+
+    def __init__(self, days: np.ndarray, values: np.ndarray) -> None:
+        """Envuelve arrays ya ordenados y sin repetidos (ver `from_pairs` si no lo están)."""
+        self.days = np.asarray(days, dtype=np.int32)
+        self.values = np.asarray(values, dtype=np.float64)
+
+    @classmethod
+    def empty(cls) -> "TimeSeries":
+        return cls(np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64))
+
+    @classmethod
+    def from_pairs(cls, dates: Iterable[date], values: Iterable[float]) -> "TimeSeries":
+        """Arma la serie desde fechas y valores en cualquier orden.
+
+        Si una fecha se repite, queda el último valor (como al cargar un dict).
+        """
+        return cls._sorted(dates_to_ordinals(dates), np.asarray(list(values), dtype=np.float64))
+
+    @classmethod
+    def _sorted(cls, days: np.ndarray, values: np.ndarray) -> "TimeSeries":
+        if len(days) != len(values):
+            raise ValueError(f"{len(days)} dates but {len(values)} values")
+        # Orden estable: entre repetidas, la última queda al final de su grupo
+        order = np.argsort(days, kind="stable")
+        days, values = days[order], values[order]
+        last = np.append(days[1:] != days[:-1], True) if len(days) else np.empty(0, dtype=bool)
+        return cls(days[last], values[last])
+
+    @classmethod
+    def from_dict(cls, data: dict[date, float]) -> "TimeSeries":
+        return cls.from_pairs(data.keys(), data.values())
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "TimeSeries":
+        """Desde una Series de pandas indexada por fecha; descarta los NaN."""
+        series = series.dropna()
+        if series.empty:
+            return cls.empty()
+        index = pd.DatetimeIndex(series.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        days = datetime64_to_ordinals(index.values)
+        return cls._sorted(days, series.to_numpy(dtype=np.float64))
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def __bool__(self) -> bool:
+        return len(self.days) > 0
+
+    def __repr__(self) -> str:
+        if not self:
+            return "TimeSeries(empty)"
+        return f"TimeSeries({len(self)} points, {self.first_date} .. {self.last_date})"
+
+    def __contains__(self, d: date) -> bool:
+        return self.get(d) is not None
+
+    @property
+    def first_date(self) -> date | None:
+        return date.fromordinal(int(self.days[0])) if self else None
+
+    @property
+    def last_date(self) -> date | None:
+        return date.fromordinal(int(self.days[-1])) if self else None
+
+    def dates(self) -> list[date]:
+        return ordinals_to_dates(self.days)
+
+    def items(self) -> Iterator[tuple[date, float]]:
+        """(fecha, valor) en orden, salteando los huecos (NaN)."""
+        mask = ~np.isnan(self.values)
+        return zip(ordinals_to_dates(self.days[mask]), self.values[mask].tolist(), strict=True)
+
+    def to_dict(self) -> dict[date, float]:
+        return dict(self.items())
+
+    def get(self, d: date, default: float | None = None) -> float | None:
+        """Valor exacto de la fecha `d` (o `default` si no hay dato ese día)."""
+        ordinal = d.toordinal()
+        i = int(np.searchsorted(self.days, ordinal))
+        if i < len(self.days) and self.days[i] == ordinal and not np.isnan(self.values[i]):
+            return float(self.values[i])
+        return default
+
+    def asof(self, d: date) -> float | None:
+        """Último valor con fecha <= `d` (None si la serie empieza después)."""
+        i = int(np.searchsorted(self.days, d.toordinal(), side="right"))
+        while i > 0:
+            i -= 1
+            if not np.isnan(self.values[i]):
+                return float(self.values[i])
+        return None
+
+    def slice(self, since: date | None = None, until: date | None = None) -> "TimeSeries":
+        """Subserie entre `since` y `until` (ambos inclusive; None = sin límite)."""
+        lo = np.searchsorted(self.days, since.toordinal()) if since else 0
+        hi = np.searchsorted(self.days, until.toordinal(), side="right") if until else len(self)
+        return TimeSeries(self.days[lo:hi], self.values[lo:hi])
+
+    def dropna(self) -> "TimeSeries":
+        mask = ~np.isnan(self.values)
+        return TimeSeries(self.days[mask], self.values[mask])
+
+    def combine(self, other: "TimeSeries") -> "TimeSeries":
+        """Unión de ambas series; en las fechas compartidas gana `other` (si tiene dato)."""
+        days, matrix = align(self, other)
+        values = np.where(np.isnan(matrix[:, 1]), matrix[:, 0], matrix[:, 1])
+        return TimeSeries(days, values)
+
+
+def align(*series: TimeSeries) -> tuple[np.ndarray, np.ndarray]:
+    """Alinea N series sobre la unión de sus fechas.
+
+    Returns:
+        (days, matrix): ordinales int32 ordenados y una matriz float64 de
+        len(days) x N con el valor de cada serie (NaN donde no tiene dato)
+    """
+    if not series:
+        return np.empty(0, dtype=np.int32), np.empty((0, 0))
+    days = np.unique(np.concatenate([s.days for s in series])).astype(np.int32)
+    matrix = np.full((len(days), len(series)), np.nan)
+    for j, s in enumerate(series):
+        matrix[np.searchsorted(days, s.days), j] = s.values
+    return days, matrix
+
+
+def to_rows(columns: dict[str, TimeSeries]) -> list[dict]:
+    """Filas {"date": date, <columna>: float | None} sobre la unión de fechas.
+
+    Los huecos quedan en None, que los upserts con coalesce no pisan.
+    """
+    days, matrix = align(*columns.values())
+    # object + None en lugar de NaN; tolist() convierte a float de Python
+    cells = matrix.astype(object)
+    cells[np.isnan(matrix)] = None
+    names = list(columns)
+    return [
+        {"date": d, **dict(zip(names, row, strict=True))}
+        for d, row in zip(ordinals_to_dates(days), cells.tolist(), strict=True)
+    ]
@@ -0,0 +1,33 @@
+"""Fixtures compartidas: estado global por proceso limpio en cada test."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from src.connectors import limiter, resilience
+from src.db import writer
+from src.deadline import start_run_deadline
+
+
+@pytest.fixture(autouse=True)
+def _clean_process_state() -> Iterator[None]:
+    """Breakers, limiters y deadline son globales del proceso: se vacían entre tests."""
+    resilience._breakers.clear()
+    limiter._limiters.clear()
+    start_run_deadline(None)
+    yield
+    resilience._breakers.clear()
+    limiter._limiters.clear()
+    start_run_deadline(None)
+
+
+@pytest.fixture
+def db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """SQLite temporal para src.db.writer."""
+    path = tmp_path / "test.db"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{path}")
+    monkeypatch.setattr(writer, "_engine", None)
+    yield path
+    if writer._engine is not None:
+        writer._engine.dispose()
@@ -0,0 +1,87 @@
+"""Backfill por chunks: límites estables y reanudación desde el checkpoint."""
+
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from src import backfill
+from src.backfill import chunk_ranges, run_backfill
+from src.db import writer
+from src.timeseries import TimeSeries
+
+SINCE = date(2024, 1, 1)
+
+
+def test_chunks_are_anchored_to_since() -> None:
+    chunks = chunk_ranges(SINCE, date(2024, 1, 25), 10)
+    assert chunks == [
+        (date(2024, 1, 1), date(2024, 1, 10)),
+        (date(2024, 1, 11), date(2024, 1, 20)),
+        (date(2024, 1, 21), date(2024, 1, 30)),
+    ]
+    # Otro `until` no mueve los límites de los chunks que ya existían
+    assert chunk_ranges(SINCE, date(2024, 2, 5), 10)[:3] == chunks
+
+
+def test_chunks_end_exactly_on_until() -> None:
+    assert chunk_ranges(SINCE, date(2024, 1, 20), 10)[-1] == (date(2024, 1, 11), date(2024, 1, 20))
+    assert chunk_ranges(SINCE, SINCE - timedelta(days=1), 10) == []
+
+
+class FakeSource:
+    """Fuente de CCL que falla en los rangos pedidos y registra cada llamado."""
+
+    def __init__(self, failing: set[date] | None = None, empty: set[date] | None = None) -> None:
+        self.failing = failing or set()
+        self.empty = empty or set()
+        self.calls: list[tuple[date, date]] = []
+
+    def __call__(self, since: date, until: date) -> TimeSeries:
+        self.calls.append((since, until))
+        if since in self.failing:
+            raise ConnectionError("source down")
+        if since in self.empty:
+            return TimeSeries.empty()
+        return TimeSeries.from_pairs([since], [float(since.day)])
+
+
+@pytest.fixture
+def chunk_days(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(backfill.FETCH_CONFIG, "backfill_chunk_days", {"ccl": 10})
+
+
+def use_source(monkeypatch: pytest.MonkeyPatch, source: FakeSource) -> None:
+    monkeypatch.setattr(backfill, "_build_sources", lambda session: {"ccl": source})
+
+
+def test_resume_fetches_only_missing_chunks(
+    db: Path, chunk_days: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    until = date(2024, 1, 30)
+    first = FakeSource(failing={date(2024, 1, 11)}, empty={date(2024, 1, 21)})
+    use_source(monkeypatch, first)
+    assert run_backfill(SINCE, until, ["ccl"]) == {"ccl": (2, 3)}
+
+    second = FakeSource()
+    use_source(monkeypatch, second)
+    assert run_backfill(SINCE, until, ["ccl"]) == {"ccl": (3, 3)}
+    # Solo se reintenta el que falló; el vacío cuenta como hecho
+    assert second.calls == [(date(2024, 1, 11), date(2024, 1, 20))]
+
+    ccl = writer.get_historic_series(SINCE, until)["ccl_data"]
+    assert ccl.to_dict() == {date(2024, 1, 1): 1.0, date(2024, 1, 11): 11.0}
+
+
+def test_partial_last_chunk_is_not_checkpointed(
+    db: Path, chunk_days: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = FakeSource()
+    use_source(monkeypatch, source)
+    assert run_backfill(SINCE, date(2024, 1, 15), ["ccl"]) == {"ccl": (2, 2)}
+    # El último chunk se pidió recortado a `until`
+    assert (date(2024, 1, 11), date(2024, 1, 15)) in source.calls
+
+    source.calls.clear()
+    assert run_backfill(SINCE, date(2024, 1, 20), ["ccl"]) == {"ccl": (2, 2)}
+    assert source.calls == [(date(2024, 1, 11), date(2024, 1, 20))]
@@ -0,0 +1,48 @@
+"""BenchmarksFetcher: los errores de Yahoo fallan la fuente; la falta de precios no."""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+import requests
+from yfinance.exceptions import YFPricesMissingError
+
+from src.fetchers import benchmarks
+from src.fetchers.benchmarks import BenchmarksFetcher
+
+SINCE = date(2024, 5, 6)
+UNTIL = date(2024, 5, 8)
+
+
+class FakeTicker:
+    replies: dict[str, object] = {}
+
+    def __init__(self, ticker: str) -> None:
+        self.ticker = ticker
+
+    def history(self, **kwargs: object) -> pd.DataFrame:
+        reply = self.replies[self.ticker]
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+@pytest.fixture(autouse=True)
+def fake_yahoo(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(benchmarks.yf, "Ticker", FakeTicker)
+    FakeTicker.replies = {
+        "SPY": pd.DataFrame({"Close": [500.0, 501.0]}, index=pd.to_datetime([SINCE, UNTIL])),
+        "QQQ": YFPricesMissingError("QQQ", "no prices"),
+    }
+
+
+def test_missing_prices_are_omitted() -> None:
+    out = BenchmarksFetcher(["SPY", "QQQ"]).fetch(SINCE, UNTIL)
+    assert list(out) == ["SPY"]
+    assert out["SPY"].to_dict() == {SINCE: 500.0, UNTIL: 501.0}
+
+
+def test_download_errors_propagate() -> None:
+    FakeTicker.replies["QQQ"] = requests.ConnectionError("yahoo down")
+    with pytest.raises(requests.ConnectionError):
+        BenchmarksFetcher(["SPY", "QQQ"]).fetch(SINCE, UNTIL)
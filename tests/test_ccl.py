@@ -0,0 +1,44 @@
+"""CCL: la cotización de hoy no espera al histórico de Ambito más allá de su presupuesto."""
+
+import threading
+import time
+from collections.abc import Iterator
+from datetime import date, timedelta
+
+import pytest
+
+from src.config import FETCH_CONFIG
+from src.fetchers.ccl import CCLFetcher
+from src.timeseries import TimeSeries
+
+TODAY = date(2024, 5, 10)
+
+
+@pytest.fixture
+def slow_ambito(monkeypatch: pytest.MonkeyPatch) -> Iterator[threading.Event]:
+    """Ambito colgado hasta que se suelte el evento; dolarapi contesta al instante."""
+    release = threading.Event()
+
+    def fetch_ambito(self: CCLFetcher, since: date, until: date) -> TimeSeries:
+        release.wait(5)
+        return TimeSeries.empty()
+
+    monkeypatch.setattr(CCLFetcher, "fetch_ambito", fetch_ambito)
+    monkeypatch.setattr(CCLFetcher, "fetch_today", lambda self: (TODAY, 1000.0))
+    monkeypatch.setitem(FETCH_CONFIG, "ccl_hedge", {**FETCH_CONFIG["ccl_hedge"]})
+    monkeypatch.setitem(FETCH_CONFIG["ccl_hedge"], "ambito_budget_seconds", 0.2)
+    yield release
+    release.set()
+
+
+def test_sync_fetch_is_bounded_by_ambito_budget(slow_ambito: threading.Event) -> None:
+    started = time.monotonic()
+    series = CCLFetcher(session=object()).fetch(TODAY - timedelta(days=7), TODAY)
+    assert time.monotonic() - started < 1
+    assert series.to_dict() == {TODAY: 1000.0}
+
+
+def test_today_series_outside_range_is_empty() -> None:
+    fetcher = CCLFetcher(session=object())
+    assert not fetcher.today_series((TODAY, 1.0), TODAY + timedelta(days=1), TODAY)
+    assert not fetcher.today_series(None, TODAY, TODAY)
@@ -0,0 +1,41 @@
+"""Límite de concurrencia AIMD por host."""
+
+from src.config import HTTP_CONFIG
+from src.connectors.limiter import AIMDLimiter, limiter_states, load_limiter_states
+
+HOST = "api.example"
+
+
+def test_acquire_blocks_at_limit() -> None:
+    limiter = AIMDLimiter(HOST, initial=2, min_limit=1, max_limit=4)
+    assert limiter.acquire(timeout=0)
+    assert limiter.acquire(timeout=0)
+    assert not limiter.acquire(timeout=0.01)
+    limiter.release(healthy=True, latency=0.1)
+    assert limiter.acquire(timeout=0)
+
+
+def test_unhealthy_release_halves_once_per_cooldown() -> None:
+    limiter = AIMDLimiter(HOST, initial=8, min_limit=1, max_limit=16)
+    for _ in range(3):
+        limiter.acquire(timeout=0)
+    limiter.release(healthy=False)
+    limiter.release(healthy=False)
+    expected = 8 * HTTP_CONFIG["limiter"]["decrease_factor"]
+    assert limiter.limit == expected
+    # Los éxitos lentos no suben el límite
+    limiter.release(healthy=True, latency=HTTP_CONFIG["limiter"]["latency_target_seconds"] + 1)
+    assert limiter.limit == expected
+
+
+def test_healthy_releases_grow_up_to_max() -> None:
+    limiter = AIMDLimiter(HOST, initial=1, min_limit=1, max_limit=3)
+    for _ in range(20):
+        limiter.acquire(timeout=0)
+        limiter.release(healthy=True, latency=0.1)
+    assert limiter.limit == 3
+
+
+def test_states_roundtrip_is_bounded() -> None:
+    load_limiter_states({HOST: 1000.0})
+    assert limiter_states()[HOST] == HTTP_CONFIG["limiter"]["max"]
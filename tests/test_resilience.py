@@ -0,0 +1,158 @@
+"""Circuit breaker y contabilidad de reintentos de HostAwareSession."""
+
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+import requests
+
+from src.config import HTTP_CONFIG, HTTP_HOSTS
+from src.connectors import http
+from src.connectors.http import HostAwareSession
+from src.connectors.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    get_breaker,
+)
+
+HOST = "flaky.example"
+URL = f"http://{HOST}/data"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Backoffs pedidos por la sesión, sin dormir de verdad."""
+    calls: list[float] = []
+    monkeypatch.setattr(http.time, "sleep", calls.append)
+    return calls
+
+
+@pytest.fixture
+def replies(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[Any]]:
+    """Respuestas (status o excepción) que devuelve la red, en orden."""
+    queue: list[Any] = []
+
+    def fake_request(
+        self: requests.Session, method: str, url: str, **kwargs: object
+    ) -> FakeResponse:
+        reply = queue.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return FakeResponse(reply)
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    yield queue
+
+
+def test_threshold_is_above_retry_count() -> None:
+    retries = [HTTP_CONFIG["max_retries"]]
+    retries += [cfg["max_retries"] for cfg in HTTP_HOSTS.values() if "max_retries" in cfg]
+    assert HTTP_CONFIG["breaker_failure_threshold"] > max(retries)
+
+
+def test_breaker_opens_after_threshold_and_half_opens() -> None:
+    breaker = CircuitBreaker(HOST, failure_threshold=2, reset_seconds=0.05)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    assert breaker.before_request() is True
+    # Solo un request de prueba a la vez
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_failed_probe_reopens_and_release_unblocks() -> None:
+    breaker = CircuitBreaker(HOST, failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.before_request() is True
+    breaker.release_probe()
+    assert breaker.before_request() is True
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_snapshot_roundtrip_keeps_open_state() -> None:
+    breaker = CircuitBreaker(HOST, failure_threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    restored = CircuitBreaker(HOST, failure_threshold=1, reset_seconds=60)
+    restored.restore(breaker.snapshot())
+    assert restored.state == OPEN
+
+
+def test_flaky_request_does_not_open_breaker(replies: list[Any], sleeps: list[float]) -> None:
+    replies.extend([503] * HTTP_CONFIG["max_retries"] + [200])
+    response = HostAwareSession(hosts={}).get(URL)
+    assert response.status_code == 200
+    assert len(sleeps) == HTTP_CONFIG["max_retries"]
+    assert get_breaker(HOST).state == CLOSED
+
+
+def test_exhausted_request_counts_once(replies: list[Any], sleeps: list[float]) -> None:
+    replies.extend([requests.ConnectionError("down")] * (HTTP_CONFIG["max_retries"] + 1))
+    with pytest.raises(requests.ConnectionError):
+        HostAwareSession(hosts={}).get(URL)
+    assert get_breaker(HOST).snapshot()["failures"] == 1
+    assert get_breaker(HOST).state == CLOSED
+
+
+def test_breaker_opens_after_threshold_requests(replies: list[Any], sleeps: list[float]) -> None:
+    session = HostAwareSession(hosts={HOST: {"max_retries": 0}})
+    for _ in range(HTTP_CONFIG["breaker_failure_threshold"]):
+        replies.append(503)
+        assert session.get(URL).status_code == 503
+    assert get_breaker(HOST).state == OPEN
+    with pytest.raises(CircuitOpenError):
+        session.get(URL)
+
+
+def test_stops_retrying_when_breaker_opens_mid_loop(
+    sleeps: list[float], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    breaker = get_breaker(HOST)
+    sent: list[str] = []
+
+    def fake_request(
+        self: requests.Session, method: str, url: str, **kwargs: object
+    ) -> FakeResponse:
+        # Mientras este request está en vuelo, otros agotan los suyos y lo abren
+        sent.append(url)
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        return FakeResponse(503)
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    response = HostAwareSession(hosts={}).get(URL)
+    assert response.status_code == 503
+    assert len(sent) == 1
+    assert sleeps == []
+
+
+def test_429_probe_is_released(replies: list[Any], sleeps: list[float]) -> None:
+    breaker = get_breaker(HOST)
+    breaker.reset_seconds = 0.0
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    replies.append(429)
+    HostAwareSession(hosts={HOST: {"max_retries": 0}}).get(URL)
+    assert breaker.before_request() is True
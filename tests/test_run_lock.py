@@ -0,0 +1,51 @@
+"""Lock de corrida: espera acotada por el timeout de systemd y reuso de resultados."""
+
+from pathlib import Path
+
+import pytest
+
+from src import run_lock
+from src.config import FETCH_CONFIG
+from src.db import writer
+from src.run_lock import RunCoordinator, lock_wait_seconds
+
+
+def test_lock_wait_fits_in_service_timeout() -> None:
+    budget = FETCH_CONFIG["run_budget_seconds"]
+    wait = lock_wait_seconds(budget)
+    assert wait > 0
+    assert (
+        wait + budget + FETCH_CONFIG["persist_grace_seconds"] < FETCH_CONFIG["run_timeout_seconds"]
+    )
+
+
+def test_lock_wait_is_zero_when_budget_fills_timeout() -> None:
+    assert lock_wait_seconds(FETCH_CONFIG["run_timeout_seconds"]) == 0
+
+
+def test_waiter_exits_when_it_cannot_wait(db: Path, tmp_path: Path) -> None:
+    lock = str(tmp_path / "locks" / "fetch.lock")
+    with RunCoordinator("incremental", lock) as first:
+        assert first.proceed
+        with RunCoordinator("incremental", lock, wait_seconds=0) as second:
+            assert not second.proceed
+            assert second.reused is None
+        first.finish([])
+
+
+def test_reuses_run_that_finished_before_state_was_read(
+    db: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setitem(FETCH_CONFIG, "run_lock_poll_seconds", 0.01)
+    lock = str(tmp_path / "fetch.lock")
+    first = RunCoordinator("incremental", lock).__enter__()
+
+    def finish_first_then_read() -> dict | None:
+        first.finish([])
+        first.__exit__(None, None, None)
+        return writer.get_active_run_state()
+
+    monkeypatch.setattr(run_lock, "get_active_run_state", finish_first_then_read)
+    with RunCoordinator("incremental", lock, wait_seconds=5) as second:
+        assert not second.proceed
+        assert second.reused["run_id"] == first.run_id
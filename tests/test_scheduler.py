@@ -0,0 +1,114 @@
+"""DAG scheduler: poda del grafo, dependencias opcionales y deadline con persistencia."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.deadline import Deadline
+from src.scheduler import Node, prune_graph, run_graph
+
+
+def names(nodes: list[Node]) -> list[str]:
+    return [n.name for n in nodes]
+
+
+def test_prune_drops_mandatory_dependents() -> None:
+    nodes = [
+        Node("source", lambda: 1),
+        Node("derived", lambda source: source, deps=("source",)),
+        Node("write", lambda derived: None, deps=("derived",)),
+        Node("other", lambda: 2),
+    ]
+    assert names(prune_graph(nodes, {"source"})) == ["other"]
+
+
+def test_prune_keeps_node_with_some_optionals_and_binds_none() -> None:
+    nodes = [
+        Node("a", lambda: 1),
+        Node("b", lambda: 2),
+        Node("merge", lambda a, b: (a, b), deps=("a", "b"), optional=("a", "b")),
+    ]
+    kept = prune_graph(nodes, {"b"})
+    assert names(kept) == ["a", "merge"]
+    merge = kept[1]
+    assert merge.deps == ("a",)
+    assert merge.func(a=1) == (1, None)
+
+
+def test_prune_drops_node_without_any_optional_input() -> None:
+    nodes = [
+        Node("spreadsheet", lambda: "ss"),
+        Node("a", lambda: 1),
+        Node("sheet", lambda spreadsheet, a: None, deps=("spreadsheet", "a"), optional=("a",)),
+    ]
+    assert names(prune_graph(nodes, {"a"})) == []
+
+
+def test_prune_drops_helpers_whose_consumers_are_gone() -> None:
+    nodes = [
+        Node("watermark", lambda: 0),
+        Node("source", lambda watermark: watermark, deps=("watermark",)),
+        Node("write", lambda source: None, deps=("source",)),
+        # Sin consumidores desde el principio: no es un auxiliar, se queda
+        Node("standalone", lambda: None),
+    ]
+    assert names(prune_graph(nodes, {"source"})) == ["standalone"]
+
+
+def test_run_graph_passes_results_and_skips_failed_dependents() -> None:
+    def boom() -> None:
+        raise RuntimeError("down")
+
+    nodes = [
+        Node("a", lambda: 2),
+        Node("bad", boom),
+        Node("double", lambda a: a * 2, deps=("a",)),
+        Node("needs_bad", lambda bad: bad, deps=("bad",)),
+        Node("tolerant", lambda a, bad: (a, bad), deps=("a", "bad"), optional=("bad",)),
+    ]
+    results = run_graph(nodes, max_workers=2)
+    assert results == {"a": 2, "double": 4, "tolerant": (2, None)}
+
+
+def test_run_graph_rejects_cycles() -> None:
+    nodes = [
+        Node("a", lambda b: b, deps=("b",)),
+        Node("b", lambda a: a, deps=("a",)),
+    ]
+    with pytest.raises(ValueError, match="Cycle"):
+        run_graph(nodes, max_workers=1)
+
+
+def test_deadline_cancels_sources_and_keeps_persistence() -> None:
+    async def slow_source() -> int:
+        await asyncio.sleep(5)
+        return 1
+
+    nodes = [
+        Node("fast", lambda: 1),
+        Node("slow", slow_source),
+        Node(
+            "write",
+            lambda fast, slow: (fast, slow),
+            deps=("fast", "slow"),
+            optional=("slow",),
+            persist=True,
+        ),
+    ]
+    started = time.monotonic()
+    results = run_graph(nodes, max_workers=2, deadline=Deadline(0.2), grace=1.0)
+    assert time.monotonic() - started < 2
+    assert "slow" not in results
+    assert results["write"] == (1, None)
+
+
+def test_persist_node_is_abandoned_after_grace() -> None:
+    async def stuck_write() -> None:
+        await asyncio.sleep(5)
+
+    nodes = [Node("write", stuck_write, persist=True), Node("quick", lambda: 1, persist=True)]
+    started = time.monotonic()
+    results = run_graph(nodes, max_workers=1, deadline=Deadline(0.1), grace=0.2)
+    assert time.monotonic() - started < 2
+    assert results == {"quick": 1}